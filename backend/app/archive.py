@@ -0,0 +1,29 @@
+import json
+import zlib
+from typing import Any, Dict, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_CODEC = "zstd" if zstandard is not None else "zlib"
+
+
+def encode_archive(data: Dict[str, Any]) -> Tuple[str, bytes]:
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    if ARCHIVE_CODEC == "zstd":
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(raw)
+    return "zlib", zlib.compress(raw, 9)
+
+
+def decode_archive(codec: str, payload: bytes) -> Dict[str, Any]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive was written with zstd but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(payload)
+    elif codec == "zlib":
+        raw = zlib.decompress(payload)
+    else:
+        raise ValueError(f"Unknown archive codec: {codec}")
+    return json.loads(raw)
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import database
+
+BACKUP_PREFIX = "retro-"
+BACKUP_SUFFIX = ".db.gz"
+
+
+class BackupManager:
+    def __init__(
+        self,
+        directory: str,
+        keep: int = 7,
+        pages: int = 256,
+        step_sleep: float = 0.005
+    ):
+        self.directory = Path(directory) if directory else None
+        self.keep = keep
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.running = False
+        self.backups = 0
+        self.errors = 0
+        self.last_backup: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    async def backup(self) -> Dict[str, Any]:
+        if self.directory is None:
+            raise RuntimeError("BACKUP_DIR is not configured")
+        if self.running:
+            raise RuntimeError("A backup is already running")
+        self.running = True
+        try:
+            result = await asyncio.to_thread(self._backup, database.DATABASE_PATH)
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.running = False
+        self.backups += 1
+        self.last_backup = result
+        return result
+
+    def _backup(self, source_path: str) -> Dict[str, Any]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+        target = self.directory / f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}"
+        raw_path = Path(f"{target}.raw")
+        partial_path = Path(f"{target}.partial")
+        started = time.perf_counter()
+        steps = 0
+
+        def progress(status, remaining, total):
+            nonlocal steps
+            steps += 1
+
+        try:
+            source = sqlite3.connect(source_path)
+            destination = sqlite3.connect(raw_path)
+            try:
+                source.backup(destination, pages=self.pages, progress=progress, sleep=self.step_sleep)
+            finally:
+                destination.close()
+                source.close()
+            copied_at = time.perf_counter()
+            with open(raw_path, "rb") as raw, gzip.open(partial_path, "wb", compresslevel=6) as compressed:
+                shutil.copyfileobj(raw, compressed, 1024 * 1024)
+            os.replace(partial_path, target)
+            database_bytes = raw_path.stat().st_size
+        finally:
+            for leftover in (raw_path, partial_path):
+                try:
+                    leftover.unlink()
+                except FileNotFoundError:
+                    pass
+        finished = time.perf_counter()
+        removed = self._rotate()
+        return {
+            "path": str(target),
+            "at": time.time(),
+            "database_bytes": database_bytes,
+            "compressed_bytes": target.stat().st_size,
+            "steps": steps,
+            "copy_ms": round((copied_at - started) * 1000, 2),
+            "duration_ms": round((finished - started) * 1000, 2),
+            "rotated": removed,
+        }
+
+    def _rotate(self) -> List[str]:
+        if self.keep <= 0:
+            return []
+        removed = []
+        for path in list_backups(self.directory)[self.keep:]:
+            path.unlink()
+            removed.append(str(path))
+        return removed
+
+    def available(self) -> List[Dict[str, Any]]:
+        if self.directory is None or not self.directory.exists():
+            return []
+        return [
+            {"path": str(path), "bytes": path.stat().st_size, "modified": path.stat().st_mtime}
+            for path in list_backups(self.directory)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.directory is not None,
+            "running": self.running,
+            "backups": self.backups,
+            "errors": self.errors,
+            "last_backup": self.last_backup,
+            "last_error": self.last_error,
+        }
+
+
+def list_backups(directory: Path) -> List[Path]:
+    return sorted(directory.glob(f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}"), reverse=True)
+
+
+def restore(backup_path: str, database_path: str):
+    staging = f"{database_path}.restoring"
+    with gzip.open(backup_path, "rb") as compressed, open(staging, "wb") as raw:
+        shutil.copyfileobj(compressed, raw, 1024 * 1024)
+    try:
+        check = sqlite3.connect(staging)
+        try:
+            result = check.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            check.close()
+        if result != "ok":
+            raise ValueError(f"Backup failed integrity check: {result}")
+        for suffix in ("-wal", "-shm"):
+            try:
+                os.unlink(database_path + suffix)
+            except FileNotFoundError:
+                pass
+        os.replace(staging, database_path)
+    finally:
+        try:
+            os.unlink(staging)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.backup")
+    parser.add_argument("--database", default=database.DATABASE_PATH)
+    parser.add_argument("--dir", default=os.getenv("BACKUP_DIR", ""))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("create")
+    commands.add_parser("list")
+    restore_parser = commands.add_parser("restore")
+    restore_parser.add_argument("backup", nargs="?", help="backup file, defaults to the newest in --dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "restore":
+        backup_path = args.backup
+        if backup_path is None:
+            backups = list_backups(Path(args.dir)) if args.dir else []
+            if not backups:
+                print("No backup found", file=sys.stderr)
+                return 1
+            backup_path = str(backups[0])
+        restore(backup_path, args.database)
+        print(f"Restored {backup_path} to {args.database}")
+        return 0
+
+    if not args.dir:
+        print("Set BACKUP_DIR or pass --dir", file=sys.stderr)
+        return 1
+    manager = BackupManager(args.dir, keep=int(os.getenv("BACKUP_KEEP", "7")))
+    if args.command == "list":
+        for backup in manager.available():
+            print(f"{backup['path']}\t{backup['bytes']}")
+        return 0
+    database.DATABASE_PATH = args.database
+    result = asyncio.run(manager.backup())
+    print(f"Wrote {result['path']} ({result['compressed_bytes']} bytes) in {result['duration_ms']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,92 @@
 import aiosqlite
+import asyncio
 import os
+import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 from datetime import datetime, timedelta
 
+from .archive import decode_archive, encode_archive
+from .search import HIT_CLOSE, HIT_OPEN, SEARCH_WINDOW, fts_query, search_windows
+from .stats import ACTIVITY_BUCKETS, GLOBAL_BUCKET, SESSION_BUCKET, summarize
+from .tracing import tracer
+
 DATABASE_PATH = os.getenv("DATABASE_PATH", "/tmp/retro.db")
 SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()  # NORMAL is durable enough under WAL
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "0"))  # pages, or negative KiB; 0 keeps SQLite's default
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", "0"))  # bytes; 0 disables memory-mapped I/O
+
+CLONE_SOURCES = {
+    None: "SELECT id, category, content, author FROM cards WHERE session_id = ?",
+    "open_actionables": (
+        "SELECT id, 'actionables' AS category, content, author FROM open_actionables WHERE session_id = ?"
+    ),
+}
+
+ARCHIVED_CARD_INSERT = """
+    INSERT INTO archived_cards (card_id, session_id, category, author, created_at, completed)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+STATS_SESSIONS = "(SELECT session_id FROM sessions UNION ALL SELECT session_id FROM archived_sessions)"
+STATS_CARDS = """(
+    SELECT c.session_id, c.category, c.author, c.created_at, a.completed
+    FROM cards c LEFT JOIN actionables a ON a.card_id = c.id
+    UNION ALL
+    SELECT session_id, category, author, created_at, completed FROM archived_cards
+)"""
+
+STATS_SOURCES = {
+    "board_stats": (
+        "session_id, sessions, contributors",
+        f"""
+        SELECT s.session_id, 1, COUNT(DISTINCT c.author)
+        FROM {STATS_SESSIONS} s LEFT JOIN {STATS_CARDS} c ON c.session_id = s.session_id
+        GROUP BY s.session_id
+        UNION ALL
+        SELECT '', (SELECT COUNT(*) FROM {STATS_SESSIONS}), (SELECT COUNT(DISTINCT author) FROM {STATS_CARDS})
+        """
+    ),
+    "category_stats": (
+        "session_id, category, cards, completed",
+        f"""
+        SELECT session_id, category, COUNT(*), COALESCE(SUM(completed), 0)
+        FROM {STATS_CARDS} GROUP BY session_id, category
+        UNION ALL
+        SELECT '', category, COUNT(*), COALESCE(SUM(completed), 0)
+        FROM {STATS_CARDS} GROUP BY category
+        """
+    ),
+    "contributor_stats": (
+        "session_id, author, cards",
+        f"""
+        SELECT session_id, author, COUNT(*) FROM {STATS_CARDS} GROUP BY session_id, author
+        UNION ALL
+        SELECT '', author, COUNT(*) FROM {STATS_CARDS} GROUP BY author
+        """
+    ),
+    "activity_stats": (
+        "session_id, bucket, cards",
+        f"""
+        SELECT session_id, strftime('{SESSION_BUCKET}', created_at) AS bucket, COUNT(*)
+        FROM {STATS_CARDS} GROUP BY session_id, bucket
+        UNION ALL
+        SELECT '', strftime('{GLOBAL_BUCKET}', created_at) AS bucket, COUNT(*)
+        FROM {STATS_CARDS} GROUP BY bucket
+        """
+    ),
+}
+STATS_TRIGGERS = (
+    "stats_session_insert",
+    "stats_session_delete",
+    "stats_card_insert",
+    "stats_card_delete",
+    "stats_actionable_insert",
+)
+
+if SQLITE_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {SQLITE_SYNCHRONOUS}")
 
 
 async def get_db():
@@ -14,20 +95,92 @@ async def get_db():
     await db.execute("PRAGMA foreign_keys = ON")
     await db.execute("PRAGMA journal_mode = WAL")
     await db.execute("PRAGMA busy_timeout = 5000")
+    await db.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    if SQLITE_CACHE_SIZE:
+        await db.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+    if SQLITE_MMAP_SIZE:
+        await db.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
     return db
 
 
+@tracer.traced("db.init_db")
 async def init_db():
     db = await get_db()
     try:
-        with open(SCHEMA_PATH, "r") as f:
-            schema = f.read()
+        schema = await asyncio.to_thread(SCHEMA_PATH.read_text)
+        cursor = await db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing = {row["name"] for row in await cursor.fetchall()}
+        if "archived_cards" in existing:
+            cursor = await db.execute("PRAGMA table_info(archived_cards)")
+            if "category" not in {row["name"] for row in await cursor.fetchall()}:
+                await db.execute("DROP TABLE archived_cards")
+                for trigger in STATS_TRIGGERS:
+                    await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                existing -= {"archived_cards", *STATS_SOURCES}
         await db.executescript(schema)
+        await _migrate(db, existing)
         await db.commit()
     finally:
         await db.close()
 
 
+async def _migrate(db, existing: set):
+    cursor = await db.execute("PRAGMA table_info(cards)")
+    columns = {row["name"] for row in await cursor.fetchall()}
+    if "version" not in columns:
+        await db.execute(
+            "ALTER TABLE cards ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+        )
+    if "archived_cards" not in existing:
+        await _rebuild_archived_cards(db)
+    if "cards_fts" not in existing:
+        await _rebuild_search_index(db)
+    if not existing.issuperset(STATS_SOURCES):
+        await _rebuild_stats(db)
+
+
+async def _rebuild_search_index(db):
+    await db.execute("DELETE FROM cards_fts")
+    await db.execute(
+        """
+        INSERT INTO cards_fts (rowid, content, session_id, category, author, created_at)
+        SELECT id, content, session_id, category, author, created_at FROM cards
+        """
+    )
+    cursor = await db.execute("SELECT session_id, codec, payload FROM archived_sessions")
+    async for row in cursor:
+        cards = decode_archive(row["codec"], row["payload"])["cards"]
+        await db.executemany(
+            """
+            INSERT INTO cards_fts (rowid, content, session_id, category, author, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (c["id"], c["content"], row["session_id"], c["category"], c["author"], c["created_at"])
+                for c in cards
+            ]
+        )
+
+
+async def _rebuild_archived_cards(db):
+    await db.execute("DELETE FROM archived_cards")
+    cursor = await db.execute("SELECT session_id, codec, payload FROM archived_sessions")
+    async for row in cursor:
+        cards = decode_archive(row["codec"], row["payload"])["cards"]
+        await db.executemany(ARCHIVED_CARD_INSERT, [_archived_card(row["session_id"], c) for c in cards])
+
+
+def _archived_card(session_id: str, card: Dict[str, Any]) -> tuple:
+    return (card["id"], session_id, card["category"], card["author"], card["created_at"], card["completed"])
+
+
+async def _rebuild_stats(db):
+    for table, (columns, query) in STATS_SOURCES.items():
+        await db.execute(f"DELETE FROM {table}")
+        await db.execute(f"INSERT INTO {table} ({columns}) {query}")
+
+
+@tracer.traced("db.create_session")
 async def create_session(session_id: str) -> Dict[str, Any]:
     db = await get_db()
     try:
@@ -46,6 +199,7 @@ async def create_session(session_id: str) -> Dict[str, Any]:
         await db.close()
 
 
+@tracer.traced("db.get_session")
 async def get_session(session_id: str) -> Optional[Dict[str, Any]]:
     db = await get_db()
     try:
@@ -54,11 +208,77 @@ async def get_session(session_id: str) -> Optional[Dict[str, Any]]:
             (session_id,)
         )
         row = await cursor.fetchone()
-        return dict(row) if row else None
+        if row:
+            return dict(row)
+        return await _rehydrate_session(db, session_id)
     finally:
         await db.close()
 
 
+async def _rehydrate_session(db, session_id: str) -> Optional[Dict[str, Any]]:
+    cursor = await db.execute(
+        "SELECT 1 FROM archived_sessions WHERE session_id = ?",
+        (session_id,)
+    )
+    if not await cursor.fetchone():
+        return None
+
+    await db.execute("BEGIN IMMEDIATE")
+    cursor = await db.execute(
+        "SELECT codec, payload FROM archived_sessions WHERE session_id = ?",
+        (session_id,)
+    )
+    archived = await cursor.fetchone()
+    if archived:
+        data = decode_archive(archived["codec"], archived["payload"])
+        session = data["session"]
+        await db.execute(
+            """
+            INSERT INTO sessions (session_id, name, created_at, last_activity)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            (session_id, session["name"], session["created_at"])
+        )
+        await db.executemany(
+            """
+            INSERT INTO cards (id, session_id, category, content, author, created_at, version)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (c["id"], session_id, c["category"], c["content"], c["author"], c["created_at"], c["version"])
+                for c in data["cards"]
+            ]
+        )
+        await db.executemany(
+            "INSERT INTO actionables (card_id, completed) VALUES (?, ?)",
+            [(c["id"], c["completed"]) for c in data["cards"] if c["category"] == "actionables"]
+        )
+        await db.executemany(
+            "INSERT INTO votes (card_id, voter, session_id, count) VALUES (?, ?, ?, ?)",
+            [(v["card_id"], v["voter"], session_id, v["count"]) for v in data.get("votes", [])]
+        )
+        await db.execute(
+            "DELETE FROM archived_sessions WHERE session_id = ?",
+            (session_id,)
+        )
+    await db.commit()
+
+    cursor = await db.execute(
+        "SELECT * FROM sessions WHERE session_id = ?",
+        (session_id,)
+    )
+    row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+async def _unarchive_card(db, card_id: int):
+    cursor = await db.execute("SELECT session_id FROM archived_cards WHERE card_id = ?", (card_id,))
+    row = await cursor.fetchone()
+    if row:
+        await _rehydrate_session(db, row["session_id"])
+
+
+@tracer.traced("db.create_card")
 async def create_card(
     session_id: str,
     category: str,
@@ -99,6 +319,54 @@ async def create_card(
         await db.close()
 
 
+@tracer.traced("db.clone_cards")
+async def clone_cards(
+    session_id: str,
+    source_session_id: str,
+    only: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    source = CLONE_SOURCES[only]
+    db = await get_db()
+    try:
+        await db.execute("BEGIN IMMEDIATE")
+        cursor = await db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cards'")
+        row = await cursor.fetchone()
+        floor = row["seq"] if row else 0
+        await db.execute(
+            f"""
+            INSERT INTO cards (session_id, category, content, author)
+            SELECT ?, category, content, author FROM ({source}) ORDER BY id
+            """,
+            (session_id, source_session_id)
+        )
+        await db.execute(
+            """
+            INSERT INTO actionables (card_id)
+            SELECT id FROM cards WHERE session_id = ? AND id > ? AND category = 'actionables'
+            """,
+            (session_id, floor)
+        )
+        cursor = await db.execute(
+            """
+            SELECT c.*, a.completed
+            FROM cards c
+            LEFT JOIN actionables a ON c.id = a.card_id
+            WHERE c.session_id = ? AND c.id > ?
+            ORDER BY c.id ASC
+            """,
+            (session_id, floor)
+        )
+        cards = [dict(row) for row in await cursor.fetchall()]
+        await db.commit()
+        return cards
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_cards")
 async def get_cards(session_id: str) -> List[Dict[str, Any]]:
     db = await get_db()
     try:
@@ -108,7 +376,7 @@ async def get_cards(session_id: str) -> List[Dict[str, Any]]:
             FROM cards c
             LEFT JOIN actionables a ON c.id = a.card_id
             WHERE c.session_id = ?
-            ORDER BY c.created_at ASC
+            ORDER BY c.created_at ASC, c.id ASC
             """,
             (session_id,)
         )
@@ -118,12 +386,77 @@ async def get_cards(session_id: str) -> List[Dict[str, Any]]:
         await db.close()
 
 
+@tracer.traced("db.get_card_pages")
+async def get_card_pages(
+    session_id: str,
+    categories: Sequence[str],
+    limit: int,
+    after: int = 0
+) -> Dict[str, List[Dict[str, Any]]]:
+    db = await get_db()
+    try:
+        pages = {}
+        for category in categories:
+            cursor = await db.execute(
+                """
+                SELECT c.*, a.completed
+                FROM cards c
+                LEFT JOIN actionables a ON c.id = a.card_id
+                WHERE c.session_id = ? AND c.category = ? AND c.id > ?
+                ORDER BY c.id
+                LIMIT ?
+                """,
+                (session_id, category, after, limit)
+            )
+            pages[category] = [dict(row) for row in await cursor.fetchall()]
+        return pages
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_open_actionables")
+async def get_open_actionables(session_ids: Sequence[str]) -> List[Dict[str, Any]]:
+    if not session_ids:
+        return []
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            f"SELECT * FROM open_actionables WHERE session_id IN ({','.join('?' * len(session_ids))}) ORDER BY id",
+            list(session_ids)
+        )
+        return [dict(row) for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_card")
+async def get_card(card_id: int) -> Optional[Dict[str, Any]]:
+    db = await get_db()
+    try:
+        await _unarchive_card(db, card_id)
+        cursor = await db.execute(
+            """
+            SELECT c.*, a.completed
+            FROM cards c
+            LEFT JOIN actionables a ON c.id = a.card_id
+            WHERE c.id = ?
+            """,
+            (card_id,)
+        )
+        row = await cursor.fetchone()
+        return dict(row) if row else None
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.update_card")
 async def update_card(card_id: int, content: Optional[str] = None) -> Optional[Dict[str, Any]]:
     db = await get_db()
     try:
+        await _unarchive_card(db, card_id)
         if content is not None:
             await db.execute(
-                "UPDATE cards SET content = ? WHERE id = ?",
+                "UPDATE cards SET content = ?, version = version + 1 WHERE id = ?",
                 (content, card_id)
             )
             await db.commit()
@@ -143,13 +476,20 @@ async def update_card(card_id: int, content: Optional[str] = None) -> Optional[D
         await db.close()
 
 
+@tracer.traced("db.toggle_actionable")
 async def toggle_actionable(card_id: int, completed: bool) -> Optional[Dict[str, Any]]:
     db = await get_db()
     try:
-        await db.execute(
+        await _unarchive_card(db, card_id)
+        cursor = await db.execute(
             "UPDATE actionables SET completed = ? WHERE card_id = ?",
             (completed, card_id)
         )
+        if cursor.rowcount > 0:
+            await db.execute(
+                "UPDATE cards SET version = version + 1 WHERE id = ?",
+                (card_id,)
+            )
         await db.commit()
 
         cursor = await db.execute(
@@ -167,9 +507,11 @@ async def toggle_actionable(card_id: int, completed: bool) -> Optional[Dict[str,
         await db.close()
 
 
+@tracer.traced("db.delete_card")
 async def delete_card(card_id: int) -> bool:
     db = await get_db()
     try:
+        await _unarchive_card(db, card_id)
         cursor = await db.execute(
             "DELETE FROM cards WHERE id = ?",
             (card_id,)
@@ -180,6 +522,102 @@ async def delete_card(card_id: int) -> bool:
         await db.close()
 
 
+@tracer.traced("db.apply_card_operations")
+async def apply_card_operations(
+    session_id: str,
+    operations: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    db = await get_db()
+    try:
+        await db.execute("BEGIN IMMEDIATE")
+        results = []
+        changed: Dict[int, List[str]] = {}
+        deleted: List[int] = []
+        for operation in operations:
+            status = await _apply_card_operation(db, session_id, operation)
+            results.append({
+                "op": operation["op"],
+                "card_id": operation["card_id"],
+                "status": status
+            })
+            if status != "ok":
+                continue
+            card_id = operation["card_id"]
+            if operation["op"] == "delete":
+                changed.pop(card_id, None)
+                deleted.append(card_id)
+            else:
+                field = "completed" if operation["op"] == "toggle" else "content"
+                fields = changed.setdefault(card_id, [])
+                if field not in fields:
+                    fields.append(field)
+
+        if any(result["status"] != "ok" for result in results):
+            await db.rollback()
+            return {"applied": False, "results": results, "cards": [], "changed": {}, "deleted": []}
+
+        cards = []
+        if changed:
+            placeholders = ", ".join("?" for _ in changed)
+            await db.execute(
+                f"UPDATE cards SET version = version + 1 WHERE id IN ({placeholders})",
+                tuple(changed)
+            )
+            cursor = await db.execute(
+                f"""
+                SELECT c.*, a.completed
+                FROM cards c
+                LEFT JOIN actionables a ON c.id = a.card_id
+                WHERE c.id IN ({placeholders})
+                """,
+                tuple(changed)
+            )
+            rows = {row["id"]: dict(row) for row in await cursor.fetchall()}
+            cards = [rows[card_id] for card_id in changed]
+        await db.commit()
+        return {"applied": True, "results": results, "cards": cards, "changed": changed, "deleted": deleted}
+    finally:
+        await db.close()
+
+
+async def _apply_card_operation(db, session_id: str, operation: Dict[str, Any]) -> str:
+    cursor = await db.execute(
+        "SELECT session_id, category, author FROM cards WHERE id = ?",
+        (operation["card_id"],)
+    )
+    row = await cursor.fetchone()
+    if not row or row["session_id"] != session_id:
+        return "not_found"
+
+    if operation["op"] == "toggle":
+        if operation.get("completed") is None or row["category"] != "actionables":
+            return "invalid"
+        await db.execute(
+            "UPDATE actionables SET completed = ? WHERE card_id = ?",
+            (operation["completed"], operation["card_id"])
+        )
+    elif operation["op"] == "edit":
+        if operation.get("content") is None:
+            return "invalid"
+        await db.execute(
+            "UPDATE cards SET content = ? WHERE id = ?",
+            (operation["content"], operation["card_id"])
+        )
+    elif operation["op"] == "delete":
+        if not operation.get("author"):
+            return "invalid"
+        if operation["author"] != row["author"]:
+            return "forbidden"
+        await db.execute(
+            "DELETE FROM cards WHERE id = ?",
+            (operation["card_id"],)
+        )
+    else:
+        return "invalid"
+    return "ok"
+
+
+@tracer.traced("db.delete_all_cards")
 async def delete_all_cards(session_id: str) -> bool:
     db = await get_db()
     try:
@@ -193,6 +631,7 @@ async def delete_all_cards(session_id: str) -> bool:
         await db.close()
 
 
+@tracer.traced("db.get_all_sessions")
 async def get_all_sessions() -> List[Dict[str, Any]]:
     db = await get_db()
     try:
@@ -212,6 +651,7 @@ async def get_all_sessions() -> List[Dict[str, Any]]:
         await db.close()
 
 
+@tracer.traced("db.update_session_name")
 async def update_session_name(session_id: str, name: str) -> Optional[Dict[str, Any]]:
     db = await get_db()
     try:
@@ -231,6 +671,7 @@ async def update_session_name(session_id: str, name: str) -> Optional[Dict[str,
         await db.close()
 
 
+@tracer.traced("db.update_session_activity")
 async def update_session_activity(session_id: str) -> bool:
     db = await get_db()
     try:
@@ -244,6 +685,7 @@ async def update_session_activity(session_id: str) -> bool:
         await db.close()
 
 
+@tracer.traced("db.cleanup_old_sessions")
 async def cleanup_old_sessions(hours: int = 24) -> int:
     cutoff_time = datetime.now() - timedelta(hours=hours)
     db = await get_db()
@@ -256,3 +698,323 @@ async def cleanup_old_sessions(hours: int = 24) -> int:
         return cursor.rowcount
     finally:
         await db.close()
+
+
+@tracer.traced("db.archive_idle_sessions")
+async def archive_idle_sessions(hours: int = 24, limit: int = 500) -> int:
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            """
+            SELECT session_id FROM sessions
+            WHERE last_activity < datetime('now', ?)
+            ORDER BY last_activity ASC
+            LIMIT ?
+            """,
+            (f"-{hours} hours", limit)
+        )
+        session_ids = [row["session_id"] for row in await cursor.fetchall()]
+        archived = 0
+        for session_id in session_ids:
+            if await _archive_session(db, session_id, f"-{hours} hours"):
+                archived += 1
+        return archived
+    finally:
+        await db.close()
+
+
+async def _archive_session(db, session_id: str, idle_for: str) -> bool:
+    await db.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = await db.execute(
+            "SELECT * FROM sessions WHERE session_id = ? AND last_activity < datetime('now', ?)",
+            (session_id, idle_for)
+        )
+        session = await cursor.fetchone()
+        if not session:
+            await db.rollback()
+            return False
+        cursor = await db.execute(
+            """
+            SELECT c.id, c.category, c.content, c.author, c.created_at, c.version, a.completed
+            FROM cards c
+            LEFT JOIN actionables a ON c.id = a.card_id
+            WHERE c.session_id = ?
+            ORDER BY c.id ASC
+            """,
+            (session_id,)
+        )
+        cards = [dict(row) for row in await cursor.fetchall()]
+        cursor = await db.execute(
+            "SELECT card_id, voter, count FROM votes WHERE session_id = ?",
+            (session_id,)
+        )
+        votes = [dict(row) for row in await cursor.fetchall()]
+        codec, payload = encode_archive({"session": dict(session), "cards": cards, "votes": votes})
+        await db.execute(
+            """
+            INSERT INTO archived_sessions
+                (session_id, created_at, last_activity, card_count, codec, payload)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (session_id, session["created_at"], session["last_activity"], len(cards), codec, payload)
+        )
+        await db.executemany(ARCHIVED_CARD_INSERT, [_archived_card(session_id, card) for card in cards])
+        await db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        await db.commit()
+        return True
+    except Exception:
+        await db.rollback()
+        raise
+
+
+@tracer.traced("db.purge_archived_sessions")
+async def purge_archived_sessions(hours: int = 24) -> int:
+    cutoff_time = datetime.now() - timedelta(hours=hours)
+    db = await get_db()
+    try:
+        await db.execute("BEGIN IMMEDIATE")
+        cursor = await db.execute(
+            "SELECT codec, payload FROM archived_sessions WHERE created_at < ?",
+            (cutoff_time,)
+        )
+        card_ids = [
+            (card["id"],)
+            for row in await cursor.fetchall()
+            for card in decode_archive(row["codec"], row["payload"])["cards"]
+        ]
+        await db.executemany("DELETE FROM cards_fts WHERE rowid = ?", card_ids)
+        cursor = await db.execute(
+            "DELETE FROM archived_sessions WHERE created_at < ?",
+            (cutoff_time,)
+        )
+        await db.commit()
+        return cursor.rowcount
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_votes")
+async def get_votes(session_id: str) -> List[Dict[str, Any]]:
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            "SELECT card_id, voter, count FROM votes WHERE session_id = ?",
+            (session_id,)
+        )
+        return [dict(row) for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.save_votes")
+async def save_votes(votes: List[Dict[str, Any]]) -> int:
+    db = await get_db()
+    try:
+        session_ids = sorted({v["session_id"] for v in votes})
+        cursor = await db.execute(
+            f"SELECT session_id FROM archived_sessions WHERE session_id IN ({','.join('?' * len(session_ids))})",
+            session_ids
+        )
+        for row in await cursor.fetchall():
+            await _rehydrate_session(db, row["session_id"])
+        await db.executemany(
+            """
+            INSERT INTO votes (card_id, voter, session_id, count)
+            SELECT id, ?, session_id, ? FROM cards WHERE id = ? AND session_id = ?
+            ON CONFLICT(card_id, voter) DO UPDATE SET count = excluded.count
+            """,
+            [
+                (v["voter"], v["count"], v["card_id"], v["session_id"])
+                for v in votes if v["count"] > 0
+            ]
+        )
+        await db.executemany(
+            "DELETE FROM votes WHERE card_id = ? AND voter = ?",
+            [(v["card_id"], v["voter"]) for v in votes if v["count"] <= 0]
+        )
+        await db.commit()
+        return len(votes)
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.acquire_job_lease")
+async def acquire_job_lease(name: str, owner: str, ttl: float) -> bool:
+    now = time.time()
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            """
+            INSERT INTO job_leases (name, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE
+            SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE job_leases.owner = excluded.owner OR job_leases.expires_at < ?
+            """,
+            (name, owner, now + ttl, now)
+        )
+        await db.commit()
+        return cursor.rowcount == 1
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_job_leases")
+async def get_job_leases() -> List[Dict[str, Any]]:
+    db = await get_db()
+    try:
+        cursor = await db.execute("SELECT * FROM job_leases ORDER BY name")
+        return [dict(row) for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.record_job_run")
+async def record_job_run(
+    name: str,
+    owner: str,
+    started_at: float,
+    duration_ms: float,
+    status: str,
+    detail: Optional[str] = None,
+    keep: int = 1000
+):
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            """
+            INSERT INTO job_runs (name, owner, started_at, duration_ms, status, detail)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (name, owner, started_at, duration_ms, status, detail)
+        )
+        await db.execute("DELETE FROM job_runs WHERE id <= ?", (cursor.lastrowid - keep,))
+        await db.commit()
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_job_runs")
+async def get_job_runs(limit: int = 50, name: Optional[str] = None) -> List[Dict[str, Any]]:
+    db = await get_db()
+    try:
+        if name:
+            cursor = await db.execute(
+                "SELECT * FROM job_runs WHERE name = ? ORDER BY id DESC LIMIT ?",
+                (name, limit)
+            )
+        else:
+            cursor = await db.execute(
+                "SELECT * FROM job_runs ORDER BY id DESC LIMIT ?",
+                (limit,)
+            )
+        return [dict(row) for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.search_cards")
+async def search_cards(
+    terms: List[str],
+    session_id: Optional[str] = None,
+    limit: int = 20,
+    after: Optional[tuple] = None
+) -> List[Dict[str, Any]]:
+    sql = f"""
+        SELECT rowid AS id, session_id, category, author, created_at,
+               highlight(cards_fts, 0, '{HIT_OPEN}', '{HIT_CLOSE}') AS highlight
+        FROM cards_fts
+        WHERE cards_fts MATCH ?
+    """
+    params: List[Any] = [fts_query(terms, session_id)]
+    if session_id:
+        sql += " AND session_id = ?"
+        params.append(session_id)
+
+    async def fetch(ceiling: Optional[int]) -> List[Dict[str, Any]]:
+        query, args = sql, params
+        if ceiling is not None:
+            query, args = query + " AND rowid <= ?", args + [ceiling]
+        cursor = await db.execute(query + " ORDER BY rowid DESC LIMIT ?", args + [SEARCH_WINDOW])
+        return [dict(row) for row in await cursor.fetchall()]
+
+    db = await get_db()
+    try:
+        return await search_windows(fetch, limit, after)
+    finally:
+        await db.close()
+
+
+@tracer.traced("db.get_session_stats")
+async def get_session_stats(session_id: str) -> Optional[Dict[str, Any]]:
+    stats = await _read_stats(session_id)
+    return {"session_id": session_id, **stats} if stats else None
+
+
+@tracer.traced("db.get_global_stats")
+async def get_global_stats() -> Dict[str, Any]:
+    return await _read_stats("")
+
+
+async def _read_stats(key: str) -> Optional[Dict[str, Any]]:
+    db = await get_db()
+    try:
+        cursor = await db.execute(
+            "SELECT sessions, contributors FROM board_stats WHERE session_id = ?",
+            (key,)
+        )
+        board = await cursor.fetchone()
+        if not board:
+            return None
+        cursor = await db.execute(
+            "SELECT category, cards, completed FROM category_stats WHERE session_id = ?",
+            (key,)
+        )
+        categories = [tuple(row) for row in await cursor.fetchall()]
+        cursor = await db.execute(
+            "SELECT bucket, cards FROM activity_stats WHERE session_id = ? ORDER BY bucket DESC LIMIT ?",
+            (key, ACTIVITY_BUCKETS)
+        )
+        activity = [tuple(row) for row in await cursor.fetchall()]
+    finally:
+        await db.close()
+    stats = summarize(categories, board["contributors"], activity)
+    if key == "":
+        stats = {"sessions": board["sessions"], **stats}
+    return stats
+
+
+@tracer.traced("db.rebuild_stats")
+async def rebuild_stats() -> float:
+    started = time.perf_counter()
+    db = await get_db()
+    try:
+        await db.execute("BEGIN IMMEDIATE")
+        await _rebuild_stats(db)
+        await db.commit()
+    finally:
+        await db.close()
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+@tracer.traced("db.check_stats")
+async def check_stats() -> Dict[str, int]:
+    mismatches = {}
+    db = await get_db()
+    try:
+        for table, (columns, query) in STATS_SOURCES.items():
+            cursor = await db.execute(
+                f"""
+                SELECT COUNT(*) FROM (
+                    SELECT * FROM (SELECT {columns} FROM {table} EXCEPT SELECT * FROM ({query}))
+                    UNION ALL
+                    SELECT * FROM (SELECT * FROM ({query}) EXCEPT SELECT {columns} FROM {table})
+                )
+                """
+            )
+            rows = (await cursor.fetchone())[0]
+            if rows:
+                mismatches[table] = rows
+    finally:
+        await db.close()
+    return mismatches
@@ -0,0 +1,221 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import database
+from .archive import decode_archive
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+ROW_GROUP_SIZE = 50000
+FORMATS = ("parquet", "arrow", "csv")
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+    "csv": "text/csv",
+}
+COLUMNS = (
+    "id", "session_id", "session_name", "session_created_at", "category", "content",
+    "author", "created_at", "version", "completed", "archived",
+)
+TIMESTAMP_COLUMNS = ("session_created_at", "created_at")
+
+LIVE_CARDS = """
+    SELECT c.id, c.session_id, s.name AS session_name, s.created_at AS session_created_at,
+           c.category, c.content, c.author, c.created_at, c.version, a.completed, 0 AS archived
+    FROM cards c
+    JOIN sessions s ON s.session_id = c.session_id
+    LEFT JOIN actionables a ON a.card_id = c.id
+    WHERE c.id > ?
+    ORDER BY c.id
+    LIMIT ?
+"""
+
+
+def resolve_format(requested: Optional[str] = None) -> str:
+    if requested is not None and requested not in FORMATS:
+        raise ValueError(f"Unknown export format: {requested}")
+    if pyarrow is None:
+        return "csv"
+    return requested or "parquet"
+
+
+def _row(row: Dict[str, Any]) -> Dict[str, Any]:
+    completed = row["completed"]
+    return {
+        **row,
+        "completed": None if completed is None else bool(completed),
+        "archived": bool(row["archived"]),
+    }
+
+
+def iter_batches(conn: sqlite3.Connection, since: int, size: int) -> Iterator[List[Dict[str, Any]]]:
+    after = since
+    while True:
+        rows = conn.execute(LIVE_CARDS, (after, size)).fetchall()
+        if not rows:
+            break
+        yield [_row(dict(row)) for row in rows]
+        after = rows[-1]["id"]
+
+    batch = []
+    for archived in conn.execute("SELECT codec, payload FROM archived_sessions ORDER BY session_id"):
+        data = decode_archive(archived["codec"], archived["payload"])
+        session = data["session"]
+        for card in data["cards"]:
+            if card["id"] <= since:
+                continue
+            batch.append(_row({
+                "id": card["id"],
+                "session_id": session["session_id"],
+                "session_name": session["name"],
+                "session_created_at": session["created_at"],
+                "category": card["category"],
+                "content": card["content"],
+                "author": card["author"],
+                "created_at": card["created_at"],
+                "version": card["version"],
+                "completed": card["completed"],
+                "archived": 1,
+            }))
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+class CsvSink:
+    def __init__(self, path: Path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowSink:
+    def __init__(self, path: Path, fmt: str):
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.int64()),
+            ("session_id", pyarrow.string()),
+            ("session_name", pyarrow.string()),
+            ("session_created_at", pyarrow.timestamp("s")),
+            ("category", pyarrow.string()),
+            ("content", pyarrow.string()),
+            ("author", pyarrow.string()),
+            ("created_at", pyarrow.timestamp("s")),
+            ("version", pyarrow.int64()),
+            ("completed", pyarrow.bool_()),
+            ("archived", pyarrow.bool_()),
+        ])
+        if fmt == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(str(path), self.schema, compression="zstd")
+        else:
+            self.writer = pyarrow.ipc.new_file(str(path), self.schema)
+
+    def write(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            for column in TIMESTAMP_COLUMNS:
+                if row[column] is not None:
+                    row[column] = datetime.fromisoformat(row[column])
+        self.writer.write_table(pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def export_cards(
+    directory: str,
+    since: int = 0,
+    fmt: Optional[str] = None,
+    database_path: Optional[str] = None,
+    batch_size: int = ROW_GROUP_SIZE
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    fmt = resolve_format(fmt)
+    out_dir = Path(directory)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    partial = out_dir / f".cards-{os.getpid()}-{time.time_ns()}{SUFFIXES[fmt]}.partial"
+
+    conn = sqlite3.connect(
+        f"file:{database_path or database.DATABASE_PATH}?mode=ro", uri=True, isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    sink = CsvSink(partial) if fmt == "csv" else ArrowSink(partial, fmt)
+    rows = 0
+    watermark = since
+    try:
+        conn.execute("BEGIN")
+        for batch in iter_batches(conn, since, batch_size):
+            rows += len(batch)
+            watermark = max(watermark, max(row["id"] for row in batch))
+            sink.write(batch)
+    except Exception:
+        sink.close()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.close()
+    sink.close()
+
+    path = None
+    if rows:
+        path = out_dir / f"cards-{since + 1}-{watermark}{SUFFIXES[fmt]}"
+        os.replace(partial, path)
+    else:
+        partial.unlink(missing_ok=True)
+    return {
+        "path": str(path) if path else None,
+        "format": fmt,
+        "rows": rows,
+        "since": since,
+        "watermark": watermark,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.export")
+    parser.add_argument("--database", default=database.DATABASE_PATH)
+    parser.add_argument("--dir", default=os.getenv("EXPORT_DIR", "."))
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--since", type=int, help="export cards with a larger id")
+    parser.add_argument("--state", help="file holding the watermark between runs")
+    args = parser.parse_args(argv)
+
+    since = args.since
+    if since is None and args.state and os.path.exists(args.state):
+        since = int(Path(args.state).read_text().strip() or 0)
+    if args.format and resolve_format(args.format) != args.format:
+        print(f"pyarrow is not installed, writing CSV instead of {args.format}", file=sys.stderr)
+
+    result = export_cards(args.dir, since or 0, args.format, args.database)
+    if args.state:
+        Path(args.state).write_text(f"{result['watermark']}\n")
+    if result["path"]:
+        print(f"Wrote {result['rows']} cards to {result['path']} in {result['duration_ms']} ms")
+    else:
+        print("No new cards")
+    print(f"Watermark: {result['watermark']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
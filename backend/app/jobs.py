@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .storage import Storage
+
+
+class Job:
+    def __init__(self, name: str, interval: float, fn: Callable[[], Awaitable[Any]]):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.idle = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "idle": self.idle,
+            "last_run": self.last_run,
+        }
+
+
+class JobScheduler:
+    def __init__(self, storage: Storage, owner: Optional[str] = None, jitter: float = 0.1):
+        self.storage = storage
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.jitter = jitter
+        self.jobs: Dict[str, Job] = {}
+
+    def add(self, name: str, interval: float, fn: Callable[[], Awaitable[Any]]):
+        if interval > 0:
+            self.jobs[name] = Job(name, interval, fn)
+
+    async def run(self):
+        await asyncio.gather(*(self._loop(job) for job in self.jobs.values()))
+
+    async def _loop(self, job: Job):
+        while True:
+            await asyncio.sleep(self.next_delay(job.interval))
+            await self.run_once(job)
+
+    def next_delay(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def run_once(self, job: Job) -> bool:
+        try:
+            leased = await self.storage.acquire_job_lease(
+                job.name, self.owner, job.interval * (2 + self.jitter)
+            )
+        except Exception:
+            leased = False
+        if not leased:
+            job.skipped += 1
+            return False
+
+        started_at = time.time()
+        started = time.perf_counter()
+        status, detail = "ok", None
+        try:
+            result = await job.fn()
+            if result is None:
+                job.idle += 1
+                return True
+            detail = json.dumps(result, default=str)
+        except Exception as exc:
+            status, detail = "error", f"{type(exc).__name__}: {exc}"
+            job.failures += 1
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        job.runs += 1
+        job.last_run = {
+            "started_at": started_at,
+            "duration_ms": duration_ms,
+            "status": status,
+            "detail": detail,
+        }
+        try:
+            await self.storage.record_job_run(
+                job.name, self.owner, started_at, duration_ms, status, detail
+            )
+        except Exception:
+            pass
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: job.stats() for name, job in self.jobs.items()}
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+
+class SlowCallbackHandler(logging.Handler):
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage()
+        if message.startswith("Executing"):
+            self.monitor.events.append({
+                "kind": "slow_callback",
+                "at": time.time(),
+                "message": message,
+            })
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = 0.1,
+        shed_threshold: float = 0.2,
+        block_threshold: float = 0.1,
+        max_events: int = 50
+    ):
+        self.interval = interval
+        self.shed_threshold = shed_threshold
+        self.block_threshold = block_threshold
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.overloaded = False
+        self.overload_episodes = 0
+        self.shed_counts: Dict[str, int] = {}
+        self.recover_callbacks: List[Callable[[], Awaitable[None]]] = []
+        self.events: Deque[dict] = deque(maxlen=max_events)
+        self.last_tick = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.watchdog: Optional[threading.Thread] = None
+        self.stop_watchdog = threading.Event()
+        self.current_stall: Optional[dict] = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.start_watchdog()
+        try:
+            while True:
+                started = loop.time()
+                self.last_tick = time.monotonic()
+                await asyncio.sleep(self.interval)
+                self.last_tick = time.monotonic()
+                await self.record(max(0.0, loop.time() - started - self.interval))
+        finally:
+            self.stop_watchdog.set()
+            self.watchdog = None
+
+    async def record(self, lag: float):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        self.histogram[self._bucket(lag * 1000)] += 1
+        stall = self.current_stall
+        if stall is not None:
+            stall["blocked_ms"] = round(lag * 1000, 1)
+            self.current_stall = None
+        if self.shed_threshold <= 0:
+            return
+        if not self.overloaded and lag > self.shed_threshold:
+            self.overloaded = True
+            self.overload_episodes += 1
+        elif self.overloaded and lag < self.shed_threshold / 2:
+            self.overloaded = False
+            for callback in self.recover_callbacks:
+                try:
+                    await callback()
+                except Exception:
+                    pass
+
+    def _bucket(self, lag_ms: float) -> int:
+        for index, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                return index
+        return len(LAG_BUCKETS_MS)
+
+    def start_watchdog(self):
+        if self.block_threshold <= 0 or self.watchdog is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.stop_watchdog.clear()
+        self.watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.watchdog.start()
+
+    def _watch(self):
+        limit = self.interval + self.block_threshold
+        while not self.stop_watchdog.wait(self.block_threshold / 2):
+            stalled_for = time.monotonic() - self.last_tick
+            if stalled_for <= limit or self.current_stall is not None:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            self.current_stall = {
+                "kind": "blocked_loop",
+                "at": time.time(),
+                "blocked_ms": round(stalled_for * 1000, 1),
+                "stack": traceback.format_stack(frame),
+            }
+            self.events.append(self.current_stall)
+
+    def enable_slow_callback_capture(self, loop: asyncio.AbstractEventLoop):
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.block_threshold
+        logging.getLogger("asyncio").addHandler(SlowCallbackHandler(self))
+
+    def should_shed(self, kind: str) -> bool:
+        if not self.overloaded:
+            return False
+        self.shed_counts[kind] = self.shed_counts.get(kind, 0) + 1
+        return True
+
+    def histogram_ms(self) -> Dict[str, int]:
+        labels = [f"le_{bound}" for bound in LAG_BUCKETS_MS] + ["inf"]
+        return dict(zip(labels, self.histogram))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "lag_ms": round(self.lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "overloaded": self.overloaded,
+            "overload_episodes": self.overload_episodes,
+            "shed": dict(self.shed_counts),
+        }
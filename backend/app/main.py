@@ -1,64 +1,237 @@
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from contextlib import asynccontextmanager
 import asyncio
+import logging
+import random
 import secrets
 import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Dict
+import time
+from typing import Any, Dict, List, Literal, Optional
 
 SESSION_RETENTION_HOURS = int(os.getenv("SESSION_RETENTION_HOURS", "336"))  # 14 days default
-MAX_CARDS_PER_SESSION = int(os.getenv("MAX_CARDS_PER_SESSION", "200"))
-
-from .database import (
-    init_db,
-    create_session,
-    get_session,
-    get_all_sessions,
-    update_session_name,
-    update_session_activity,
-    create_card,
-    get_cards,
-    update_card,
-    toggle_actionable,
-    delete_card,
-    delete_all_cards,
-    cleanup_old_sessions,
-)
+SESSION_ARCHIVE_AFTER_HOURS = int(os.getenv("SESSION_ARCHIVE_AFTER_HOURS", "24"))  # 0 disables archiving
+MAX_CARDS_PER_SESSION = int(os.getenv("MAX_CARDS_PER_SESSION", "10000"))
+CARD_PAGE_SIZE = int(os.getenv("CARD_PAGE_SIZE", "50"))  # default page size for per-column loading
+MAX_CARD_PAGE_SIZE = 500
+MAX_ACTIONABLE_SESSIONS = 50
+WS_BATCH_WINDOW_MS = int(os.getenv("WS_BATCH_WINDOW_MS", "0"))  # 0 disables batching
+ACTIVITY_TOUCH_INTERVAL_SECONDS = float(os.getenv("ACTIVITY_TOUCH_INTERVAL_SECONDS", "60"))
+WS_HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("WS_HEARTBEAT_INTERVAL_SECONDS", "25"))  # 0 disables
+WS_HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("WS_HEARTBEAT_TIMEOUT_SECONDS", "75"))
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "5000"))  # 0 means unlimited
+WS_MAX_CONNECTIONS_PER_SESSION = int(os.getenv("WS_MAX_CONNECTIONS_PER_SESSION", "500"))
+WS_MAX_SPECTATORS = int(os.getenv("WS_MAX_SPECTATORS", "20000"))  # 0 means unlimited
+WS_SPECTATOR_BUFFER = int(os.getenv("WS_SPECTATOR_BUFFER", "256"))  # events a slow spectator may fall behind
+CARD_RATE_LIMIT_PER_SECOND = float(os.getenv("CARD_RATE_LIMIT_PER_SECOND", "10"))  # 0 disables
+CARD_RATE_LIMIT_BURST = int(os.getenv("CARD_RATE_LIMIT_BURST", "60"))
+LOOP_LAG_SHED_THRESHOLD_MS = int(os.getenv("LOOP_LAG_SHED_THRESHOLD_MS", "200"))  # 0 disables shedding
+LOOP_BLOCK_THRESHOLD_MS = int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))  # 0 disables the watchdog
+LOOP_DEBUG = os.getenv("LOOP_DEBUG", "").lower() in ("1", "true", "yes")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # admin endpoints are disabled when unset
+WS_RETRY_AFTER_SECONDS = float(os.getenv("WS_RETRY_AFTER_SECONDS", "1"))
+WS_RETRY_SPREAD_SECONDS = float(os.getenv("WS_RETRY_SPREAD_SECONDS", "10"))
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")  # sqlite or memory
+MEMORY_SNAPSHOT_PATH = os.getenv("MEMORY_SNAPSHOT_PATH", "")  # memory backend only, empty disables snapshots
+MEMORY_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("MEMORY_SNAPSHOT_INTERVAL_SECONDS", "60"))
+SQLITE_CHECKPOINT_INTERVAL_SECONDS = float(os.getenv("SQLITE_CHECKPOINT_INTERVAL_SECONDS", "300"))  # 0 disables
+SQLITE_WAL_TRUNCATE_MB = float(os.getenv("SQLITE_WAL_TRUNCATE_MB", "64"))  # 0 disables size-triggered truncation
+SQLITE_OPTIMIZE_INTERVAL_SECONDS = float(os.getenv("SQLITE_OPTIMIZE_INTERVAL_SECONDS", "3600"))  # 0 disables
+BACKUP_DIR = os.getenv("BACKUP_DIR", "")  # backups are disabled when unset
+BACKUP_INTERVAL_SECONDS = float(os.getenv("BACKUP_INTERVAL_SECONDS", "86400"))  # 0 disables scheduled backups
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_MS = float(os.getenv("BACKUP_STEP_SLEEP_MS", "5"))
+CARD_GROUP_THRESHOLD = float(os.getenv("CARD_GROUP_THRESHOLD", "0.5"))  # 0 disables grouping
+CARD_GROUP_MAX_SIZE = int(os.getenv("CARD_GROUP_MAX_SIZE", "50"))
+CARD_GROUP_BROADCAST_WINDOW_MS = int(os.getenv("CARD_GROUP_BROADCAST_WINDOW_MS", "250"))  # 0 broadcasts every change
+VOTES_PER_USER = int(os.getenv("VOTES_PER_USER", "3"))
+VOTE_FLUSH_INTERVAL_MS = int(os.getenv("VOTE_FLUSH_INTERVAL_MS", "1000"))
+VOTE_BROADCAST_WINDOW_MS = int(os.getenv("VOTE_BROADCAST_WINDOW_MS", "100"))  # 0 broadcasts every vote
+SERVER_STARTED_AT = float(os.getenv("SERVER_STARTED_AT", "0")) or time.time()  # set by app.serve before workers start
+
 from .models import (
     CreateCardRequest,
     UpdateCardRequest,
+    BulkCardRequest,
+    BulkCardResponse,
+    CloneCardsResponse,
+    OpenActionablesResponse,
+    CardGroupsResponse,
+    CardPageResponse,
+    CategoryType,
+    SearchResponse,
+    SessionStatsResponse,
+    GlobalStatsResponse,
+    VoteRequest,
+    VoteResponse,
+    VotesResponse,
     SessionResponse,
     CreateSessionResponse,
     Card,
     Session,
 )
+from .backup import BackupManager
+from .export import MEDIA_TYPES as EXPORT_MEDIA_TYPES, export_cards
+from .jobs import JobScheduler
+from .loop_monitor import LoopMonitor
+from .maintenance import CHECKPOINT_MODES, DatabaseMaintenance
+from .profiler import SamplingProfiler
+from .ratelimit import RateLimiter
+from .search import decode_cursor, encode_cursor, search_terms
+from .similarity import CardGrouper
+from .singleflight import SingleFlight, ActivityThrottle
+from .stats import CATEGORIES
+from .storage import create_storage
+from .tracing import TracingMiddleware, tracer
+from .votes import VoteCounter
 from .websocket_manager import WebSocketManager
 
 
-async def _cleanup_loop():
-    while True:
-        await asyncio.sleep(3600)
-        await cleanup_old_sessions(hours=SESSION_RETENTION_HOURS)
+async def _cleanup_sessions():
+    archived = 0
+    if SESSION_ARCHIVE_AFTER_HOURS > 0:
+        archived = await storage.archive_idle_sessions(hours=SESSION_ARCHIVE_AFTER_HOURS)
+    return {
+        "archived": archived,
+        "deleted": await storage.cleanup_old_sessions(hours=SESSION_RETENTION_HOURS),
+        "purged": await storage.purge_archived_sessions(hours=SESSION_RETENTION_HOURS),
+    }
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    task = asyncio.create_task(_cleanup_loop())
+    await storage.init()
+    if LOOP_DEBUG:
+        loop_monitor.enable_slow_callback_capture(asyncio.get_running_loop())
+    tasks = [
+        asyncio.create_task(jobs.run()),
+        asyncio.create_task(loop_monitor.run()),
+        asyncio.create_task(votes.run()),
+    ]
+    if WS_HEARTBEAT_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(ws_manager.heartbeat_loop()))
+    startup["ready_ms"] = round((time.time() - SERVER_STARTED_AT) * 1000, 2)
+    logging.getLogger("uvicorn.error").info(
+        "Worker %d ready %.0f ms after launch", os.getpid(), startup["ready_ms"]
+    )
     yield
-    task.cancel()
+    await ws_manager.close_all(
+        retry_after=WS_RETRY_AFTER_SECONDS,
+        spread=WS_RETRY_SPREAD_SECONDS
+    )
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    card_groups.close()
     try:
-        await task
-    except asyncio.CancelledError:
-        pass
+        await votes.close()
+    except Exception:
+        logging.getLogger("uvicorn.error").exception(
+            "Final vote flush failed, %d ballots were not saved", len(votes.dirty)
+        )
+    finally:
+        await storage.close()
+
+
+async def limit_card_mutations(request: Request):
+    client = request.client.host if request.client else "unknown"
+    retry_after = card_rate_limiter.check(client)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many card changes, slow down",
+            headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def card_delta(card: Card, fields: set) -> dict:
+    return card.model_dump(mode="json", include=fields | {"id", "version"})
+
+
+async def publish_votes(session_id: str, tallies: Dict[int, int]):
+    await ws_manager.broadcast(session_id, {"event": "votes_updated", "data": {"tallies": tallies}})
+
+
+async def publish_groups(session_id: str, groups: List[Dict[str, Any]]):
+    await ws_manager.broadcast(session_id, {"event": "card_groups", "data": {"groups": groups}})
 
 
 app = FastAPI(lifespan=lifespan)
-ws_manager = WebSocketManager()
+startup: Dict[str, Optional[float]] = {"ready_ms": None}
+storage = create_storage(
+    STORAGE_BACKEND,
+    snapshot_path=MEMORY_SNAPSHOT_PATH,
+    snapshot_interval=MEMORY_SNAPSHOT_INTERVAL_SECONDS
+)
+db_maintenance = DatabaseMaintenance(
+    checkpoint_interval=SQLITE_CHECKPOINT_INTERVAL_SECONDS,
+    truncate_threshold=int(SQLITE_WAL_TRUNCATE_MB * 1024 * 1024),
+    optimize_interval=SQLITE_OPTIMIZE_INTERVAL_SECONDS
+)
+backups = BackupManager(
+    BACKUP_DIR,
+    keep=BACKUP_KEEP,
+    pages=BACKUP_PAGES_PER_STEP,
+    step_sleep=BACKUP_STEP_SLEEP_MS / 1000
+)
+jobs = JobScheduler(storage)
+jobs.add("cleanup", 3600, _cleanup_sessions)
+if STORAGE_BACKEND == "sqlite":
+    jobs.add("db_maintenance", db_maintenance.poll_interval, db_maintenance.tick)
+    if BACKUP_DIR:
+        jobs.add("backup", BACKUP_INTERVAL_SECONDS, backups.backup)
+loop_monitor = LoopMonitor(
+    shed_threshold=LOOP_LAG_SHED_THRESHOLD_MS / 1000,
+    block_threshold=LOOP_BLOCK_THRESHOLD_MS / 1000
+)
+ws_manager = WebSocketManager(
+    batch_window=WS_BATCH_WINDOW_MS / 1000,
+    heartbeat_interval=WS_HEARTBEAT_INTERVAL_SECONDS,
+    heartbeat_timeout=WS_HEARTBEAT_TIMEOUT_SECONDS,
+    max_connections=WS_MAX_CONNECTIONS,
+    max_connections_per_session=WS_MAX_CONNECTIONS_PER_SESSION,
+    should_shed=loop_monitor.should_shed,
+    max_spectators=WS_MAX_SPECTATORS,
+    spectator_buffer=WS_SPECTATOR_BUFFER
+)
+loop_monitor.recover_callbacks.append(ws_manager.flush_presence)
+card_rate_limiter = RateLimiter(CARD_RATE_LIMIT_PER_SECOND, CARD_RATE_LIMIT_BURST)
+profiler = SamplingProfiler()
+board_loads = SingleFlight()
+activity_touches = ActivityThrottle(ACTIVITY_TOUCH_INTERVAL_SECONDS)
+card_groups = CardGrouper(
+    CARD_GROUP_THRESHOLD,
+    max_group=CARD_GROUP_MAX_SIZE,
+    broadcast_window=CARD_GROUP_BROADCAST_WINDOW_MS / 1000,
+    publish=publish_groups
+)
+votes = VoteCounter(
+    storage,
+    limit=VOTES_PER_USER,
+    flush_interval=VOTE_FLUSH_INTERVAL_MS / 1000,
+    broadcast_window=VOTE_BROADCAST_WINDOW_MS / 1000,
+    publish=publish_votes
+)
 
+app.add_middleware(TracingMiddleware, tracer=tracer)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -73,12 +246,139 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics", dependencies=[Depends(require_admin)])
+async def metrics():
+    return {
+        "board_loads": board_loads.stats(),
+        "activity_touches": activity_touches.stats(),
+        "websocket": ws_manager.stats(),
+        "card_rate_limit": card_rate_limiter.stats(),
+        "loop": loop_monitor.stats(),
+        "database": db_maintenance.stats() if STORAGE_BACKEND == "sqlite" else None,
+        "backups": backups.stats(),
+        "jobs": jobs.stats(),
+        "card_groups": card_groups.stats(),
+        "votes": votes.stats(),
+        "startup": startup,
+    }
+
+
+@app.get("/api/admin/loop", dependencies=[Depends(require_admin)])
+async def admin_loop():
+    return {
+        **loop_monitor.stats(),
+        "samples": loop_monitor.samples,
+        "histogram_ms": loop_monitor.histogram_ms(),
+        "events": list(loop_monitor.events),
+    }
+
+
+@app.post("/api/admin/profile", dependencies=[Depends(require_admin)])
+async def admin_profile(
+    seconds: float = Query(5, gt=0, le=60),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: str = Query("json", pattern="^(json|collapsed)$")
+):
+    try:
+        result = await profiler.profile(seconds, interval_ms / 1000)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if format == "collapsed":
+        return PlainTextResponse(result["collapsed"] + "\n")
+    return result
+
+
+@app.get("/api/admin/jobs", dependencies=[Depends(require_admin)])
+async def admin_jobs(
+    name: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500)
+):
+    return {
+        "owner": jobs.owner,
+        "jobs": jobs.stats(),
+        "leases": await storage.get_job_leases(),
+        "runs": await storage.get_job_runs(limit, name),
+    }
+
+
+@app.post("/api/admin/checkpoint", dependencies=[Depends(require_admin)])
+async def admin_checkpoint(mode: str = Query("PASSIVE", pattern=f"^({'|'.join(CHECKPOINT_MODES)})$")):
+    if STORAGE_BACKEND != "sqlite":
+        raise HTTPException(status_code=409, detail="Checkpoints only apply to the sqlite backend")
+    return await db_maintenance.checkpoint(mode)
+
+
+@app.get("/api/admin/export", dependencies=[Depends(require_admin)])
+async def admin_export(
+    since: int = Query(0, ge=0),
+    format: Optional[Literal["parquet", "arrow", "csv"]] = Query(None)
+):
+    if STORAGE_BACKEND != "sqlite":
+        raise HTTPException(status_code=409, detail="Exports only apply to the sqlite backend")
+    directory = tempfile.mkdtemp(prefix="retro-export-")
+    try:
+        result = await asyncio.to_thread(export_cards, directory, since, format)
+    except Exception:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    headers = {"X-Export-Watermark": str(result["watermark"]), "X-Export-Rows": str(result["rows"])}
+    if not result["path"]:
+        shutil.rmtree(directory, ignore_errors=True)
+        return Response(status_code=204, headers=headers)
+    return FileResponse(
+        result["path"],
+        media_type=EXPORT_MEDIA_TYPES[result["format"]],
+        filename=Path(result["path"]).name,
+        headers=headers,
+        background=BackgroundTask(shutil.rmtree, directory, ignore_errors=True)
+    )
+
+
+@app.post("/api/admin/backup", dependencies=[Depends(require_admin)])
+async def admin_backup():
+    if STORAGE_BACKEND != "sqlite":
+        raise HTTPException(status_code=409, detail="Backups only apply to the sqlite backend")
+    try:
+        return await backups.backup()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+
+@app.get("/api/admin/backups", dependencies=[Depends(require_admin)])
+async def admin_list_backups():
+    return {**backups.stats(), "files": await asyncio.to_thread(backups.available)}
+
+
+@app.get("/api/search", response_model=SearchResponse)
+async def search_cards(
+    q: str = Query(..., min_length=1, max_length=200),
+    session: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None)
+):
+    terms = search_terms(q)
+    if not terms:
+        return SearchResponse(results=[])
+    try:
+        cursor = decode_cursor(after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = await storage.search_cards(terms, session, limit + 1, cursor)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["score"], last["id"], last["ceiling"])
+    return SearchResponse(results=rows, next=next_cursor)
+
+
 @app.post("/api/session/create", response_model=CreateSessionResponse)
 async def create_new_session():
     for _ in range(5):
         session_id = secrets.token_urlsafe(8)[:8]
         try:
-            await create_session(session_id)
+            await storage.create_session(session_id)
             return CreateSessionResponse(session_id=session_id)
         except Exception:
             continue
@@ -87,51 +387,151 @@ async def create_new_session():
 
 @app.get("/api/sessions")
 async def list_sessions():
-    sessions = await get_all_sessions()
+    sessions = await storage.get_all_sessions()
     return {"sessions": sessions}
 
 
+def _page(cards: list, limit: int):
+    if len(cards) > limit:
+        return cards[:limit], cards[limit - 1]["id"]
+    return cards, None
+
+
+async def _load_board(session_id: str, per_column: Optional[int] = None):
+    session = await storage.get_session(session_id)
+    if not session:
+        return None, [], None
+    if per_column is None:
+        return session, await storage.get_cards(session_id), None
+    pages = await storage.get_card_pages(session_id, CATEGORIES, per_column + 1)
+    cards = []
+    next_after = {}
+    for category in CATEGORIES:
+        page, next_after[category] = _page(pages[category], per_column)
+        cards.extend(page)
+    return session, cards, next_after
+
+
 @app.get("/api/session/{session_id}", response_model=SessionResponse)
-async def get_session_data(session_id: str):
-    session = await get_session(session_id)
+async def get_session_data(
+    session_id: str,
+    per_column: Optional[int] = Query(None, ge=1, le=MAX_CARD_PAGE_SIZE)
+):
+    session, cards, next_after = await board_loads.do(
+        (session_id, per_column), lambda: _load_board(session_id, per_column)
+    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    cards = await get_cards(session_id)
-    await update_session_activity(session_id)
+    if not loop_monitor.should_shed("activity") and activity_touches.should_touch(session_id):
+        await storage.update_session_activity(session_id)
     return SessionResponse(
         session=Session(**session),
-        cards=[Card(**card) for card in cards]
+        cards=[Card(**card) for card in cards],
+        next_after=next_after
+    )
+
+
+@app.get("/api/session/{session_id}/cards", response_model=CardPageResponse)
+async def get_card_page(
+    session_id: str,
+    category: CategoryType,
+    after: int = Query(0, ge=0),
+    limit: int = Query(CARD_PAGE_SIZE, ge=1, le=MAX_CARD_PAGE_SIZE)
+):
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    pages = await storage.get_card_pages(session_id, [category], limit + 1, after)
+    cards, next_after = _page(pages[category], limit)
+    return CardPageResponse(cards=[Card(**card) for card in cards], next_after=next_after)
+
+
+@app.get("/api/session/{session_id}/groups", response_model=CardGroupsResponse)
+async def get_card_groups(session_id: str):
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not card_groups.enabled:
+        return CardGroupsResponse(groups=[])
+
+    index = await card_groups.load(session_id, lambda: storage.get_cards(session_id))
+    return CardGroupsResponse(groups=index.groups())
+
+
+@app.get("/api/session/{session_id}/stats", response_model=SessionStatsResponse)
+async def get_session_stats(session_id: str):
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return await storage.get_session_stats(session_id)
+
+
+@app.get("/api/stats", response_model=GlobalStatsResponse)
+async def get_global_stats():
+    return await storage.get_global_stats()
+
+
+@app.get("/api/session/{session_id}/votes", response_model=VotesResponse)
+async def get_session_votes(session_id: str, voter: Optional[str] = Query(None)):
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    state = await votes.load(session_id)
+    return VotesResponse(
+        limit=votes.limit,
+        tallies=state.tallies,
+        mine=state.mine(voter) if voter else {},
+        remaining=votes.remaining(state, voter)
     )
 
 
+@app.post("/api/session/{session_id}/card/{card_id}/vote", response_model=VoteResponse)
+async def vote_card(session_id: str, card_id: int, vote: VoteRequest):
+    if not await storage.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not await votes.has_card(session_id, card_id):
+        raise HTTPException(status_code=404, detail="Card not found")
+
+    result = await votes.vote(session_id, card_id, vote.voter, -1 if vote.remove else 1)
+    if result is None:
+        detail = "No vote to remove" if vote.remove else f"All {votes.limit} votes are used"
+        raise HTTPException(status_code=409, detail=detail)
+    return VoteResponse(**result)
+
+
 @app.patch("/api/session/{session_id}")
 async def update_session(session_id: str, data: dict):
-    session = await get_session(session_id)
+    session = await storage.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     if "name" in data:
-        updated_session = await update_session_name(session_id, data["name"])
+        updated_session = await storage.update_session_name(session_id, data["name"])
         return updated_session
 
     raise HTTPException(status_code=400, detail="No valid update data provided")
 
 
-@app.post("/api/session/{session_id}/card", response_model=Card)
+@app.post(
+    "/api/session/{session_id}/card",
+    response_model=Card,
+    dependencies=[Depends(limit_card_mutations)]
+)
 async def add_card(session_id: str, card_data: CreateCardRequest):
-    session = await get_session(session_id)
+    session = await storage.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    existing_cards = await get_cards(session_id)
-    if len(existing_cards) >= MAX_CARDS_PER_SESSION:
+    if (await storage.get_session_stats(session_id))["cards"] >= MAX_CARDS_PER_SESSION:
         raise HTTPException(
             status_code=400,
             detail=f"Session has reached the maximum of {MAX_CARDS_PER_SESSION} cards"
         )
 
-    card = await create_card(
+    card = await storage.create_card(
         session_id=session_id,
         category=card_data.category,
         content=card_data.content,
@@ -143,16 +543,24 @@ async def add_card(session_id: str, card_data: CreateCardRequest):
         session_id,
         {"event": "card_added", "data": card_obj.model_dump(mode="json")}
     )
+    card_groups.add(card)
+    await card_groups.schedule(session_id)
 
     return card_obj
 
 
-@app.patch("/api/card/{card_id}", response_model=Card)
+@app.patch(
+    "/api/card/{card_id}",
+    response_model=Card,
+    dependencies=[Depends(limit_card_mutations)]
+)
 async def modify_card(card_id: int, update_data: UpdateCardRequest):
     if update_data.completed is not None:
-        card = await toggle_actionable(card_id, update_data.completed)
+        card = await storage.toggle_actionable(card_id, update_data.completed)
+        changed = {"completed"}
     elif update_data.content is not None:
-        card = await update_card(card_id, update_data.content)
+        card = await storage.update_card(card_id, update_data.content)
+        changed = {"content"}
     else:
         raise HTTPException(status_code=400, detail="No update data provided")
 
@@ -162,32 +570,28 @@ async def modify_card(card_id: int, update_data: UpdateCardRequest):
     card_obj = Card(**card)
     await ws_manager.broadcast(
         card_obj.session_id,
-        {"event": "card_updated", "data": card_obj.model_dump(mode="json")}
+        {"event": "card_updated", "data": card_delta(card_obj, changed)}
     )
+    if "content" in changed:
+        card_groups.add(card)
+        await card_groups.schedule(card_obj.session_id)
 
     return card_obj
 
 
-@app.delete("/api/card/{card_id}")
+@app.delete(
+    "/api/card/{card_id}",
+    dependencies=[Depends(limit_card_mutations)]
+)
 async def remove_card(card_id: int, author: str = Query(...)):
-    from .database import get_db
-
-    db = await get_db()
-    try:
-        cursor = await db.execute(
-            "SELECT session_id, author FROM cards WHERE id = ?",
-            (card_id,)
-        )
-        row = await cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Card not found")
-        session_id = row["session_id"]
-        if row["author"] != author:
-            raise HTTPException(status_code=403, detail="You can only delete your own cards")
-    finally:
-        await db.close()
+    card = await storage.get_card(card_id)
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+    session_id = card["session_id"]
+    if card["author"] != author:
+        raise HTTPException(status_code=403, detail="You can only delete your own cards")
 
-    success = await delete_card(card_id)
+    success = await storage.delete_card(card_id)
     if not success:
         raise HTTPException(status_code=404, detail="Card not found")
 
@@ -195,17 +599,120 @@ async def remove_card(card_id: int, author: str = Query(...)):
         session_id,
         {"event": "card_deleted", "data": {"id": card_id}}
     )
+    card_groups.remove(session_id, card_id)
+    votes.forget_card(session_id, card_id)
+    await card_groups.schedule(session_id)
 
     return {"success": True}
 
 
-@app.delete("/api/session/{session_id}/cards")
+@app.post(
+    "/api/session/{session_id}/cards:bulk",
+    response_model=BulkCardResponse,
+    dependencies=[Depends(limit_card_mutations)]
+)
+async def bulk_update_cards(session_id: str, bulk_data: BulkCardRequest):
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    outcome = await storage.apply_card_operations(
+        session_id,
+        [operation.model_dump() for operation in bulk_data.operations]
+    )
+    if not outcome["applied"]:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "No operations were applied", "results": outcome["results"]}
+        )
+
+    cards = [Card(**card) for card in outcome["cards"]]
+    messages = [
+        {"event": "card_updated", "data": card_delta(card, set(outcome["changed"][card.id]))}
+        for card in cards
+    ]
+    messages.extend(
+        {"event": "card_deleted", "data": {"id": card_id}}
+        for card_id in outcome["deleted"]
+    )
+    await ws_manager.broadcast_many(session_id, messages)
+    for card in outcome["cards"]:
+        if "content" in outcome["changed"][card["id"]]:
+            card_groups.add(card)
+    for card_id in outcome["deleted"]:
+        card_groups.remove(session_id, card_id)
+        votes.forget_card(session_id, card_id)
+    await card_groups.schedule(session_id)
+
+    return BulkCardResponse(success=True, results=outcome["results"], cards=cards)
+
+
+@app.post(
+    "/api/session/{session_id}/clone",
+    response_model=CloneCardsResponse,
+    dependencies=[Depends(limit_card_mutations)]
+)
+async def clone_cards(
+    session_id: str,
+    source_session_id: str = Query(..., alias="from"),
+    only: Optional[Literal["open_actionables"]] = Query(None)
+):
+    if source_session_id == session_id:
+        raise HTTPException(status_code=400, detail="Cannot clone a board into itself")
+    session = await storage.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    source = await storage.get_session(source_session_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source session not found")
+
+    source_stats = await storage.get_session_stats(source_session_id)
+    incoming = source_stats["actionables"]["open"] if only else source_stats["cards"]
+    existing = (await storage.get_session_stats(session_id))["cards"]
+    if existing + incoming > MAX_CARDS_PER_SESSION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Session has reached the maximum of {MAX_CARDS_PER_SESSION} cards"
+        )
+
+    cards = await storage.clone_cards(session_id, source_session_id, only)
+    card_objs = [Card(**card) for card in cards]
+    if card_objs:
+        await ws_manager.broadcast(
+            session_id,
+            {"event": "cards_added", "data": {"cards": [card.model_dump(mode="json") for card in card_objs]}}
+        )
+    for card in cards:
+        card_groups.add(card)
+    await card_groups.schedule(session_id)
+
+    return CloneCardsResponse(cards=card_objs)
+
+
+@app.get("/api/actionables/open", response_model=OpenActionablesResponse)
+async def get_open_actionables(session: List[str] = Query(default=[])):
+    if len(set(session)) > MAX_ACTIONABLE_SESSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_ACTIONABLE_SESSIONS} sessions per request"
+        )
+    session_ids = [
+        session_id for session_id in dict.fromkeys(session)
+        if await storage.get_session(session_id)
+    ]
+    return OpenActionablesResponse(actionables=await storage.get_open_actionables(session_ids))
+
+
+@app.delete(
+    "/api/session/{session_id}/cards",
+    dependencies=[Depends(limit_card_mutations)]
+)
 async def clear_board(session_id: str):
-    session = await get_session(session_id)
+    session = await storage.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    success = await delete_all_cards(session_id)
+    success = await storage.delete_all_cards(session_id)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to clear board")
 
@@ -213,20 +720,49 @@ async def clear_board(session_id: str):
         session_id,
         {"event": "board_cleared", "data": {}}
     )
+    card_groups.clear(session_id)
+    votes.forget_session(session_id)
+    await card_groups.schedule(session_id)
 
     return {"success": True}
 
 
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str, username: str = "Anonymous"):
-    await ws_manager.connect(websocket, session_id, username)
+    if not await ws_manager.connect(websocket, session_id, username):
+        return
     try:
         while True:
             await websocket.receive_text()
+            ws_manager.touch(websocket)
     except WebSocketDisconnect:
         await ws_manager.disconnect_async(websocket, session_id)
 
 
+@app.websocket("/ws/{session_id}/watch")
+async def watch_websocket(websocket: WebSocket, session_id: str):
+    await ws_manager.spectate(websocket, session_id, WS_RETRY_SPREAD_SECONDS)
+
+
+@app.get("/api/session/{session_id}/events")
+async def watch_events(session_id: str):
+    if not await storage.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    if ws_manager.closing or not ws_manager.admits_spectator():
+        raise HTTPException(status_code=503, detail="Too many spectators", headers={"Retry-After": "5"})
+
+    async def stream():
+        yield f"retry: {round((WS_RETRY_AFTER_SECONDS + random.uniform(0, WS_RETRY_SPREAD_SECONDS)) * 1000)}\n\n"
+        async for frame in ws_manager.watch(session_id, keepalive=WS_HEARTBEAT_INTERVAL_SECONDS):
+            yield ": keepalive\n\n" if frame is None else f"data: {frame}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Serve static files (frontend) if they exist
 static_dir = Path(__file__).parent.parent / "static"
 if static_dir.exists():
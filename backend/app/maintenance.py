@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from . import database
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+class DatabaseMaintenance:
+    def __init__(
+        self,
+        checkpoint_interval: float = 300,
+        truncate_threshold: int = 64 * 1024 * 1024,
+        optimize_interval: float = 3600,
+        poll_interval: float = 10
+    ):
+        self.checkpoint_interval = checkpoint_interval
+        self.truncate_threshold = truncate_threshold
+        self.optimize_interval = optimize_interval
+        self.poll_interval = poll_interval
+        self.wal_bytes = 0
+        self.checkpoints: Dict[str, int] = {}
+        self.last_checkpoint: Optional[Dict[str, Any]] = None
+        self.max_checkpoint_ms = 0.0
+        self.optimize_runs = 0
+        self.last_optimize_ms: Optional[float] = None
+        self.errors = 0
+        self.last_checkpoint_at = self.last_optimize_at = time.monotonic()
+
+    async def tick(self) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._tick()
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def _tick(self) -> Optional[Dict[str, Any]]:
+        actions: Dict[str, Any] = {}
+        self.wal_bytes = await self.wal_size()
+        now = time.monotonic()
+        if self.truncate_threshold > 0 and self.wal_bytes >= self.truncate_threshold:
+            actions["checkpoint"] = await self.checkpoint("TRUNCATE")
+            self.last_checkpoint_at = now
+        elif self.checkpoint_interval > 0 and now - self.last_checkpoint_at >= self.checkpoint_interval:
+            actions["checkpoint"] = await self.checkpoint("PASSIVE")
+            self.last_checkpoint_at = now
+        if self.optimize_interval > 0 and now - self.last_optimize_at >= self.optimize_interval:
+            await self.optimize()
+            actions["optimize_ms"] = self.last_optimize_ms
+            self.last_optimize_at = now
+        return actions or None
+
+    async def wal_size(self) -> int:
+        wal_path = f"{database.DATABASE_PATH}-wal"
+        try:
+            return (await asyncio.to_thread(os.stat, wal_path)).st_size
+        except FileNotFoundError:
+            return 0
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> Dict[str, Any]:
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+        db = await database.get_db()
+        try:
+            started = time.perf_counter()
+            cursor = await db.execute(f"PRAGMA wal_checkpoint({mode})")
+            busy, log_frames, checkpointed = await cursor.fetchone()
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        finally:
+            await db.close()
+        self.checkpoints[mode] = self.checkpoints.get(mode, 0) + 1
+        self.max_checkpoint_ms = max(self.max_checkpoint_ms, duration_ms)
+        self.wal_bytes = await self.wal_size()
+        self.last_checkpoint = {
+            "mode": mode,
+            "at": time.time(),
+            "duration_ms": duration_ms,
+            "busy": bool(busy),
+            "log_frames": log_frames,
+            "checkpointed_frames": checkpointed,
+            "wal_bytes_after": self.wal_bytes,
+        }
+        return self.last_checkpoint
+
+    async def optimize(self):
+        db = await database.get_db()
+        try:
+            started = time.perf_counter()
+            await db.execute("PRAGMA optimize")
+            self.last_optimize_ms = round((time.perf_counter() - started) * 1000, 2)
+        finally:
+            await db.close()
+        self.optimize_runs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "wal_bytes": self.wal_bytes,
+            "checkpoints": dict(self.checkpoints),
+            "last_checkpoint": self.last_checkpoint,
+            "max_checkpoint_ms": self.max_checkpoint_ms,
+            "optimize_runs": self.optimize_runs,
+            "last_optimize_ms": self.last_optimize_ms,
+            "errors": self.errors,
+        }
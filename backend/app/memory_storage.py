@@ -0,0 +1,519 @@
+import asyncio
+import base64
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional
+
+from .archive import decode_archive, encode_archive
+from .search import HIT_CLOSE, HIT_OPEN, SEARCH_WINDOW, search_terms, search_windows
+from .stats import GLOBAL_BUCKET, SESSION_BUCKET, summarize
+from .storage import Storage
+
+TIMESTAMP_FIELDS = ("created_at", "last_activity")
+
+
+def utcnow() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
+
+class MemoryStorage(Storage):
+    def __init__(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 60):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.cards: Dict[int, Dict[str, Any]] = {}
+        self.session_cards: Dict[str, List[int]] = {}
+        self.archived: Dict[str, Dict[str, Any]] = {}
+        self.archived_cards: Dict[int, str] = {}
+        self.votes: Dict[int, Dict[str, int]] = {}
+        self.job_leases: Dict[str, Dict[str, Any]] = {}
+        self.job_runs: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self.next_card_id = 1
+        self.snapshot_task: Optional[asyncio.Task] = None
+
+    async def init(self):
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            data = await asyncio.to_thread(self._read_snapshot)
+            self._restore(data)
+        if self.snapshot_path and self.snapshot_interval > 0 and self.snapshot_task is None:
+            self.snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def close(self):
+        if self.snapshot_task is not None:
+            self.snapshot_task.cancel()
+            try:
+                await self.snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self.snapshot_task = None
+        if self.snapshot_path:
+            await self.snapshot()
+
+    async def create_session(self, session_id):
+        if session_id in self.sessions:
+            raise ValueError(f"Session {session_id} already exists")
+        now = utcnow()
+        self.sessions[session_id] = {
+            "session_id": session_id,
+            "name": None,
+            "created_at": now,
+            "last_activity": now,
+        }
+        self.session_cards[session_id] = []
+        return dict(self.sessions[session_id])
+
+    async def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None and session_id in self.archived:
+            session = self._rehydrate(session_id)
+        return dict(session) if session else None
+
+    def _rehydrate(self, session_id: str) -> Dict[str, Any]:
+        archived = self.archived.pop(session_id)
+        data = decode_archive(archived["codec"], archived["payload"])
+        session = self._load(data["session"])
+        session["last_activity"] = utcnow()
+        self.sessions[session_id] = session
+        self.session_cards[session_id] = []
+        for card in data["cards"]:
+            card = self._load(card)
+            self.cards[card["id"]] = card
+            self.session_cards[session_id].append(card["id"])
+            self.archived_cards.pop(card["id"], None)
+        self._restore_votes(data.get("votes", []))
+        return session
+
+    def _unarchive_card(self, card_id: int):
+        session_id = self.archived_cards.get(card_id)
+        if session_id in self.archived:
+            self._rehydrate(session_id)
+
+    async def get_all_sessions(self):
+        sessions = sorted(self.sessions.values(), key=lambda s: s["last_activity"], reverse=True)
+        return [
+            {**session, "card_count": len(self.session_cards[session["session_id"]])}
+            for session in sessions[:50]
+        ]
+
+    async def update_session_name(self, session_id, name):
+        session = self.sessions.get(session_id)
+        if not session:
+            return None
+        session["name"] = name
+        session["last_activity"] = utcnow()
+        return dict(session)
+
+    async def update_session_activity(self, session_id):
+        session = self.sessions.get(session_id)
+        if session:
+            session["last_activity"] = utcnow()
+        return True
+
+    async def create_card(self, session_id, category, content, author):
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} does not exist")
+        card = {
+            "id": self.next_card_id,
+            "session_id": session_id,
+            "category": category,
+            "content": content,
+            "author": author,
+            "created_at": utcnow(),
+            "version": 1,
+            "completed": False if category == "actionables" else None,
+        }
+        self.next_card_id += 1
+        self.cards[card["id"]] = card
+        self.session_cards[session_id].append(card["id"])
+        return dict(card)
+
+    async def clone_cards(self, session_id, source_session_id, only=None):
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} does not exist")
+        cloned = []
+        for card_id in list(self.session_cards.get(source_session_id, [])):
+            card = self.cards[card_id]
+            if only == "open_actionables" and (card["category"] != "actionables" or card["completed"]):
+                continue
+            cloned.append(await self.create_card(session_id, card["category"], card["content"], card["author"]))
+        return cloned
+
+    async def get_open_actionables(self, session_ids):
+        card_ids = sorted(
+            card_id for session_id in set(session_ids) for card_id in self.session_cards.get(session_id, [])
+        )
+        return [
+            {field: self.cards[card_id][field] for field in ("id", "session_id", "content", "author", "created_at")}
+            for card_id in card_ids
+            if self.cards[card_id]["category"] == "actionables" and not self.cards[card_id]["completed"]
+        ]
+
+    async def get_card(self, card_id):
+        self._unarchive_card(card_id)
+        card = self.cards.get(card_id)
+        return dict(card) if card else None
+
+    async def get_cards(self, session_id):
+        return [dict(self.cards[card_id]) for card_id in self.session_cards.get(session_id, [])]
+
+    async def get_card_pages(self, session_id, categories, limit, after=0):
+        pages = {category: [] for category in categories}
+        for card_id in self.session_cards.get(session_id, []):
+            card = self.cards[card_id]
+            page = pages.get(card["category"])
+            if page is not None and card_id > after and len(page) < limit:
+                page.append(dict(card))
+        return pages
+
+    async def update_card(self, card_id, content=None):
+        self._unarchive_card(card_id)
+        card = self.cards.get(card_id)
+        if not card:
+            return None
+        if content is not None:
+            card["content"] = content
+            card["version"] += 1
+        return dict(card)
+
+    async def toggle_actionable(self, card_id, completed):
+        self._unarchive_card(card_id)
+        card = self.cards.get(card_id)
+        if not card:
+            return None
+        if card["category"] == "actionables":
+            card["completed"] = completed
+            card["version"] += 1
+        return dict(card)
+
+    async def delete_card(self, card_id):
+        self._unarchive_card(card_id)
+        card = self.cards.pop(card_id, None)
+        if not card:
+            return False
+        self.session_cards[card["session_id"]].remove(card_id)
+        self.votes.pop(card_id, None)
+        return True
+
+    async def delete_all_cards(self, session_id):
+        for card_id in self.session_cards.get(session_id, []):
+            del self.cards[card_id]
+            self.votes.pop(card_id, None)
+        if session_id in self.session_cards:
+            self.session_cards[session_id] = []
+        return True
+
+    async def apply_card_operations(self, session_id, operations):
+        originals: Dict[int, Optional[Dict[str, Any]]] = {}
+        results = []
+        changed: Dict[int, List[str]] = {}
+        deleted: List[int] = []
+        for operation in operations:
+            card_id = operation["card_id"]
+            card = self.cards.get(card_id)
+            if card_id not in originals:
+                originals[card_id] = dict(card) if card else None
+            status = self._apply_card_operation(session_id, card, operation)
+            results.append({"op": operation["op"], "card_id": card_id, "status": status})
+            if status != "ok":
+                continue
+            if operation["op"] == "delete":
+                changed.pop(card_id, None)
+                deleted.append(card_id)
+            else:
+                field = "completed" if operation["op"] == "toggle" else "content"
+                fields = changed.setdefault(card_id, [])
+                if field not in fields:
+                    fields.append(field)
+
+        if any(result["status"] != "ok" for result in results):
+            for card_id, original in originals.items():
+                if original is not None:
+                    self.cards[card_id] = original
+            self.session_cards[session_id] = sorted(
+                card_id for card_id, card in self.cards.items()
+                if card["session_id"] == session_id
+            )
+            return {"applied": False, "results": results, "cards": [], "changed": {}, "deleted": []}
+
+        for card_id in deleted:
+            self.session_cards[session_id].remove(card_id)
+            self.votes.pop(card_id, None)
+        for card_id in changed:
+            self.cards[card_id]["version"] += 1
+        cards = [dict(self.cards[card_id]) for card_id in changed]
+        return {"applied": True, "results": results, "cards": cards, "changed": changed, "deleted": deleted}
+
+    def _apply_card_operation(self, session_id, card, operation) -> str:
+        if not card or card["session_id"] != session_id:
+            return "not_found"
+        if operation["op"] == "toggle":
+            if operation.get("completed") is None or card["category"] != "actionables":
+                return "invalid"
+            card["completed"] = operation["completed"]
+        elif operation["op"] == "edit":
+            if operation.get("content") is None:
+                return "invalid"
+            card["content"] = operation["content"]
+        elif operation["op"] == "delete":
+            if not operation.get("author"):
+                return "invalid"
+            if operation["author"] != card["author"]:
+                return "forbidden"
+            del self.cards[card["id"]]
+        else:
+            return "invalid"
+        return "ok"
+
+    async def cleanup_old_sessions(self, hours=24):
+        cutoff = utcnow() - timedelta(hours=hours)
+        expired = [
+            session_id for session_id, session in self.sessions.items()
+            if session["created_at"] < cutoff
+        ]
+        for session_id in expired:
+            await self.delete_all_cards(session_id)
+            del self.sessions[session_id]
+            del self.session_cards[session_id]
+        return len(expired)
+
+    async def archive_idle_sessions(self, hours=24):
+        cutoff = utcnow() - timedelta(hours=hours)
+        idle = [
+            session_id for session_id, session in self.sessions.items()
+            if session["last_activity"] < cutoff
+        ]
+        for session_id in idle:
+            session = self.sessions.pop(session_id)
+            cards = [self.cards.pop(card_id) for card_id in self.session_cards.pop(session_id)]
+            codec, payload = encode_archive({
+                "session": self._dump(session),
+                "cards": [self._dump(card) for card in cards],
+                "votes": self._dump_votes(card["id"] for card in cards),
+            })
+            for card in cards:
+                self.archived_cards[card["id"]] = session_id
+                self.votes.pop(card["id"], None)
+            self.archived[session_id] = {
+                "created_at": session["created_at"],
+                "codec": codec,
+                "payload": payload,
+            }
+        return len(idle)
+
+    async def purge_archived_sessions(self, hours=24):
+        cutoff = utcnow() - timedelta(hours=hours)
+        expired = [
+            session_id for session_id, archived in self.archived.items()
+            if archived["created_at"] < cutoff
+        ]
+        for session_id in expired:
+            del self.archived[session_id]
+        if expired:
+            purged = set(expired)
+            self.archived_cards = {
+                card_id: session_id for card_id, session_id in self.archived_cards.items()
+                if session_id not in purged
+            }
+        return len(expired)
+
+    async def search_cards(self, terms, session_id=None, limit=20, after=None):
+        async def fetch(ceiling):
+            rows = []
+            for card_id in sorted(self.cards, reverse=True):
+                card = self.cards[card_id]
+                if session_id and card["session_id"] != session_id:
+                    continue
+                if ceiling is not None and card_id > ceiling:
+                    continue
+                words = card["content"].split()
+                matched = [
+                    {term for term in terms for token in search_terms(word) if token.startswith(term)}
+                    for word in words
+                ]
+                if set().union(*matched) != set(terms):
+                    continue
+                highlight = " ".join(
+                    f"{HIT_OPEN}{word}{HIT_CLOSE}" if hit else word
+                    for word, hit in zip(words, matched)
+                )
+                rows.append({
+                    "id": card_id,
+                    "session_id": card["session_id"],
+                    "category": card["category"],
+                    "author": card["author"],
+                    "created_at": card["created_at"],
+                    "highlight": highlight,
+                })
+                if len(rows) == SEARCH_WINDOW:
+                    break
+            return rows
+
+        return await search_windows(fetch, limit, after)
+
+    async def get_votes(self, session_id):
+        return self._dump_votes(self.session_cards.get(session_id, []))
+
+    async def save_votes(self, votes):
+        for vote in votes:
+            self._unarchive_card(vote["card_id"])
+            card = self.cards.get(vote["card_id"])
+            if not card or card["session_id"] != vote["session_id"]:
+                continue
+            ballots = self.votes.setdefault(vote["card_id"], {})
+            if vote["count"] > 0:
+                ballots[vote["voter"]] = vote["count"]
+            else:
+                ballots.pop(vote["voter"], None)
+                if not ballots:
+                    del self.votes[vote["card_id"]]
+        return len(votes)
+
+    def _dump_votes(self, card_ids) -> List[Dict[str, Any]]:
+        return [
+            {"card_id": card_id, "voter": voter, "count": count}
+            for card_id in card_ids
+            for voter, count in self.votes.get(card_id, {}).items()
+        ]
+
+    def _restore_votes(self, votes: List[Dict[str, Any]]):
+        for vote in votes:
+            self.votes.setdefault(vote["card_id"], {})[vote["voter"]] = vote["count"]
+
+    async def get_session_stats(self, session_id):
+        if session_id in self.archived:
+            cards = self._archived_cards(session_id)
+        elif session_id in self.sessions:
+            cards = [self.cards[card_id] for card_id in self.session_cards[session_id]]
+        else:
+            return None
+        return {"session_id": session_id, **self._stats(cards, SESSION_BUCKET)}
+
+    async def get_global_stats(self):
+        cards = list(self.cards.values())
+        for session_id in self.archived:
+            cards.extend(self._archived_cards(session_id))
+        return {
+            "sessions": len(self.sessions) + len(self.archived),
+            **self._stats(cards, GLOBAL_BUCKET)
+        }
+
+    def _archived_cards(self, session_id: str) -> List[Dict[str, Any]]:
+        archived = self.archived[session_id]
+        return [self._load(card) for card in decode_archive(archived["codec"], archived["payload"])["cards"]]
+
+    def _stats(self, cards, bucket_format: str) -> Dict[str, Any]:
+        categories: Dict[str, List[int]] = {}
+        authors = set()
+        activity: Dict[str, int] = {}
+        for card in cards:
+            counts = categories.setdefault(card["category"], [0, 0])
+            counts[0] += 1
+            counts[1] += bool(card["completed"])
+            authors.add(card["author"])
+            bucket = card["created_at"].strftime(bucket_format)
+            activity[bucket] = activity.get(bucket, 0) + 1
+        return summarize(
+            [(category, cards, completed) for category, (cards, completed) in categories.items()],
+            len(authors),
+            activity.items()
+        )
+
+    async def acquire_job_lease(self, name, owner, ttl):
+        now = time.time()
+        lease = self.job_leases.get(name)
+        if lease and lease["owner"] != owner and lease["expires_at"] >= now:
+            return False
+        self.job_leases[name] = {"name": name, "owner": owner, "expires_at": now + ttl}
+        return True
+
+    async def get_job_leases(self):
+        return [dict(self.job_leases[name]) for name in sorted(self.job_leases)]
+
+    async def record_job_run(self, name, owner, started_at, duration_ms, status, detail=None):
+        self.job_runs.append({
+            "id": self.job_runs[-1]["id"] + 1 if self.job_runs else 1,
+            "name": name,
+            "owner": owner,
+            "started_at": started_at,
+            "duration_ms": duration_ms,
+            "status": status,
+            "detail": detail,
+        })
+
+    async def get_job_runs(self, limit=50, name=None):
+        runs = [run for run in reversed(self.job_runs) if not name or run["name"] == name]
+        return [dict(run) for run in runs[:limit]]
+
+    async def snapshot(self):
+        data = {
+            "next_card_id": self.next_card_id,
+            "sessions": [self._dump(session) for session in self.sessions.values()],
+            "cards": [self._dump(self.cards[card_id]) for ids in self.session_cards.values() for card_id in ids],
+            "votes": self._dump_votes(self.cards),
+            "archived": [
+                {
+                    "session_id": session_id,
+                    "created_at": archived["created_at"].isoformat(),
+                    "codec": archived["codec"],
+                    "payload": base64.b64encode(archived["payload"]).decode(),
+                }
+                for session_id, archived in self.archived.items()
+            ],
+        }
+        await asyncio.to_thread(self._write_snapshot, data)
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            await self.snapshot()
+
+    def _dump(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        for field in TIMESTAMP_FIELDS:
+            if field in row:
+                row[field] = row[field].isoformat()
+        return row
+
+    def _load(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        for field in TIMESTAMP_FIELDS:
+            if field in row:
+                row[field] = datetime.fromisoformat(row[field])
+        return row
+
+    def _write_snapshot(self, data: Dict[str, Any]):
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.snapshot_path)
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        with open(self.snapshot_path, "r") as f:
+            return json.load(f)
+
+    def _restore(self, data: Dict[str, Any]):
+        self.sessions = {s["session_id"]: self._load(s) for s in data["sessions"]}
+        self.session_cards = {session_id: [] for session_id in self.sessions}
+        self.cards = {}
+        for card in data["cards"]:
+            card = self._load(card)
+            self.cards[card["id"]] = card
+            self.session_cards[card["session_id"]].append(card["id"])
+        self.archived = {
+            archived["session_id"]: {
+                "created_at": datetime.fromisoformat(archived["created_at"]),
+                "codec": archived["codec"],
+                "payload": base64.b64decode(archived["payload"]),
+            }
+            for archived in data.get("archived", [])
+        }
+        self.archived_cards = {
+            card["id"]: session_id
+            for session_id, archived in self.archived.items()
+            for card in decode_archive(archived["codec"], archived["payload"])["cards"]
+        }
+        self.votes = {}
+        self._restore_votes(data.get("votes", []))
+        self.next_card_id = data["next_card_id"]
@@ -17,6 +17,24 @@ class UpdateCardRequest(BaseModel):
     completed: Optional[bool] = None
 
 
+class BulkCardOperation(BaseModel):
+    op: Literal["toggle", "edit", "delete"]
+    card_id: int
+    completed: Optional[bool] = None
+    content: Optional[str] = Field(None, min_length=1, max_length=1000)
+    author: Optional[str] = None
+
+
+class BulkCardRequest(BaseModel):
+    operations: list[BulkCardOperation] = Field(..., min_length=1, max_length=200)
+
+
+class BulkCardResult(BaseModel):
+    op: str
+    card_id: int
+    status: Literal["ok", "not_found", "forbidden", "invalid"]
+
+
 class Card(BaseModel):
     id: int
     session_id: str
@@ -25,6 +43,7 @@ class Card(BaseModel):
     author: str
     created_at: datetime
     completed: Optional[bool] = None
+    version: int = 1
 
 
 class Session(BaseModel):
@@ -35,7 +54,106 @@ class Session(BaseModel):
 class SessionResponse(BaseModel):
     session: Session
     cards: list[Card]
+    next_after: Optional[dict[CategoryType, Optional[int]]] = None
+
+
+class CardPageResponse(BaseModel):
+    cards: list[Card]
+    next_after: Optional[int] = None
 
 
 class CreateSessionResponse(BaseModel):
     session_id: str
+
+
+class BulkCardResponse(BaseModel):
+    success: bool
+    results: list[BulkCardResult]
+    cards: list[Card]
+
+
+class CloneCardsResponse(BaseModel):
+    cards: list[Card]
+
+
+class OpenActionable(BaseModel):
+    id: int
+    session_id: str
+    content: str
+    author: str
+    created_at: datetime
+
+
+class OpenActionablesResponse(BaseModel):
+    actionables: list[OpenActionable]
+
+
+class VoteRequest(BaseModel):
+    voter: str = Field(..., min_length=1, max_length=100)
+    remove: bool = False
+
+
+class VoteResponse(BaseModel):
+    card_id: int
+    votes: int
+    mine: int
+    remaining: int
+
+
+class VotesResponse(BaseModel):
+    limit: int
+    tallies: dict[int, int]
+    mine: dict[int, int]
+    remaining: int
+
+
+class ActivityBucket(BaseModel):
+    bucket: str
+    cards: int
+
+
+class ActionableStats(BaseModel):
+    completed: int
+    open: int
+
+
+class BoardStats(BaseModel):
+    cards: int
+    categories: dict[str, int]
+    actionables: ActionableStats
+    contributors: int
+    activity: list[ActivityBucket]
+
+
+class SessionStatsResponse(BoardStats):
+    session_id: str
+
+
+class GlobalStatsResponse(BoardStats):
+    sessions: int
+
+
+class CardGroup(BaseModel):
+    category: CategoryType
+    card_ids: list[int]
+
+
+class CardGroupsResponse(BaseModel):
+    groups: list[CardGroup]
+
+
+class SearchResult(BaseModel):
+    id: int
+    session_id: str
+    category: CategoryType
+    author: str
+    content: str
+    created_at: datetime
+    snippet: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    results: list[SearchResult]
+    next: Optional[str] = None
+
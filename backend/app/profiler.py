@@ -0,0 +1,140 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+MAIN_MODULE = str(Path(__file__).parent / "main.py")
+IDLE_FUNCTIONS = {"select", "poll", "epoll", "_run_once", "run_forever"}
+
+
+def frame_label(frame) -> str:
+    return f"{Path(frame.f_code.co_filename).stem}:{frame.f_code.co_name}"
+
+
+def frame_stack(frame) -> List[Any]:
+    stack = []
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def await_chain(coro) -> List[str]:
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+def current_task_name(loop: asyncio.AbstractEventLoop) -> str:
+    current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+    task = current_tasks.get(loop) if isinstance(current_tasks, dict) else None
+    return task.get_name() if task is not None else "-"
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.running = False
+
+    async def profile(self, seconds: float, interval: float) -> Dict[str, Any]:
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        self.running = True
+        try:
+            loop = asyncio.get_running_loop()
+            stop = threading.Event()
+            switch_interval = sys.getswitchinterval()
+            # Without this the sampler only gets the GIL when the loop thread
+            # releases it in select(), hiding pure-Python hot spots.
+            sys.setswitchinterval(min(switch_interval, interval / 10))
+            task_stacks: Counter = Counter()
+            task_sampler = asyncio.create_task(self._sample_tasks(task_stacks, max(interval, 0.05)))
+            try:
+                threads = await asyncio.to_thread(
+                    self._sample_threads, seconds, interval, threading.get_ident(), loop, stop
+                )
+            finally:
+                sys.setswitchinterval(switch_interval)
+                stop.set()
+                task_sampler.cancel()
+                try:
+                    await task_sampler
+                except asyncio.CancelledError:
+                    pass
+            threads["tasks_collapsed"] = "\n".join(
+                f"{stack} {count}" for stack, count in task_stacks.most_common()
+            )
+            return threads
+        finally:
+            self.running = False
+
+    def _sample_threads(
+        self,
+        seconds: float,
+        interval: float,
+        loop_thread_id: int,
+        loop: asyncio.AbstractEventLoop,
+        stop: threading.Event
+    ) -> Dict[str, Any]:
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        routes: Counter = Counter()
+        tasks: Counter = Counter()
+        samples = 0
+        loop_busy = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline and not stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = frame_stack(frame)
+                label = names.get(thread_id, str(thread_id))
+                stacks[";".join([label] + [frame_label(f) for f in frames])] += 1
+                if thread_id == loop_thread_id and frames[-1].f_code.co_name not in IDLE_FUNCTIONS:
+                    loop_busy += 1
+                    routes[self._route(frames)] += 1
+                    tasks[current_task_name(loop)] += 1
+            samples += 1
+            time.sleep(interval)
+
+        def breakdown(counter: Counter) -> Dict[str, Dict[str, float]]:
+            return {
+                name: {"samples": count, "cpu_ms": round(count * interval * 1000, 1)}
+                for name, count in counter.most_common()
+            }
+
+        return {
+            "seconds": seconds,
+            "interval_ms": interval * 1000,
+            "samples": samples,
+            "loop_busy_samples": loop_busy,
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()),
+            "routes": breakdown(routes),
+            "tasks": breakdown(tasks),
+        }
+
+    def _route(self, frames: List[Any]) -> str:
+        for frame in frames:
+            if frame.f_code.co_filename == MAIN_MODULE:
+                return frame.f_code.co_name
+        return "-"
+
+    async def _sample_tasks(self, stacks: Counter, interval: float):
+        current = asyncio.current_task()
+        while True:
+            for task in asyncio.all_tasks():
+                if task is current:
+                    continue
+                labels = await_chain(task.get_coro())
+                if labels:
+                    stacks[";".join([task.get_name()] + labels)] += 1
+            await asyncio.sleep(interval)
@@ -0,0 +1,105 @@
+import base64
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 16
+SEARCH_WINDOW = 500
+SNIPPET_TOKENS = 12
+HIT_OPEN, HIT_CLOSE = "\x01", "\x02"
+K1, B = 1.2, 0.75
+
+
+def search_terms(text: str) -> List[str]:
+    return [term.lower() for term in TERM_PATTERN.findall(text)][:MAX_TERMS]
+
+
+def quote(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def fts_query(terms: List[str], session_id: Optional[str] = None) -> str:
+    query = "{content} : (" + " AND ".join(quote(term) for term in terms) + ")"
+    if session_id:
+        query = f"{{session_id}} : {quote(session_id)} AND {query}"
+    return query
+
+
+def snippet(highlighted: str) -> str:
+    tokens = highlighted.split()
+    first = next((i for i, token in enumerate(tokens) if HIT_OPEN in token), 0)
+    start = max(0, min(first - 3, len(tokens) - SNIPPET_TOKENS))
+    text = " ".join(tokens[start:start + SNIPPET_TOKENS])
+    if start > 0:
+        text = "…" + text
+    if start + SNIPPET_TOKENS < len(tokens):
+        text += "…"
+    return text.replace(HIT_OPEN, "[").replace(HIT_CLOSE, "]")
+
+
+def rank_window(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    after: Optional[Tuple[float, int, int]] = None
+) -> List[Dict[str, Any]]:
+    if not rows:
+        return []
+    ceiling = after[2] if after else max(row["id"] for row in rows)
+    lengths = [len(row["highlight"].split()) for row in rows]
+    average = sum(lengths) / len(lengths) or 1
+    scored = []
+    for row, length in zip(rows, lengths):
+        hits = row["highlight"].count(HIT_OPEN)
+        score = -hits * (K1 + 1) / (hits + K1 * (1 - B + B * length / average))
+        if after and (score, row["id"]) <= after[:2]:
+            continue
+        scored.append((score, row))
+    scored.sort(key=lambda item: (item[0], item[1]["id"]))
+
+    results = []
+    for score, row in scored[:limit]:
+        highlighted = row.pop("highlight")
+        results.append({
+            **row,
+            "content": highlighted.replace(HIT_OPEN, "").replace(HIT_CLOSE, ""),
+            "snippet": snippet(highlighted),
+            "score": score,
+            "ceiling": ceiling,
+        })
+    return results
+
+
+async def search_windows(
+    fetch: Callable[[Optional[int]], Awaitable[List[Dict[str, Any]]]],
+    limit: int,
+    after: Optional[Tuple[float, int, int]] = None
+) -> List[Dict[str, Any]]:
+    ceiling = after[2] if after else None
+    results: List[Dict[str, Any]] = []
+    while len(results) < limit:
+        rows = await fetch(ceiling)
+        if not rows:
+            break
+        floor = min(row["id"] for row in rows)
+        results.extend(rank_window(rows, limit - len(results), after))
+        if len(rows) < SEARCH_WINDOW:
+            break
+        ceiling, after = floor - 1, None
+    return results
+
+
+def encode_cursor(score: float, card_id: int, ceiling: int) -> str:
+    raw = json.dumps([score, card_id, ceiling]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int, int]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, card_id, ceiling = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(card_id), int(ceiling)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
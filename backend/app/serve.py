@@ -0,0 +1,95 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from . import database
+
+PREWARM_CHUNK = 1024 * 1024
+
+
+def _number(env: Mapping[str, str], name: str, default: str, cast=int):
+    return cast(env.get(name, default))
+
+
+def server_config(env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    env = os.environ if env is None else env
+    ping_interval = _number(env, "SERVER_WS_PING_INTERVAL_SECONDS", "20", float)
+    limit_concurrency = _number(env, "SERVER_LIMIT_CONCURRENCY", "0")
+    return {
+        "host": env.get("HOST", "0.0.0.0"),
+        "port": _number(env, "PORT", "8000"),
+        "workers": max(1, _number(env, "WEB_CONCURRENCY", "1")),
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "backlog": _number(env, "SERVER_BACKLOG", "2048"),
+        "timeout_keep_alive": _number(env, "SERVER_KEEPALIVE_SECONDS", "5"),
+        "limit_concurrency": limit_concurrency or None,
+        "ws_max_size": _number(env, "SERVER_WS_MAX_SIZE", "65536"),
+        "ws_ping_interval": ping_interval or None,
+        "ws_ping_timeout": _number(env, "SERVER_WS_PING_TIMEOUT_SECONDS", "20", float) or None,
+        "timeout_graceful_shutdown": _number(env, "SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30") or None,
+    }
+
+
+def prewarm_file(path: str, limit_bytes: int) -> int:
+    read = 0
+    if limit_bytes <= 0 or not os.path.exists(path):
+        return read
+    with open(path, "rb", buffering=0) as f:
+        while read < limit_bytes:
+            chunk = f.read(min(PREWARM_CHUNK, limit_bytes - read))
+            if not chunk:
+                break
+            read += len(chunk)
+    return read
+
+
+async def prepare(prewarm_mb: float) -> Dict[str, Any]:
+    started = time.perf_counter()
+    await database.init_db()
+    db = await database.get_db()
+    try:
+        await db.execute("PRAGMA optimize")
+    finally:
+        await db.close()
+    warmed = await asyncio.to_thread(
+        prewarm_file, database.DATABASE_PATH, int(prewarm_mb * 1024 * 1024)
+    )
+    return {"warmed_bytes": warmed, "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def main() -> int:
+    import uvicorn
+
+    launched = time.time()
+    config = server_config()
+    backend = os.getenv("STORAGE_BACKEND", "sqlite")
+    if backend == "memory" and config["workers"] > 1:
+        print("The memory backend cannot be shared between workers; set WEB_CONCURRENCY=1", file=sys.stderr)
+        return 1
+
+    if backend == "sqlite":
+        prepared = asyncio.run(prepare(float(os.getenv("SERVER_PREWARM_MB", "256"))))
+        print(
+            f"Prepared {database.DATABASE_PATH} in {prepared['duration_ms']} ms "
+            f"({prepared['warmed_bytes'] // (1024 * 1024)} MB prewarmed)",
+            file=sys.stderr
+        )
+    print(
+        f"Starting {config['workers']} worker(s) on {config['host']}:{config['port']} "
+        f"with {config['loop']}/{config['http']}",
+        file=sys.stderr
+    )
+    os.environ["SERVER_STARTED_AT"] = str(launched)
+    if config["workers"] > 1 and os.getenv("SERVER_SHARDING", "").lower() in ("1", "true", "yes"):
+        from .sharding import run_sharded
+        return run_sharded(config)
+    uvicorn.run("app.main:app", **config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote
+
+from .serve import server_config
+
+SESSION_PATH = re.compile(r"^/(?:ws|api/session)/([^/?#]+)")
+CONTENT_LENGTH = re.compile(r"[0-9]+")
+SESSION_HEADER = "x-retro-session"
+UNROUTED_SESSIONS = {"create"}
+FORWARDED_HEADERS = {"x-forwarded-for", "x-forwarded-proto"}
+STATS_PATH = "/api/admin/shards"
+MAX_HEAD_BYTES = 64 * 1024
+PIPE_CHUNK = 64 * 1024
+RESTART_DELAY_SECONDS = 1.0
+READY_TIMEOUT_SECONDS = 30.0
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+class Request(NamedTuple):
+    line: str
+    path: str
+    headers: List[Tuple[str, str]]
+    fields: Dict[str, str]
+    session_id: Optional[str]
+    length: int
+    tunnel: bool
+
+
+def parse_head(head: bytes) -> Optional[Request]:
+    lines = head[:-4].decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3:
+        return None
+    headers = []
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if not sep:
+            return None
+        headers.append((name.strip(), value.strip()))
+    fields = {name.lower(): value for name, value in headers}
+    lengths = {value for name, value in headers if name.lower() == "content-length"}
+    if len(lengths) > 1 or not all(CONTENT_LENGTH.fullmatch(value) for value in lengths):
+        return None
+    if lengths and "transfer-encoding" in fields:
+        return None
+    length = int(fields.get("content-length", "0"))
+
+    path = parts[1]
+    session_id = fields.get(SESSION_HEADER) or None
+    if session_id is None:
+        match = SESSION_PATH.match(path)
+        if match and match.group(1) not in UNROUTED_SESSIONS:
+            session_id = unquote(match.group(1))
+    tunnel = (
+        "upgrade" in fields.get("connection", "").lower()
+        or "chunked" in fields.get("transfer-encoding", "").lower()
+    )
+    return Request(lines[0], path.split("?", 1)[0], headers, fields, session_id, length, tunnel)
+
+
+def encode_head(request: Request, client: str, trust_forwarded: bool) -> bytes:
+    lines = [request.line]
+    for name, value in request.headers:
+        if trust_forwarded or name.lower() not in FORWARDED_HEADERS:
+            lines.append(f"{name}: {value}")
+    if not (trust_forwarded and "x-forwarded-for" in request.fields):
+        lines.append(f"X-Forwarded-For: {client}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def owner(session_id: str, workers: List[int]) -> int:
+    key = session_id.encode()
+    return max(
+        workers,
+        key=lambda worker: hashlib.blake2b(key + b"/%d" % worker, digest_size=8).digest()
+    )
+
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    with contextlib.suppress(ConnectionError, OSError):
+        while True:
+            data = await reader.read(PIPE_CHUNK)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+
+
+class Router:
+    def __init__(self, socket_paths: List[str]):
+        self.socket_paths = socket_paths
+        self.alive: List[int] = []
+        self.round_robin = itertools.count()
+        self.tunnels: Dict["ProxyConnection", Tuple[Optional[str], int]] = {}
+        self.requests = [0] * len(socket_paths)
+        self.rebalances = 0
+
+    def pick(self, session_id: Optional[str], current: Optional[int] = None) -> Optional[int]:
+        if not self.alive:
+            return None
+        if session_id is not None:
+            return owner(session_id, self.alive)
+        if current in self.alive:
+            return current
+        return self.alive[next(self.round_robin) % len(self.alive)]
+
+    def set_alive(self, worker: int, alive: bool):
+        if alive == (worker in self.alive):
+            return
+        if alive:
+            self.alive = sorted(self.alive + [worker])
+        else:
+            self.alive = [other for other in self.alive if other != worker]
+        self.rebalances += 1
+        for connection, (session_id, tunnel_worker) in list(self.tunnels.items()):
+            if session_id is not None and self.pick(session_id) != tunnel_worker:
+                connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        tunnels = [0] * len(self.socket_paths)
+        for _, worker in self.tunnels.values():
+            tunnels[worker] += 1
+        return {
+            "alive": list(self.alive),
+            "rebalances": self.rebalances,
+            "requests": list(self.requests),
+            "tunnels": tunnels,
+        }
+
+
+class ProxyConnection:
+    def __init__(
+        self,
+        router: Router,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        keepalive: float,
+        trusted: Tuple[str, ...],
+        stats=None
+    ):
+        self.router = router
+        self.reader = reader
+        self.writer = writer
+        self.keepalive = keepalive
+        self.stats = stats or router.stats
+        peer = writer.get_extra_info("peername")
+        self.client = peer[0] if isinstance(peer, tuple) else "unknown"
+        self.trust_forwarded = "*" in trusted or self.client in trusted
+        self.upstreams: Dict[int, asyncio.StreamWriter] = {}
+        self.pumps: List[asyncio.Task] = []
+        self.current: Optional[int] = None
+
+    async def run(self):
+        try:
+            await self._serve()
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.router.tunnels.pop(self, None)
+            for upstream in self.upstreams.values():
+                upstream.close()
+            for pump in self.pumps:
+                pump.cancel()
+            self.close()
+
+    async def _serve(self):
+        while True:
+            idle_timeout = None if self.upstreams else self.keepalive
+            try:
+                head = await asyncio.wait_for(self.reader.readuntil(b"\r\n\r\n"), idle_timeout)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                return
+            except asyncio.LimitOverrunError:
+                await self.reply(431, {"detail": "Request headers too large"})
+                return
+            request = parse_head(head)
+            if request is None:
+                await self.reply(400, {"detail": "Bad request"})
+                return
+            if request.path == STATS_PATH:
+                await self.reply_stats(request)
+                continue
+
+            worker = self.router.pick(request.session_id, self.current)
+            upstream = await self.upstream(worker) if worker is not None else None
+            if upstream is None:
+                await self.reply(503, {"detail": "No worker available"}, retry_after=1)
+                return
+            self.current = worker
+            self.router.requests[worker] += 1
+            upstream.write(encode_head(request, self.client, self.trust_forwarded))
+            if request.tunnel:
+                self.router.tunnels[self] = (request.session_id, worker)
+                await pipe(self.reader, upstream)
+                return
+            remaining = request.length
+            while remaining:
+                chunk = await self.reader.read(min(PIPE_CHUNK, remaining))
+                if not chunk:
+                    return
+                upstream.write(chunk)
+                remaining -= len(chunk)
+            await upstream.drain()
+
+    async def upstream(self, worker: int) -> Optional[asyncio.StreamWriter]:
+        if worker in self.upstreams:
+            return self.upstreams[worker]
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.router.socket_paths[worker])
+        except OSError:
+            return None
+        self.upstreams[worker] = writer
+        self.pumps.append(asyncio.create_task(self._pump(worker, reader, writer)))
+        return writer
+
+    async def _pump(self, worker: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await pipe(reader, self.writer)
+        writer.close()
+        if self.upstreams.get(worker) is writer:
+            del self.upstreams[worker]
+        if worker == self.current:
+            self.close()
+
+    async def reply(self, status: int, body: Dict[str, Any], retry_after: Optional[int] = None, close: bool = True):
+        payload = json.dumps(body).encode()
+        reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+                  431: "Request Header Fields Too Large", 503: "Service Unavailable"}[status]
+        head = [
+            f"HTTP/1.1 {status} {reason}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(payload)}",
+        ]
+        if retry_after is not None:
+            head.append(f"Retry-After: {retry_after}")
+        if close:
+            head.append("Connection: close")
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await self.writer.drain()
+
+    async def reply_stats(self, request: Request):
+        token = os.getenv("ADMIN_TOKEN", "")
+        if not token:
+            await self.reply(404, {"detail": "Not found"}, close=False)
+        elif request.fields.get("x-admin-token") != token:
+            await self.reply(401, {"detail": "Invalid admin token"}, close=False)
+        else:
+            await self.reply(200, self.stats(), close=False)
+
+    def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+class Supervisor:
+    def __init__(self, router: Router):
+        self.router = router
+        self.processes: Dict[int, asyncio.subprocess.Process] = {}
+        self.restarts = 0
+        self.stopping = False
+
+    async def keep_running(self, worker: int):
+        path = self.router.socket_paths[worker]
+        while not self.stopping:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "app.sharding", "worker", path, cwd=BACKEND_DIR
+            )
+            self.processes[worker] = process
+            if await self._wait_ready(path, process):
+                self.router.set_alive(worker, True)
+            await process.wait()
+            self.router.set_alive(worker, False)
+            if self.stopping:
+                return
+            self.restarts += 1
+            print(f"Worker {worker} exited with {process.returncode}, restarting", file=sys.stderr)
+            await asyncio.sleep(RESTART_DELAY_SECONDS)
+
+    async def _wait_ready(self, path: str, process: asyncio.subprocess.Process) -> bool:
+        deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+        while process.returncode is None and time.monotonic() < deadline:
+            try:
+                _, writer = await asyncio.open_unix_connection(path)
+            except OSError:
+                await asyncio.sleep(0.05)
+                continue
+            writer.close()
+            return True
+        return False
+
+    async def stop(self):
+        self.stopping = True
+        running = [process for process in self.processes.values() if process.returncode is None]
+        for process in running:
+            process.terminate()
+        await asyncio.gather(*(process.wait() for process in running))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.router.stats(),
+            "restarts": self.restarts,
+            "pids": {worker: process.pid for worker, process in self.processes.items()},
+        }
+
+
+async def serve_sharded(config: Dict[str, Any]) -> int:
+    socket_dir = tempfile.mkdtemp(prefix="retro-shards-")
+    router = Router([os.path.join(socket_dir, f"worker-{i}.sock") for i in range(config["workers"])])
+    supervisor = Supervisor(router)
+    keepers = [asyncio.create_task(supervisor.keep_running(i)) for i in range(config["workers"])]
+    trusted = tuple(
+        address.strip() for address in os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1").split(",")
+    )
+
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    while len(router.alive) < config["workers"] and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+    async def accept(reader, writer):
+        await ProxyConnection(
+            router, reader, writer, config["timeout_keep_alive"], trusted, supervisor.stats
+        ).run()
+
+    server = await asyncio.start_server(
+        accept, config["host"], config["port"], backlog=config["backlog"], limit=MAX_HEAD_BYTES
+    )
+    print(
+        f"Routing {config['host']}:{config['port']} to {len(router.alive)}/{config['workers']} "
+        "workers by session",
+        file=sys.stderr
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        for connection in list(router.tunnels):
+            connection.close()
+        await supervisor.stop()
+        for keeper in keepers:
+            keeper.cancel()
+        await asyncio.gather(*keepers, return_exceptions=True)
+        shutil.rmtree(socket_dir, ignore_errors=True)
+    return 0
+
+
+def run_sharded(config: Dict[str, Any]) -> int:
+    if config["loop"] == "uvloop":
+        import uvloop
+        uvloop.install()
+    return asyncio.run(serve_sharded(config))
+
+
+def run_worker(path: str) -> int:
+    import uvicorn
+
+    config = server_config()
+    for key in ("host", "port", "backlog"):
+        config.pop(key)
+    config["workers"] = 1
+    uvicorn.run("app.main:app", uds=path, forwarded_allow_ips="*", **config)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "worker":
+        print("usage: python -m app.sharding worker SOCKET", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(run_worker(sys.argv[2]))
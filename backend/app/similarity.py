@@ -0,0 +1,292 @@
+import asyncio
+import random
+import zlib
+from array import array
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .search import TERM_PATTERN
+from .singleflight import SingleFlight
+
+PRIME = (1 << 61) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    grams = set()
+    for word in TERM_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+    return grams
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(bands, rows) for bands, rows in options if (1 / bands) ** (1 / rows) <= threshold]
+    return max(below, key=lambda option: option[1]) if below else options[-1]
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 1, max_cached: int = 50000):
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, PRIME), rng.randrange(0, PRIME)) for _ in range(num_perm)
+        ]
+        self.max_cached = max_cached
+        self.cache: Dict[str, array] = {}
+
+    def _hashes(self, gram: str) -> array:
+        hashes = self.cache.get(gram)
+        if hashes is None:
+            if len(self.cache) >= self.max_cached:
+                self.cache.clear()
+            value = zlib.crc32(gram.encode())
+            hashes = array("Q", [(a * value + b) % PRIME for a, b in self.permutations])
+            self.cache[gram] = hashes
+        return hashes
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        grams = shingles(text)
+        if not grams:
+            return ()
+        return tuple(map(min, zip(*(self._hashes(gram) for gram in grams))))
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class SessionIndex:
+    def __init__(
+        self,
+        hasher: MinHasher,
+        bands: int,
+        rows: int,
+        threshold: float,
+        max_bucket: int = 64,
+        max_candidates: int = 32,
+        max_group: int = 50
+    ):
+        self.hasher = hasher
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.max_bucket = max_bucket
+        self.max_candidates = max_candidates
+        self.max_group = max_group
+        self.published: Optional[List[Dict[str, Any]]] = None
+        self.comparisons = 0
+        self.clear()
+
+    def clear(self):
+        self.signatures: Dict[int, Tuple[str, Tuple[int, ...]]] = {}
+        self.buckets: Dict[tuple, Set[int]] = {}
+        self.neighbors: Dict[int, Set[int]] = {}
+        self.component: Dict[int, int] = {}
+        self.members: Dict[int, Set[int]] = {}
+        self.dirty = True
+
+    def _keys(self, category: str, signature: Tuple[int, ...]):
+        return [
+            (category, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, card_id: int, category: str, content: str):
+        self.remove(card_id)
+        signature = self.hasher.signature(content)
+        if not signature:
+            return
+        shared: Counter = Counter()
+        for key in self._keys(category, signature):
+            bucket = self.buckets.setdefault(key, set())
+            shared.update(bucket)
+            if len(bucket) < self.max_bucket:
+                bucket.add(card_id)
+        self.signatures[card_id] = (category, signature)
+        self.neighbors[card_id] = set()
+        self.component[card_id] = card_id
+        self.members[card_id] = {card_id}
+        for other, _ in shared.most_common(self.max_candidates):
+            if not self._joinable(card_id, other):
+                continue
+            self.comparisons += 1
+            if similarity(signature, self.signatures[other][1]) >= self.threshold:
+                self._link(card_id, other)
+
+    def _joinable(self, a: int, b: int) -> bool:
+        root, other = self.component[a], self.component[b]
+        return root == other or len(self.members[root]) + len(self.members[other]) <= self.max_group
+
+    def _link(self, a: int, b: int):
+        root, other = self.component[a], self.component[b]
+        if root != other:
+            if len(self.members[root]) < len(self.members[other]):
+                root, other = other, root
+            for card_id in self.members[other]:
+                self.component[card_id] = root
+            self.members[root] |= self.members.pop(other)
+        self.neighbors[a].add(b)
+        self.neighbors[b].add(a)
+        self.dirty = True
+
+    def remove(self, card_id: int):
+        entry = self.signatures.pop(card_id, None)
+        if entry is None:
+            return
+        for key in self._keys(*entry):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(card_id)
+                if not bucket:
+                    del self.buckets[key]
+        for other in self.neighbors.pop(card_id):
+            self.neighbors[other].discard(card_id)
+        members = self.members.pop(self.component.pop(card_id))
+        members.discard(card_id)
+        if members:
+            self.dirty = True
+            self._split(members)
+
+    def _split(self, members: Set[int]):
+        remaining = set(members)
+        while remaining:
+            root = remaining.pop()
+            component, stack = {root}, [root]
+            while stack:
+                for other in self.neighbors[stack.pop()] & remaining:
+                    remaining.discard(other)
+                    component.add(other)
+                    stack.append(other)
+            for card_id in component:
+                self.component[card_id] = root
+            self.members[root] = component
+
+    def groups(self) -> List[Dict[str, Any]]:
+        groups = [
+            {"category": self.signatures[root][0], "card_ids": sorted(members)}
+            for root, members in self.members.items() if len(members) > 1
+        ]
+        groups.sort(key=lambda group: (-len(group["card_ids"]), group["card_ids"][0]))
+        return groups
+
+
+class CardGrouper:
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 64,
+        max_sessions: int = 1000,
+        max_group: int = 50,
+        broadcast_window: float = 0,
+        publish: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None
+    ):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.max_sessions = max_sessions
+        self.max_group = max_group
+        self.broadcast_window = broadcast_window
+        self.publish = publish
+        self.sessions: "OrderedDict[str, SessionIndex]" = OrderedDict()
+        self.pending: Dict[str, List[Callable[[SessionIndex], None]]] = {}
+        self.broadcasts: Dict[str, asyncio.Task] = {}
+        self.loads = SingleFlight()
+        self.built = 0
+        self.published = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def _build(self, cards: List[Dict[str, Any]]) -> SessionIndex:
+        index = SessionIndex(self.hasher, self.bands, self.rows, self.threshold, max_group=self.max_group)
+        for card in cards:
+            index.add(card["id"], card["category"], card["content"])
+        return index
+
+    async def load(self, session_id: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
+            return self.sessions[session_id]
+        self.pending.setdefault(session_id, [])
+        return await self.loads.do(session_id, lambda: self._load(session_id, fetch))
+
+    async def _load(self, session_id: str, fetch):
+        try:
+            index = await asyncio.to_thread(self._build, await fetch())
+            for change in self.pending[session_id]:
+                change(index)
+        finally:
+            del self.pending[session_id]
+        index.published = index.groups()
+        index.dirty = False
+        self.sessions[session_id] = index
+        self.built += 1
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return index
+
+    def _apply(self, session_id: str, change: Callable[[SessionIndex], None]):
+        if session_id in self.sessions:
+            change(self.sessions[session_id])
+        elif session_id in self.pending:
+            self.pending[session_id].append(change)
+
+    def add(self, card: Dict[str, Any]):
+        self._apply(
+            card["session_id"],
+            lambda index: index.add(card["id"], card["category"], card["content"])
+        )
+
+    def remove(self, session_id: str, card_id: int):
+        self._apply(session_id, lambda index: index.remove(card_id))
+
+    def clear(self, session_id: str):
+        self._apply(session_id, lambda index: index.clear())
+
+    def changed(self, session_id: str) -> Optional[List[Dict[str, Any]]]:
+        index = self.sessions.get(session_id)
+        if index is None or not index.dirty:
+            return None
+        index.dirty = False
+        groups = index.groups()
+        if groups == index.published:
+            return None
+        index.published = groups
+        return groups
+
+    async def schedule(self, session_id: str):
+        if self.broadcast_window <= 0:
+            await self._publish(session_id)
+        elif session_id not in self.broadcasts:
+            self.broadcasts[session_id] = asyncio.create_task(self._publish_after_window(session_id))
+
+    async def _publish_after_window(self, session_id: str):
+        try:
+            await asyncio.sleep(self.broadcast_window)
+        finally:
+            self.broadcasts.pop(session_id, None)
+        await self._publish(session_id)
+
+    async def _publish(self, session_id: str):
+        groups = self.changed(session_id)
+        if groups is None or self.publish is None:
+            return
+        self.published += 1
+        await self.publish(session_id, groups)
+
+    def close(self):
+        for task in list(self.broadcasts.values()):
+            task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self.sessions),
+            "built": self.built,
+            "cards": sum(len(index.signatures) for index in self.sessions.values()),
+            "comparisons": sum(index.comparisons for index in self.sessions.values()),
+            "published": self.published,
+            "bands": self.bands,
+            "rows": self.rows,
+            "max_group": self.max_group,
+        }
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self.in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executions": self.calls - self.deduplicated,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self.in_flight),
+        }
+
+
+class ActivityThrottle:
+    def __init__(self, interval: float, max_tracked: int = 10000):
+        self.interval = interval
+        self.max_tracked = max_tracked
+        self.last_touch: Dict[str, float] = {}
+        self.writes = 0
+        self.coalesced = 0
+
+    def should_touch(self, key: str) -> bool:
+        now = time.monotonic()
+        last = self.last_touch.get(key)
+        if last is not None and now - last < self.interval:
+            self.coalesced += 1
+            return False
+        if len(self.last_touch) >= self.max_tracked:
+            self._prune(now)
+        self.last_touch[key] = now
+        self.writes += 1
+        return True
+
+    def _prune(self, now: float):
+        self.last_touch = {
+            key: last for key, last in self.last_touch.items()
+            if now - last < self.interval
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "tracked": len(self.last_touch),
+        }
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CATEGORIES = ("well", "badly", "continue", "kudos", "actionables")
+SESSION_BUCKET = "%Y-%m-%d %H:00"
+GLOBAL_BUCKET = "%Y-%m-%d"
+ACTIVITY_BUCKETS = 48
+
+
+def summarize(
+    categories: Iterable[Tuple[str, int, int]],
+    contributors: int,
+    activity: Iterable[Tuple[str, int]]
+) -> Dict[str, Any]:
+    counts = dict.fromkeys(CATEGORIES, 0)
+    completed = 0
+    for category, cards, done in categories:
+        counts[category] = cards
+        if category == "actionables":
+            completed = done
+    return {
+        "cards": sum(counts.values()),
+        "categories": counts,
+        "actionables": {"completed": completed, "open": counts["actionables"] - completed},
+        "contributors": contributors,
+        "activity": [
+            {"bucket": bucket, "cards": cards} for bucket, cards in sorted(activity)
+        ][-ACTIVITY_BUCKETS:],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from . import database
+
+    parser = argparse.ArgumentParser(prog="python -m app.stats")
+    parser.add_argument("--database", default=database.DATABASE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild")
+    commands.add_parser("check")
+    args = parser.parse_args(argv)
+
+    database.DATABASE_PATH = args.database
+    if args.command == "rebuild":
+        duration_ms = asyncio.run(database.rebuild_stats())
+        print(f"Rebuilt board statistics in {duration_ms} ms")
+        return 0
+
+    mismatches = asyncio.run(database.check_stats())
+    for table, rows in mismatches.items():
+        print(f"{table}\t{rows} rows differ", file=sys.stderr)
+    if mismatches:
+        print("Run `python -m app.stats rebuild` to recompute", file=sys.stderr)
+        return 1
+    print("Board statistics are consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import database
+
+
+class Storage(ABC):
+    async def init(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def create_session(self, session_id: str) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_all_sessions(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def update_session_name(self, session_id: str, name: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def update_session_activity(self, session_id: str) -> bool: ...
+
+    @abstractmethod
+    async def create_card(
+        self,
+        session_id: str,
+        category: str,
+        content: str,
+        author: str
+    ) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    async def clone_cards(
+        self,
+        session_id: str,
+        source_session_id: str,
+        only: Optional[str] = None
+    ) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_open_actionables(self, session_ids: Sequence[str]) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_card(self, card_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_cards(self, session_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_card_pages(
+        self,
+        session_id: str,
+        categories: Sequence[str],
+        limit: int,
+        after: int = 0
+    ) -> Dict[str, List[Dict[str, Any]]]: ...
+
+    @abstractmethod
+    async def update_card(self, card_id: int, content: Optional[str] = None) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def toggle_actionable(self, card_id: int, completed: bool) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def delete_card(self, card_id: int) -> bool: ...
+
+    @abstractmethod
+    async def delete_all_cards(self, session_id: str) -> bool: ...
+
+    @abstractmethod
+    async def apply_card_operations(
+        self,
+        session_id: str,
+        operations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    async def cleanup_old_sessions(self, hours: int = 24) -> int: ...
+
+    @abstractmethod
+    async def archive_idle_sessions(self, hours: int = 24) -> int: ...
+
+    @abstractmethod
+    async def purge_archived_sessions(self, hours: int = 24) -> int: ...
+
+    @abstractmethod
+    async def search_cards(
+        self,
+        terms: List[str],
+        session_id: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Tuple[float, int, int]] = None
+    ) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_votes(self, session_id: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def save_votes(self, votes: List[Dict[str, Any]]) -> int: ...
+
+    @abstractmethod
+    async def get_session_stats(self, session_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def get_global_stats(self) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    async def acquire_job_lease(self, name: str, owner: str, ttl: float) -> bool: ...
+
+    @abstractmethod
+    async def get_job_leases(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def record_job_run(
+        self,
+        name: str,
+        owner: str,
+        started_at: float,
+        duration_ms: float,
+        status: str,
+        detail: Optional[str] = None
+    ): ...
+
+    @abstractmethod
+    async def get_job_runs(self, limit: int = 50, name: Optional[str] = None) -> List[Dict[str, Any]]: ...
+
+
+class SQLiteStorage(Storage):
+    async def init(self):
+        await database.init_db()
+
+    async def create_session(self, session_id):
+        return await database.create_session(session_id)
+
+    async def get_session(self, session_id):
+        return await database.get_session(session_id)
+
+    async def get_all_sessions(self):
+        return await database.get_all_sessions()
+
+    async def update_session_name(self, session_id, name):
+        return await database.update_session_name(session_id, name)
+
+    async def update_session_activity(self, session_id):
+        return await database.update_session_activity(session_id)
+
+    async def create_card(self, session_id, category, content, author):
+        return await database.create_card(session_id, category, content, author)
+
+    async def clone_cards(self, session_id, source_session_id, only=None):
+        return await database.clone_cards(session_id, source_session_id, only)
+
+    async def get_open_actionables(self, session_ids):
+        return await database.get_open_actionables(session_ids)
+
+    async def get_card(self, card_id):
+        return await database.get_card(card_id)
+
+    async def get_cards(self, session_id):
+        return await database.get_cards(session_id)
+
+    async def get_card_pages(self, session_id, categories, limit, after=0):
+        return await database.get_card_pages(session_id, categories, limit, after)
+
+    async def update_card(self, card_id, content=None):
+        return await database.update_card(card_id, content)
+
+    async def toggle_actionable(self, card_id, completed):
+        return await database.toggle_actionable(card_id, completed)
+
+    async def delete_card(self, card_id):
+        return await database.delete_card(card_id)
+
+    async def delete_all_cards(self, session_id):
+        return await database.delete_all_cards(session_id)
+
+    async def apply_card_operations(self, session_id, operations):
+        return await database.apply_card_operations(session_id, operations)
+
+    async def cleanup_old_sessions(self, hours=24):
+        return await database.cleanup_old_sessions(hours)
+
+    async def archive_idle_sessions(self, hours=24):
+        return await database.archive_idle_sessions(hours)
+
+    async def purge_archived_sessions(self, hours=24):
+        return await database.purge_archived_sessions(hours)
+
+    async def search_cards(self, terms, session_id=None, limit=20, after=None):
+        return await database.search_cards(terms, session_id, limit, after)
+
+    async def get_votes(self, session_id):
+        return await database.get_votes(session_id)
+
+    async def save_votes(self, votes):
+        return await database.save_votes(votes)
+
+    async def get_session_stats(self, session_id):
+        return await database.get_session_stats(session_id)
+
+    async def get_global_stats(self):
+        return await database.get_global_stats()
+
+    async def acquire_job_lease(self, name, owner, ttl):
+        return await database.acquire_job_lease(name, owner, ttl)
+
+    async def get_job_leases(self):
+        return await database.get_job_leases()
+
+    async def record_job_run(self, name, owner, started_at, duration_ms, status, detail=None):
+        await database.record_job_run(name, owner, started_at, duration_ms, status, detail)
+
+    async def get_job_runs(self, limit=50, name=None):
+        return await database.get_job_runs(limit, name)
+
+
+def create_storage(backend: str, snapshot_path: str = "", snapshot_interval: float = 60) -> Storage:
+    if backend == "sqlite":
+        return SQLiteStorage()
+    if backend == "memory":
+        from .memory_storage import MemoryStorage
+        return MemoryStorage(snapshot_path=snapshot_path or None, snapshot_interval=snapshot_interval)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,178 @@
+import contextvars
+import json
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+SERVICE_NAME = "rad-retro"
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self.trace: List["Span"] = parent.trace if parent else []
+        self.root: "Span" = parent.root if parent else self
+        self.exported = False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS[self.kind],
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_document(spans: List[Span]) -> Dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "app.tracing"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class JsonLinesExporter:
+    def __init__(self, target: str):
+        self.target = target
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self._write, name="trace-exporter", daemon=True)
+        self.writer.start()
+
+    def export(self, spans: List[Span]):
+        self.queue.put(otlp_document(spans))
+
+    def _write(self):
+        stream = sys.stdout if self.target == "stdout" else open(self.target, "a")
+        while True:
+            document = self.queue.get()
+            stream.write(json.dumps(document) + "\n")
+            stream.flush()
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[Any] = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes: Any):
+        if self.exporter is None:
+            yield None
+            return
+        parent = _current_span.get()
+        span = Span(name, kind, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span, parent)
+
+    def _finish(self, span: Span, parent: Optional[Span]):
+        if parent is None:
+            span.trace.append(span)
+            span.exported = True
+            self.exporter.export(span.trace)
+            return
+        if span.root.exported:
+            self.exporter.export([span])
+        else:
+            span.trace.append(span)
+
+    def traced(self, name: Optional[str] = None):
+        def decorator(fn):
+            span_name = name or fn.__name__
+
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if self.exporter is None:
+                    return await fn(*args, **kwargs)
+                with self.span(span_name, kind="client"):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+class TracingMiddleware:
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if not self.tracer.enabled or scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "WS")
+        with self.tracer.span(f"{method} {scope['path']}", kind="server") as span:
+            span.set_attribute("http.method", method)
+            span.set_attribute("http.target", scope["path"])
+
+            async def traced_send(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, traced_send)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+tracer = Tracer(JsonLinesExporter(os.environ["TRACE_EXPORT"]) if os.getenv("TRACE_EXPORT") else None)
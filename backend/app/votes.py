@@ -0,0 +1,196 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .singleflight import SingleFlight
+from .storage import Storage
+
+
+class SessionVotes:
+    def __init__(self, card_ids: Set[int]):
+        self.card_ids = card_ids
+        self.ballots: Dict[Tuple[int, str], int] = {}
+        self.tallies: Dict[int, int] = {}
+        self.spent: Dict[str, int] = {}
+        self.changed: Set[int] = set()
+
+    def set(self, card_id: int, voter: str, count: int):
+        previous = self.ballots.get((card_id, voter), 0)
+        if count:
+            self.ballots[(card_id, voter)] = count
+        else:
+            self.ballots.pop((card_id, voter), None)
+        self.tallies[card_id] = self.tallies.get(card_id, 0) + count - previous
+        self.spent[voter] = self.spent.get(voter, 0) + count - previous
+        if not self.tallies[card_id]:
+            del self.tallies[card_id]
+        if not self.spent[voter]:
+            del self.spent[voter]
+
+    def mine(self, voter: str) -> Dict[int, int]:
+        return {
+            card_id: count for (card_id, ballot_voter), count in self.ballots.items()
+            if ballot_voter == voter
+        }
+
+
+class VoteCounter:
+    def __init__(
+        self,
+        storage: Storage,
+        limit: int = 3,
+        flush_interval: float = 1.0,
+        broadcast_window: float = 0.1,
+        publish: Optional[Callable[[str, Dict[int, int]], Awaitable[None]]] = None,
+        max_sessions: int = 1000
+    ):
+        self.storage = storage
+        self.limit = limit
+        self.flush_interval = flush_interval
+        self.broadcast_window = broadcast_window
+        self.publish = publish
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, SessionVotes]" = OrderedDict()
+        self.dirty: Dict[Tuple[str, int, str], int] = {}
+        self.broadcasts: Dict[str, asyncio.Task] = {}
+        self.loads = SingleFlight()
+        self.accepted = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.flush_failures = 0
+        self.published = 0
+
+    async def load(self, session_id: str) -> SessionVotes:
+        if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
+            return self.sessions[session_id]
+        return await self.loads.do(session_id, lambda: self._load(session_id))
+
+    async def _load(self, session_id: str) -> SessionVotes:
+        cards = await self.storage.get_cards(session_id)
+        state = SessionVotes({card["id"] for card in cards})
+        for vote in await self.storage.get_votes(session_id):
+            state.set(vote["card_id"], vote["voter"], vote["count"])
+        self.sessions[session_id] = state
+        self._evict()
+        return state
+
+    def _evict(self):
+        dirty_sessions = {session_id for session_id, _, _ in self.dirty}
+        for session_id in list(self.sessions):
+            if len(self.sessions) <= self.max_sessions:
+                break
+            if session_id not in dirty_sessions and session_id not in self.broadcasts:
+                del self.sessions[session_id]
+
+    async def has_card(self, session_id: str, card_id: int) -> bool:
+        state = await self.load(session_id)
+        if card_id not in state.card_ids:
+            card = await self.storage.get_card(card_id)
+            if not card or card["session_id"] != session_id:
+                return False
+            state.card_ids.add(card_id)
+        return True
+
+    async def vote(self, session_id: str, card_id: int, voter: str, delta: int) -> Optional[Dict[str, int]]:
+        state = await self.load(session_id)
+        count = state.ballots.get((card_id, voter), 0) + delta
+        if count < 0 or (delta > 0 and state.spent.get(voter, 0) + delta > self.limit):
+            self.rejected += 1
+            return None
+        state.set(card_id, voter, count)
+        state.changed.add(card_id)
+        self.dirty[(session_id, card_id, voter)] = count
+        self.accepted += 1
+        await self._schedule(session_id)
+        return {
+            "card_id": card_id,
+            "votes": state.tallies.get(card_id, 0),
+            "mine": count,
+            "remaining": self.remaining(state, voter),
+        }
+
+    def remaining(self, state: SessionVotes, voter: Optional[str]) -> int:
+        return self.limit - state.spent.get(voter, 0) if voter else self.limit
+
+    def forget_card(self, session_id: str, card_id: int):
+        state = self.sessions.get(session_id)
+        if state is None:
+            return
+        for (ballot_card, voter) in [key for key in state.ballots if key[0] == card_id]:
+            state.set(ballot_card, voter, 0)
+            self.dirty.pop((session_id, ballot_card, voter), None)
+        state.card_ids.discard(card_id)
+        state.changed.discard(card_id)
+
+    def forget_session(self, session_id: str):
+        self.sessions.pop(session_id, None)
+        for key in [key for key in self.dirty if key[0] == session_id]:
+            del self.dirty[key]
+
+    async def _schedule(self, session_id: str):
+        if self.broadcast_window <= 0:
+            await self._publish(session_id)
+        elif session_id not in self.broadcasts:
+            self.broadcasts[session_id] = asyncio.create_task(self._publish_after_window(session_id))
+
+    async def _publish_after_window(self, session_id: str):
+        try:
+            await asyncio.sleep(self.broadcast_window)
+        finally:
+            self.broadcasts.pop(session_id, None)
+        await self._publish(session_id)
+
+    async def _publish(self, session_id: str):
+        state = self.sessions.get(session_id)
+        if state is None or not state.changed or self.publish is None:
+            return
+        tallies = {card_id: state.tallies.get(card_id, 0) for card_id in sorted(state.changed)}
+        state.changed = set()
+        self.published += 1
+        await self.publish(session_id, tallies)
+
+    async def flush(self) -> int:
+        if not self.dirty:
+            return 0
+        batch, self.dirty = self.dirty, {}
+        try:
+            await self.storage.save_votes([
+                {"session_id": session_id, "card_id": card_id, "voter": voter, "count": count}
+                for (session_id, card_id, voter), count in batch.items()
+            ])
+        except Exception:
+            self.flush_failures += 1
+            for key, count in batch.items():
+                self.dirty.setdefault(key, count)
+            raise
+        self.flushes += 1
+        self.rows_flushed += len(batch)
+        return len(batch)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass
+
+    async def close(self):
+        for task in list(self.broadcasts.values()):
+            task.cancel()
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "pending": len(self.dirty),
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "flush_failures": self.flush_failures,
+            "published": self.published,
+            "sessions": len(self.sessions),
+        }
@@ -1,24 +1,121 @@
 from fastapi import WebSocket
-from typing import Dict, List, Tuple
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import itertools
 import json
+import random
+import time
+
+from .tracing import tracer
+
+GOING_AWAY = 1001
+SERVICE_RESTART = 1012
+TRY_AGAIN_LATER = 1013
+
+
+def encode(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class Lagged(Exception):
+    pass
+
+
+class SpectatorChannel:
+    def __init__(self, size: int):
+        self.frames: Deque[str] = deque(maxlen=size)
+        self.end = 0
+        self.viewers = 0
+        self.closed = False
+        self.changed = asyncio.Event()
+
+    def publish(self, frame: str):
+        self.frames.append(frame)
+        self.end += 1
+        self._wake()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def read(self, cursor: int) -> List[str]:
+        start = self.end - len(self.frames)
+        if cursor < start:
+            raise Lagged()
+        return list(itertools.islice(self.frames, cursor - start, None))
+
+    def _wake(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
 
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(
+        self,
+        batch_window: float = 0.0,
+        heartbeat_interval: float = 0.0,
+        heartbeat_timeout: float = 0.0,
+        max_connections: int = 0,
+        max_connections_per_session: int = 0,
+        should_shed: Optional[Callable[[str], bool]] = None,
+        max_spectators: int = 0,
+        spectator_buffer: int = 256,
+        audience_window: float = 1.0
+    ):
         self.active_connections: Dict[str, List[Tuple[WebSocket, str]]] = {}
+        self.batch_window = batch_window
+        self.pending_events: Dict[str, List[dict]] = {}
+        self.flush_tasks: Dict[str, asyncio.Task] = {}
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.last_seen: Dict[WebSocket, float] = {}
+        self.pings_sent = 0
+        self.reaped = 0
+        self.max_connections = max_connections
+        self.max_connections_per_session = max_connections_per_session
+        self.rejected = 0
+        self.should_shed = should_shed or (lambda kind: False)
+        self.stale_presence: Set[str] = set()
+        self.channels: Dict[str, SpectatorChannel] = {}
+        self.max_spectators = max_spectators
+        self.spectator_buffer = spectator_buffer
+        self.audience_window = audience_window
+        self.audience_tasks: Dict[str, asyncio.Task] = {}
+        self.lagged = 0
+        self.closing = False
+
+    def admits(self, session_id: str) -> bool:
+        if self.max_connections and len(self.last_seen) >= self.max_connections:
+            return False
+        session_connections = len(self.active_connections.get(session_id, []))
+        if self.max_connections_per_session and session_connections >= self.max_connections_per_session:
+            return False
+        return True
 
-    async def connect(self, websocket: WebSocket, session_id: str, username: str):
+    async def connect(self, websocket: WebSocket, session_id: str, username: str) -> bool:
         await websocket.accept()
+        if not self.admits(session_id):
+            self.rejected += 1
+            await self._close_quietly(
+                websocket,
+                TRY_AGAIN_LATER,
+                json.dumps({"retry_after": round(random.uniform(5, 30), 1)})
+            )
+            return False
         if session_id not in self.active_connections:
             self.active_connections[session_id] = []
         self.active_connections[session_id].append((websocket, username))
+        self.last_seen[websocket] = time.monotonic()
 
         try:
             await self.broadcast_user_list(session_id)
         except Exception:
             pass
+        return True
 
     async def disconnect_async(self, websocket: WebSocket, session_id: str):
+        self.last_seen.pop(websocket, None)
         if session_id in self.active_connections:
             self.active_connections[session_id] = [
                 (ws, user) for ws, user in self.active_connections[session_id]
@@ -34,6 +131,7 @@ class WebSocketManager:
                     pass
 
     def disconnect(self, websocket: WebSocket, session_id: str):
+        self.last_seen.pop(websocket, None)
         if session_id in self.active_connections:
             self.active_connections[session_id] = [
                 (ws, user) for ws, user in self.active_connections[session_id]
@@ -42,6 +140,10 @@ class WebSocketManager:
             if not self.active_connections[session_id]:
                 del self.active_connections[session_id]
 
+    def touch(self, websocket: WebSocket):
+        if websocket in self.last_seen:
+            self.last_seen[websocket] = time.monotonic()
+
     def get_active_users(self, session_id: str) -> List[str]:
         if session_id not in self.active_connections:
             return []
@@ -49,6 +151,10 @@ class WebSocketManager:
         return list(dict.fromkeys(usernames))
 
     async def broadcast_user_list(self, session_id: str):
+        if self.should_shed("presence"):
+            self.stale_presence.add(session_id)
+            return
+        self.stale_presence.discard(session_id)
         users = self.get_active_users(session_id)
         await self.broadcast(session_id, {
             "event": "user_list",
@@ -56,10 +162,250 @@ class WebSocketManager:
         })
 
     async def broadcast(self, session_id: str, message: dict):
+        if self.batch_window <= 0:
+            await self._send(session_id, message)
+            return
+
+        if session_id not in self.active_connections and session_id not in self.channels:
+            return
+        self.pending_events.setdefault(session_id, []).append(message)
+        if session_id not in self.flush_tasks:
+            self.flush_tasks[session_id] = asyncio.create_task(
+                self._flush_after_window(session_id)
+            )
+
+    async def broadcast_many(self, session_id: str, messages: List[dict]):
+        if not messages:
+            return
+        if len(messages) == 1:
+            await self.broadcast(session_id, messages[0])
+            return
+        if self.batch_window > 0:
+            for message in messages:
+                await self.broadcast(session_id, message)
+            return
+        await self._send(session_id, {"event": "batch", "data": messages})
+
+    async def flush(self, session_id: str):
+        task = self.flush_tasks.pop(session_id, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        events = self.pending_events.pop(session_id, [])
+        if not events:
+            return
+        if len(events) == 1:
+            await self._send(session_id, events[0])
+        else:
+            await self._send(session_id, {"event": "batch", "data": events})
+
+    async def close_all(
+        self,
+        code: int = SERVICE_RESTART,
+        retry_after: float = 1.0,
+        spread: float = 10.0,
+        timeout: float = 2.0
+    ):
+        self.closing = True
+        for task in self.flush_tasks.values():
+            task.cancel()
+        self.flush_tasks.clear()
+        self.pending_events.clear()
+        for channel in self.channels.values():
+            channel.close()
+        closes = []
+        for session_id in list(self.active_connections):
+            for connection, username in self.active_connections.pop(session_id, []):
+                self.last_seen.pop(connection, None)
+                delay = retry_after + random.uniform(0, spread)
+                closes.append(connection.close(
+                    code=code,
+                    reason=json.dumps({"retry_after": round(delay, 1)})
+                ))
+        if closes:
+            try:
+                await asyncio.wait_for(asyncio.gather(*closes, return_exceptions=True), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def flush_presence(self):
+        for session_id in list(self.stale_presence):
+            self.stale_presence.discard(session_id)
+            if session_id in self.active_connections:
+                await self.broadcast_user_list(session_id)
+
+    async def heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self.reap_idle()
+            await self.send_pings()
+
+    async def send_pings(self):
+        message = {"event": "ping", "data": {}}
+        for session_id in list(self.active_connections):
+            self.pings_sent += len(self.active_connections.get(session_id, []))
+            await self._send(session_id, message, spectators=False)
+
+    async def reap_idle(self) -> int:
+        cutoff = time.monotonic() - self.heartbeat_timeout
+        stale: List[WebSocket] = []
+        affected: List[str] = []
+        for session_id, connections in list(self.active_connections.items()):
+            alive = [
+                (ws, user) for ws, user in connections
+                if self.last_seen.get(ws, 0) >= cutoff
+            ]
+            if len(alive) == len(connections):
+                continue
+            stale.extend(ws for ws, _ in connections if self.last_seen.get(ws, 0) < cutoff)
+            if alive:
+                self.active_connections[session_id] = alive
+                affected.append(session_id)
+            else:
+                del self.active_connections[session_id]
+
+        if not stale:
+            return 0
+        for websocket in stale:
+            self.last_seen.pop(websocket, None)
+        await asyncio.gather(
+            *(self._close_quietly(websocket, GOING_AWAY, "heartbeat timeout") for websocket in stale)
+        )
+        self.reaped += len(stale)
+        for session_id in affected:
+            try:
+                await self.broadcast_user_list(session_id)
+            except Exception:
+                pass
+        return len(stale)
+
+    async def _close_quietly(self, websocket: WebSocket, code: int, reason: str):
+        try:
+            await asyncio.wait_for(websocket.close(code=code, reason=reason), timeout=1)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self.active_connections),
+            "connections": sum(len(c) for c in self.active_connections.values()),
+            "pings_sent": self.pings_sent,
+            "reaped": self.reaped,
+            "rejected": self.rejected,
+            "spectators": self.spectator_count(),
+            "spectator_sessions": len(self.channels),
+            "spectators_lagged": self.lagged,
+        }
+
+    async def _flush_after_window(self, session_id: str):
+        await asyncio.sleep(self.batch_window)
+        await self.flush(session_id)
+
+    def admits_spectator(self) -> bool:
+        return not self.max_spectators or self.spectator_count() < self.max_spectators
+
+    def spectator_count(self, session_id: Optional[str] = None) -> int:
+        if session_id is not None:
+            channel = self.channels.get(session_id)
+            return channel.viewers if channel else 0
+        return sum(channel.viewers for channel in self.channels.values())
+
+    async def watch(self, session_id: str, keepalive: float = 0) -> AsyncIterator[Optional[str]]:
+        channel = self.channels.get(session_id)
+        if channel is None:
+            channel = self.channels[session_id] = SpectatorChannel(self.spectator_buffer)
+        channel.viewers += 1
+        self._audience_changed(session_id)
+        cursor = channel.end
+        try:
+            yield encode({"event": "batch", "data": [
+                {"event": "user_list", "data": {"users": self.get_active_users(session_id)}},
+                {"event": "spectators", "data": {"count": channel.viewers}},
+            ]})
+            while True:
+                try:
+                    frames = channel.read(cursor)
+                except Lagged:
+                    self.lagged += 1
+                    return
+                if frames:
+                    cursor += len(frames)
+                    for frame in frames:
+                        yield frame
+                    continue
+                if channel.closed:
+                    return
+                try:
+                    await asyncio.wait_for(channel.changed.wait(), keepalive or None)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            channel.viewers -= 1
+            if not channel.viewers and self.channels.get(session_id) is channel:
+                del self.channels[session_id]
+            self._audience_changed(session_id)
+
+    async def spectate(self, websocket: WebSocket, session_id: str, spread: float = 10.0):
+        await websocket.accept()
+        if self.closing or not self.admits_spectator():
+            self.rejected += 1
+            await self._close_quietly(
+                websocket,
+                TRY_AGAIN_LATER,
+                json.dumps({"retry_after": round(random.uniform(5, 30), 1)})
+            )
+            return
+        sender = asyncio.create_task(self._forward(websocket, session_id))
+        receiver = asyncio.create_task(self._until_disconnect(websocket))
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if sender in done and receiver not in done:
+            code = SERVICE_RESTART if self.closing else TRY_AGAIN_LATER
+            reason = json.dumps({"retry_after": round(random.uniform(0, spread if self.closing else 1), 1)})
+            await self._close_quietly(websocket, code, reason)
+
+    async def _forward(self, websocket: WebSocket, session_id: str):
+        try:
+            async for frame in self.watch(session_id):
+                await websocket.send_text(frame)
+        except Exception:
+            pass
+
+    async def _until_disconnect(self, websocket: WebSocket):
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        except Exception:
+            pass
+
+    def _audience_changed(self, session_id: str):
+        if self.audience_window <= 0 or session_id in self.audience_tasks:
+            return
+        self.audience_tasks[session_id] = asyncio.create_task(self._publish_audience(session_id))
+
+    async def _publish_audience(self, session_id: str):
+        await asyncio.sleep(self.audience_window)
+        self.audience_tasks.pop(session_id, None)
+        await self.broadcast(session_id, {
+            "event": "spectators",
+            "data": {"count": self.spectator_count(session_id)}
+        })
+
+    async def _send(self, session_id: str, message: dict, spectators: bool = True):
+        channel = self.channels.get(session_id)
+        if spectators and channel is not None:
+            channel.publish(encode(message))
         if session_id in self.active_connections:
             connections = self.active_connections[session_id].copy()
-            for connection, username in connections:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    self.disconnect(connection, session_id)
+            with tracer.span(
+                "ws.broadcast",
+                session_id=session_id,
+                event=message["event"],
+                recipients=len(connections)
+            ):
+                for connection, username in connections:
+                    try:
+                        await connection.send_json(message)
+                    except Exception:
+                        self.disconnect(connection, session_id)
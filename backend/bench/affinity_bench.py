@@ -0,0 +1,171 @@
+"""Compare one worker with several workers behind the session router.
+
+Starts `python -m app.serve` once per mode against a fresh database. Every
+board gets a WebSocket listener, then writers add cards and reload boards
+as fast as they can for a fixed duration. Reports request throughput,
+request latency, and how many card_added events reached the listener of
+the board they belong to. The unsharded mode runs the same workers behind
+the kernel's accept balancing and shows how many broadcasts go missing
+when a board's traffic is spread across processes.
+
+    python bench/affinity_bench.py --workers 4 --sessions 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+BACKEND_DIR = Path(__file__).parent.parent
+MODES = ("single", "sharded", "unsharded")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def wait_until_up(base_url: str):
+    async with httpx.AsyncClient() as client:
+        for _ in range(300):
+            try:
+                await client.get(f"{base_url}/health")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def listen(url: str, received: dict, session_id: str, ready: asyncio.Event):
+    async with websockets.connect(url, open_timeout=60) as ws:
+        ready.set()
+        async for message in ws:
+            if json.loads(message)["event"] == "card_added":
+                received[session_id] += 1
+
+
+async def writer(
+    http: httpx.AsyncClient,
+    sessions: list,
+    offset: int,
+    deadline: float,
+    latencies: list,
+    sent: dict
+):
+    i = offset
+    while time.perf_counter() < deadline:
+        session_id = sessions[i % len(sessions)]
+        i += 1
+        started = time.perf_counter()
+        response = await http.post(
+            f"/api/session/{session_id}/card",
+            json={"category": "well", "content": f"Card {i}", "author": "bench"}
+        )
+        latencies.append(time.perf_counter() - started)
+        if response.status_code == 200:
+            sent[session_id] += 1
+        started = time.perf_counter()
+        await http.get(f"/api/session/{session_id}")
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_mode(mode: str, args) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    db_dir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        HOST="127.0.0.1",
+        PORT=str(port),
+        DATABASE_PATH=os.path.join(db_dir, "retro.db"),
+        WEB_CONCURRENCY="1" if mode == "single" else str(args.workers),
+        SERVER_SHARDING="1" if mode == "sharded" else "0",
+        SERVER_PREWARM_MB="0",
+        CARD_RATE_LIMIT_PER_SECOND="0",
+        MAX_CARDS_PER_SESSION="1000000",
+        LOOP_LAG_SHED_THRESHOLD_MS="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        await wait_until_up(base_url)
+        limits = httpx.Limits(max_connections=args.writers, max_keepalive_connections=args.writers)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+            sessions = [
+                (await http.post("/api/session/create")).json()["session_id"]
+                for _ in range(args.sessions)
+            ]
+            received = {session_id: 0 for session_id in sessions}
+            sent = {session_id: 0 for session_id in sessions}
+            listeners = []
+            for session_id in sessions:
+                ready = asyncio.Event()
+                url = f"ws://127.0.0.1:{port}/ws/{session_id}?username=listener"
+                listeners.append(asyncio.create_task(listen(url, received, session_id, ready)))
+                await ready.wait()
+
+            latencies: list = []
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                writer(http, sessions, i, deadline, latencies, sent) for i in range(args.writers)
+            ))
+            elapsed = time.perf_counter() - started
+            await asyncio.sleep(1)
+            for listener in listeners:
+                listener.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    added = sum(sent.values())
+    return {
+        "mode": mode,
+        "workers": 1 if mode == "single" else args.workers,
+        "requests_per_s": round(len(latencies) / elapsed),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "cards": added,
+        "broadcasts_delivered": f"{100 * sum(received.values()) / max(added, 1):.1f}%",
+    }
+
+
+async def main(args):
+    raise_fd_limit()
+    modes = MODES if args.mode == "all" else [args.mode]
+    for mode in modes:
+        report = await run_mode(mode, args)
+        print(" ".join(f"{key}={value}" for key, value in report.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mode", choices=MODES + ("all",), default="all")
+    asyncio.run(main(parser.parse_args()))
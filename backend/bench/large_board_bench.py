@@ -0,0 +1,153 @@
+"""Time a board with 10k cards: full loads against per-column pages.
+
+Builds a throwaway database holding one board with N cards spread over
+the five columns (the stats tables are filled by the app's triggers),
+starts the app under uvicorn, and times the requests a browser makes: the
+full board load the old frontend used, the first page per column, pages
+deep into a column, adding a card (which runs the card cap check), and
+the similar-card groups.
+
+    python bench/large_board_bench.py --cards 10000
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import database  # noqa: E402
+
+SESSION_ID = "large"
+CATEGORIES = ["well", "badly", "continue", "kudos", "actionables"]
+SYLLABLES = "ba de fi go ku la me ni po ru sa te vi wo za".split()
+WORDS = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def build(path: str, cards: int):
+    database.DATABASE_PATH = path
+    await database.init_db()
+    rng = random.Random(7)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO sessions (session_id, name) VALUES (?, 'Large board')", (SESSION_ID,))
+    conn.executemany(
+        "INSERT INTO cards (session_id, category, content, author) VALUES (?, ?, ?, ?)",
+        (
+            (SESSION_ID, CATEGORIES[i % len(CATEGORIES)], " ".join(rng.sample(WORDS, 8)), f"user{i % 40}")
+            for i in range(cards)
+        )
+    )
+    conn.execute(
+        "INSERT INTO actionables (card_id, completed) "
+        "SELECT id, 0 FROM cards WHERE category = 'actionables'"
+    )
+    conn.commit()
+    conn.close()
+
+
+async def wait_until_up(base_url: str):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"{base_url}/health")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def timed(client: httpx.AsyncClient, method: str, url: str, repeat: int, **kwargs):
+    durations = []
+    response = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        durations.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return response, durations
+
+
+def report(name: str, response: httpx.Response, durations: list):
+    report = {
+        "request": name,
+        "p50_ms": round(statistics.median(durations) * 1000, 1),
+        "max_ms": round(max(durations) * 1000, 1),
+        "bytes": len(response.content),
+    }
+    print(" ".join(f"{key}={value}" for key, value in report.items()))
+
+
+async def main(args):
+    db_dir = tempfile.mkdtemp()
+    path = os.path.join(db_dir, "retro.db")
+    started = time.perf_counter()
+    await build(path, args.cards)
+    print(f"Built {args.cards} cards in {time.perf_counter() - started:.1f}s")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        DATABASE_PATH=path,
+        MAX_CARDS_PER_SESSION=str(args.cards * 2),
+        CARD_RATE_LIMIT_PER_SECOND="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+    try:
+        await wait_until_up(base_url)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            board = f"/api/session/{SESSION_ID}"
+            report("full_board", *await timed(client, "GET", board, args.repeat))
+            response, durations = await timed(client, "GET", board, args.repeat, params={"per_column": 50})
+            report("first_page_per_column", response, durations)
+
+            after = response.json()["next_after"]["well"]
+            pages = 0
+            page_durations = []
+            while after is not None:
+                response, durations = await timed(
+                    client, "GET", f"{board}/cards", 1,
+                    params={"category": "well", "after": after, "limit": 50}
+                )
+                page_durations.extend(durations)
+                after = response.json()["next_after"]
+                pages += 1
+            if pages:
+                report(f"scroll_column_{pages}_pages", response, page_durations)
+
+            report("card_groups", *await timed(client, "GET", f"{board}/groups", args.repeat))
+            report("add_card", *await timed(
+                client, "POST", f"{board}/card", args.repeat,
+                json={"category": "kudos", "content": "Thanks for the release work", "author": "bench"}
+            ))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
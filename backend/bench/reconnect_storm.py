@@ -0,0 +1,181 @@
+"""Replay a server restart with many connected browsers.
+
+Starts the app under uvicorn, then reconnects N clients using either the
+old fixed 3 second retry or the jittered policy from useWebSocket.ts. Each
+client opens /ws/{session_id} and refetches the board, like the frontend
+does. A probe hits /health every 20 ms to show how badly the event loop
+stalls while the herd arrives.
+
+    python bench/reconnect_storm.py --clients 1000
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+BACKEND_DIR = Path(__file__).parent.parent
+FIXED_DELAY = 3.0
+RESTART_WINDOW = 10.0
+
+
+def fixed_delay() -> float:
+    return FIXED_DELAY + random.uniform(0, 0.02)
+
+
+def jittered_delay() -> float:
+    return random.uniform(0, RESTART_WINDOW)
+
+
+POLICIES = {"fixed": fixed_delay, "jitter": jittered_delay}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def wait_until_up(base_url: str):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"{base_url}/health")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def probe(base_url: str, stop: asyncio.Event, latencies: list):
+    async with httpx.AsyncClient(timeout=120) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                await client.get(f"{base_url}/health")
+            except httpx.TransportError:
+                pass
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.02)
+
+
+async def reconnecting_client(
+    base_url: str,
+    ws_url: str,
+    session_id: str,
+    delay: float,
+    http: httpx.AsyncClient,
+    arrivals: list,
+    release: asyncio.Event
+):
+    await asyncio.sleep(delay)
+    arrivals.append(time.perf_counter())
+    url = f"{ws_url}/ws/{session_id}?username=bench"
+    async with websockets.connect(url, open_timeout=120) as ws:
+        drain = asyncio.create_task(drain_messages(ws))
+        await http.get(f"{base_url}/api/session/{session_id}")
+        await release.wait()
+        drain.cancel()
+
+
+async def drain_messages(ws):
+    async for _ in ws:
+        pass
+
+
+async def run_policy(base_url: str, ws_url: str, session_id: str, clients: int, policy: str):
+    delay_for = POLICIES[policy]
+    latencies: list = []
+    arrivals: list = []
+    stop = asyncio.Event()
+    release = asyncio.Event()
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(limits=limits, timeout=120) as http:
+        prober = asyncio.create_task(probe(base_url, stop, latencies))
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(reconnecting_client(
+                base_url, ws_url, session_id, delay_for(), http, arrivals, release
+            ))
+            for _ in range(clients)
+        ]
+        while len(arrivals) < clients and not all(task.done() for task in tasks):
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(1)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        stop.set()
+        await prober
+
+    buckets: dict = {}
+    for arrival in arrivals:
+        bucket = int((arrival - started) * 10)
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    failures = sum(1 for result in results if isinstance(result, Exception))
+    latencies.sort()
+    return {
+        "policy": policy,
+        "clients": clients,
+        "failures": failures,
+        "peak_reconnects_per_100ms": max(buckets.values()),
+        "probe_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "probe_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "probe_max_ms": round(latencies[-1] * 1000, 1),
+    }
+
+
+async def main(args):
+    raise_fd_limit()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}"
+    db_dir = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_PATH=os.path.join(db_dir, "retro.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+    try:
+        await wait_until_up(base_url)
+        async with httpx.AsyncClient() as client:
+            session_id = (await client.post(f"{base_url}/api/session/create")).json()["session_id"]
+            for i in range(args.cards):
+                await client.post(
+                    f"{base_url}/api/session/{session_id}/card",
+                    json={"category": "well", "content": f"Card {i}", "author": "bench"}
+                )
+
+        policies = list(POLICIES) if args.policy == "both" else [args.policy]
+        for policy in policies:
+            report = await run_policy(base_url, ws_url, session_id, args.clients, policy)
+            print(" ".join(f"{key}={value}" for key, value in report.items()))
+            await asyncio.sleep(2)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--policy", choices=["fixed", "jitter", "both"], default="both")
+    asyncio.run(main(parser.parse_args()))
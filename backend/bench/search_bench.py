@@ -0,0 +1,143 @@
+"""Compare FTS5 search against a LIKE scan over a large cards table.
+
+Builds a throwaway database with N synthetic cards spread across boards
+(the FTS index is filled by the same triggers the app uses), then times
+/api/search-style queries through app.database.search_cards next to the
+LIKE '%term%' scan a naive implementation would run.
+
+    python bench/search_bench.py --cards 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app import database  # noqa: E402
+
+CARDS_PER_BOARD = 50
+CATEGORIES = ["well", "badly", "continue", "kudos", "actionables"]
+PHRASES = [
+    "flaky deploys blocked the release",
+    "standup ran long again",
+    "great pairing on the billing migration",
+    "on-call pager fatigue",
+    "staging environment was down",
+]
+QUERIES = [
+    ("rare phrase", "flaky deploys"),
+    ("stemmed", "migrations"),
+    ("common word", "team"),
+    ("two words", "pager fatigue"),
+    ("no match", "zyzzyva"),
+]
+
+
+def vocabulary(size: int):
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    common = ["team", "release", "deploy", "review", "customer", "sprint", "tests"]
+    words = set(common)
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return common + sorted(words - set(common))
+
+
+def build(path: str, cards: int):
+    words = vocabulary(5000)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    rng = random.Random(42)
+    db = sqlite3.connect(path)
+    db.executescript((BACKEND_DIR / "schema.sql").read_text())
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = OFF")
+    boards = max(1, cards // CARDS_PER_BOARD)
+    db.executemany(
+        "INSERT INTO sessions (session_id) VALUES (?)",
+        [(f"b{board:07d}",) for board in range(boards)]
+    )
+
+    def rows():
+        for i in range(cards):
+            content = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(4, 16)))
+            if rng.random() < 0.001:
+                content = f"{rng.choice(PHRASES)} {content}"
+            yield (f"b{i % boards:07d}", rng.choice(CATEGORIES), content, "bench")
+
+    db.executemany(
+        "INSERT INTO cards (session_id, category, content, author) VALUES (?, ?, ?, ?)",
+        rows()
+    )
+    db.commit()
+    db.execute("INSERT INTO cards_fts (cards_fts) VALUES ('optimize')")
+    db.commit()
+    db.close()
+
+
+def like_scan(path: str, term: str, limit: int) -> float:
+    db = sqlite3.connect(path)
+    try:
+        started = time.perf_counter()
+        db.execute(
+            "SELECT id FROM cards WHERE content LIKE ? ORDER BY id LIMIT ?",
+            (f"%{term}%", limit)
+        ).fetchall()
+        return (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+
+async def fts_timings(terms, session_id, limit: int, repeat: int):
+    timings, count = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(await database.search_cards(terms, session_id, limit))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, count
+
+
+async def run(args):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        build(path, args.cards)
+        print(f"built {args.cards} cards in {time.perf_counter() - started:.1f}s "
+              f"({os.path.getsize(path) / 1e6:.0f} MB)")
+        database.DATABASE_PATH = path
+
+        print(f"{'query':<14}{'hits':>6}{'fts p50':>10}{'fts p95':>10}{'like':>10}")
+        cases = [(label, text, None) for label, text in QUERIES]
+        cases.append(("one board", "team", "b0000001"))
+        for label, text, session_id in cases:
+            timings, hits = await fts_timings(text.split(), session_id, args.limit, args.repeat)
+            like_ms = like_scan(path, text, args.limit) if session_id is None else float("nan")
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{label:<14}{hits:>6}{statistics.median(timings):>9.2f}ms{p95:>8.2f}ms{like_ms:>8.1f}ms")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
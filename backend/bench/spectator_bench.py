@@ -0,0 +1,156 @@
+"""Measure what a large audience costs the people editing a board.
+
+Starts the app under uvicorn and connects N viewers to one board, either
+as full participants (/ws/{session_id}) or as spectators
+(/ws/{session_id}/watch). Viewers join over a few seconds while editors
+keep adding cards. Reports editor request latency during the join, how
+long each card took to reach every viewer, and the frames the server sent.
+
+    python bench/spectator_bench.py --viewers 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+BACKEND_DIR = Path(__file__).parent.parent
+ROLES = ("participant", "spectator")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def wait_until_up(base_url: str):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"{base_url}/health")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def viewer(url: str, delay: float, arrivals: dict, frames: list, release: asyncio.Event):
+    await asyncio.sleep(delay)
+    async with websockets.connect(url, open_timeout=120) as ws:
+        async def read():
+            async for message in ws:
+                frames[0] += 1
+                event = json.loads(message)
+                for inner in event["data"] if event["event"] == "batch" else [event]:
+                    if inner["event"] == "card_added":
+                        card_id = inner["data"]["id"]
+                        arrivals[card_id] = max(arrivals.get(card_id, 0), time.perf_counter())
+        reader = asyncio.create_task(read())
+        await release.wait()
+        reader.cancel()
+
+
+async def editor(http: httpx.AsyncClient, session_id: str, name: str, deadline: float, sent: dict, latencies: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await http.post(
+            f"/api/session/{session_id}/card",
+            json={"category": "well", "content": f"Note from {name}", "author": name}
+        )
+        latencies.append(time.perf_counter() - started)
+        if response.status_code == 200:
+            sent[response.json()["id"]] = started
+        await asyncio.sleep(0.2)
+
+
+async def run_role(base_url: str, ws_url: str, role: str, args) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as http:
+        session_id = (await http.post("/api/session/create")).json()["session_id"]
+        path = f"/ws/{session_id}?username=viewer" if role == "participant" else f"/ws/{session_id}/watch"
+        arrivals: dict = {}
+        frames = [0]
+        release = asyncio.Event()
+        viewers = [
+            asyncio.create_task(viewer(
+                f"{ws_url}{path}", random.uniform(0, args.join_window), arrivals, frames, release
+            ))
+            for _ in range(args.viewers)
+        ]
+        sent: dict = {}
+        latencies: list = []
+        deadline = time.perf_counter() + args.join_window + 2
+        await asyncio.gather(*(
+            editor(http, session_id, f"editor{i}", deadline, sent, latencies) for i in range(args.editors)
+        ))
+        await asyncio.sleep(1)
+        release.set()
+        results = await asyncio.gather(*viewers, return_exceptions=True)
+
+    fanout = sorted(arrivals[card_id] - started for card_id, started in sent.items() if card_id in arrivals)
+    latencies.sort()
+    return {
+        "role": role,
+        "viewers": args.viewers,
+        "failures": sum(1 for result in results if isinstance(result, Exception)),
+        "editor_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "editor_max_ms": round(latencies[-1] * 1000, 1),
+        "fanout_p50_ms": round(statistics.median(fanout) * 1000, 1) if fanout else None,
+        "fanout_max_ms": round(fanout[-1] * 1000, 1) if fanout else None,
+        "frames": frames[0],
+    }
+
+
+async def main(args):
+    raise_fd_limit()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}"
+    db_dir = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_PATH=os.path.join(db_dir, "retro.db"),
+        CARD_RATE_LIMIT_PER_SECOND="0",
+        MAX_CARDS_PER_SESSION="100000",
+        LOOP_LAG_SHED_THRESHOLD_MS="0",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+    try:
+        await wait_until_up(base_url)
+        roles = ROLES if args.role == "both" else [args.role]
+        for role in roles:
+            report = await run_role(base_url, ws_url, role, args)
+            print(" ".join(f"{key}={value}" for key, value in report.items()))
+            await asyncio.sleep(1)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=300)
+    parser.add_argument("--editors", type=int, default=10)
+    parser.add_argument("--join-window", type=float, default=5.0)
+    parser.add_argument("--role", choices=ROLES + ("both",), default="both")
+    asyncio.run(main(parser.parse_args()))
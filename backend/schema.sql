@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS cards (
     content TEXT NOT NULL,
     author TEXT NOT NULL,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1,
     FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
 );
 
@@ -22,5 +23,221 @@ CREATE TABLE IF NOT EXISTS actionables (
 );
 
 CREATE INDEX IF NOT EXISTS idx_cards_session_id ON cards(session_id);
+CREATE INDEX IF NOT EXISTS idx_cards_session_category ON cards(session_id, category, id);
 CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
 CREATE INDEX IF NOT EXISTS idx_cards_created_at ON cards(created_at);
+
+CREATE VIEW IF NOT EXISTS open_actionables AS
+SELECT c.id, c.session_id, c.content, c.author, c.created_at
+FROM actionables a
+JOIN cards c ON c.id = a.card_id
+WHERE a.completed = 0;
+
+CREATE TABLE IF NOT EXISTS archived_sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL,
+    last_activity TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    card_count INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_archived_sessions_created_at ON archived_sessions(created_at);
+
+CREATE TABLE IF NOT EXISTS archived_cards (
+    card_id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES archived_sessions(session_id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    author TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    completed BOOLEAN
+);
+
+CREATE INDEX IF NOT EXISTS idx_archived_cards_session_id ON archived_cards(session_id);
+
+CREATE TABLE IF NOT EXISTS votes (
+    card_id INTEGER NOT NULL,
+    voter TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    count INTEGER NOT NULL CHECK(count > 0),
+    PRIMARY KEY (card_id, voter),
+    FOREIGN KEY (card_id) REFERENCES cards(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_votes_session_id ON votes(session_id);
+
+CREATE TABLE IF NOT EXISTS job_leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    status TEXT NOT NULL,
+    detail TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_name ON job_runs(name, id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+    content,
+    session_id,
+    category UNINDEXED,
+    author UNINDEXED,
+    created_at UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards BEGIN
+    DELETE FROM cards_fts WHERE rowid = new.id;
+    INSERT INTO cards_fts (rowid, content, session_id, category, author, created_at)
+    VALUES (new.id, new.content, new.session_id, new.category, new.author, new.created_at);
+END;
+
+CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE OF content ON cards BEGIN
+    UPDATE cards_fts SET content = new.content WHERE rowid = new.id;
+END;
+
+-- Archived sessions keep their search entries until they are purged.
+CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards
+WHEN NOT EXISTS (SELECT 1 FROM archived_sessions WHERE session_id = old.session_id) BEGIN
+    DELETE FROM cards_fts WHERE rowid = old.id;
+END;
+
+-- Board statistics are kept current by the triggers below; session_id '' holds the global totals.
+-- Archiving and rehydrating a board leave them untouched; purging an archived board removes it.
+CREATE TABLE IF NOT EXISTS board_stats (
+    session_id TEXT PRIMARY KEY,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    contributors INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS category_stats (
+    session_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    cards INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (session_id, category)
+);
+
+CREATE TABLE IF NOT EXISTS contributor_stats (
+    session_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    cards INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (session_id, author)
+);
+
+-- Hourly buckets per session, daily buckets for the global row.
+CREATE TABLE IF NOT EXISTS activity_stats (
+    session_id TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    cards INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (session_id, bucket)
+);
+
+INSERT OR IGNORE INTO board_stats (session_id) VALUES ('');
+
+CREATE TRIGGER IF NOT EXISTS stats_session_insert AFTER INSERT ON sessions
+WHEN NOT EXISTS (SELECT 1 FROM archived_sessions WHERE session_id = new.session_id) BEGIN
+    INSERT INTO board_stats (session_id, sessions) VALUES (new.session_id, 1), ('', 1)
+    ON CONFLICT (session_id) DO UPDATE SET sessions = sessions + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_session_delete AFTER DELETE ON sessions
+WHEN NOT EXISTS (SELECT 1 FROM archived_sessions WHERE session_id = old.session_id) BEGIN
+    UPDATE board_stats SET sessions = sessions - 1 WHERE session_id = '';
+    DELETE FROM board_stats WHERE session_id = old.session_id;
+    DELETE FROM category_stats WHERE session_id = old.session_id;
+    DELETE FROM contributor_stats WHERE session_id = old.session_id;
+    DELETE FROM activity_stats WHERE session_id = old.session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_card_insert AFTER INSERT ON cards
+WHEN NOT EXISTS (SELECT 1 FROM archived_sessions WHERE session_id = new.session_id) BEGIN
+    INSERT INTO category_stats (session_id, category, cards)
+    VALUES (new.session_id, new.category, 1), ('', new.category, 1)
+    ON CONFLICT (session_id, category) DO UPDATE SET cards = cards + 1;
+    UPDATE board_stats SET contributors = contributors + 1
+    WHERE session_id IN (new.session_id, '')
+      AND NOT EXISTS (
+          SELECT 1 FROM contributor_stats
+          WHERE contributor_stats.session_id = board_stats.session_id AND author = new.author
+      );
+    INSERT INTO contributor_stats (session_id, author, cards)
+    VALUES (new.session_id, new.author, 1), ('', new.author, 1)
+    ON CONFLICT (session_id, author) DO UPDATE SET cards = cards + 1;
+    INSERT INTO activity_stats (session_id, bucket, cards)
+    VALUES (new.session_id, strftime('%Y-%m-%d %H:00', new.created_at), 1),
+           ('', strftime('%Y-%m-%d', new.created_at), 1)
+    ON CONFLICT (session_id, bucket) DO UPDATE SET cards = cards + 1;
+END;
+
+-- BEFORE so the card's actionables row is still there when a cascade removes both.
+CREATE TRIGGER IF NOT EXISTS stats_card_delete BEFORE DELETE ON cards
+WHEN NOT EXISTS (SELECT 1 FROM archived_sessions WHERE session_id = old.session_id) BEGIN
+    UPDATE category_stats
+    SET cards = cards - 1,
+        completed = completed - COALESCE((SELECT completed FROM actionables WHERE card_id = old.id), 0)
+    WHERE session_id IN (old.session_id, '') AND category = old.category;
+    DELETE FROM category_stats
+    WHERE session_id IN (old.session_id, '') AND category = old.category AND cards <= 0;
+    UPDATE contributor_stats SET cards = cards - 1
+    WHERE session_id IN (old.session_id, '') AND author = old.author;
+    UPDATE board_stats SET contributors = contributors - 1
+    WHERE session_id IN (
+        SELECT session_id FROM contributor_stats
+        WHERE session_id IN (old.session_id, '') AND author = old.author AND cards <= 0
+    );
+    DELETE FROM contributor_stats
+    WHERE session_id IN (old.session_id, '') AND author = old.author AND cards <= 0;
+    UPDATE activity_stats SET cards = cards - 1
+    WHERE (session_id = old.session_id AND bucket = strftime('%Y-%m-%d %H:00', old.created_at))
+       OR (session_id = '' AND bucket = strftime('%Y-%m-%d', old.created_at));
+    DELETE FROM activity_stats WHERE session_id IN (old.session_id, '') AND cards <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_actionable_insert AFTER INSERT ON actionables
+WHEN new.completed AND NOT EXISTS (SELECT 1 FROM archived_cards WHERE card_id = new.card_id) BEGIN
+    UPDATE category_stats SET completed = completed + 1
+    WHERE category = 'actionables'
+      AND session_id IN ((SELECT session_id FROM cards WHERE id = new.card_id), '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_actionable_update AFTER UPDATE OF completed ON actionables
+WHEN new.completed IS NOT old.completed BEGIN
+    UPDATE category_stats SET completed = completed + (CASE WHEN new.completed THEN 1 ELSE -1 END)
+    WHERE category = 'actionables'
+      AND session_id IN ((SELECT session_id FROM cards WHERE id = new.card_id), '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_archived_session_delete AFTER DELETE ON archived_sessions
+WHEN NOT EXISTS (SELECT 1 FROM sessions WHERE session_id = old.session_id) BEGIN
+    UPDATE board_stats SET sessions = sessions - 1 WHERE session_id = '';
+    DELETE FROM board_stats WHERE session_id = old.session_id;
+    DELETE FROM category_stats WHERE session_id = old.session_id;
+    DELETE FROM contributor_stats WHERE session_id = old.session_id;
+    DELETE FROM activity_stats WHERE session_id = old.session_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_archived_card_delete BEFORE DELETE ON archived_cards
+WHEN NOT EXISTS (SELECT 1 FROM sessions WHERE session_id = old.session_id) BEGIN
+    UPDATE category_stats
+    SET cards = cards - 1, completed = completed - COALESCE(old.completed, 0)
+    WHERE session_id = '' AND category = old.category;
+    DELETE FROM category_stats WHERE session_id = '' AND category = old.category AND cards <= 0;
+    UPDATE contributor_stats SET cards = cards - 1 WHERE session_id = '' AND author = old.author;
+    UPDATE board_stats SET contributors = contributors - 1
+    WHERE session_id = '' AND EXISTS (
+        SELECT 1 FROM contributor_stats WHERE session_id = '' AND author = old.author AND cards <= 0
+    );
+    DELETE FROM contributor_stats WHERE session_id = '' AND author = old.author AND cards <= 0;
+    UPDATE activity_stats SET cards = cards - 1
+    WHERE session_id = '' AND bucket = strftime('%Y-%m-%d', old.created_at);
+    DELETE FROM activity_stats WHERE session_id = '' AND cards <= 0;
+END;
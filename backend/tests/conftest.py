@@ -1,6 +1,41 @@
 import pytest
+import os
+import tempfile
+from pathlib import Path
+from httpx import AsyncClient, ASGITransport
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import database, main
 
 
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture
+async def test_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = path
+
+    await database.init_db()
+
+    yield path
+
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(path + suffix)
+        except FileNotFoundError:
+            pass
+    database.DATABASE_PATH = original_path
+
+
+@pytest.fixture
+async def client(test_db):
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
@@ -294,3 +294,173 @@ async def test_card_ordering(client):
     assert data["cards"][0]["id"] == card1["id"]
     assert data["cards"][1]["id"] == card2["id"]
     assert data["cards"][2]["id"] == card3["id"]
+
+
+@pytest.mark.asyncio
+async def test_update_card_bumps_version(client):
+    session_id = "test123"
+    await create_session(session_id)
+    card = await create_card(session_id, "actionables", "Task", "Alice")
+    assert card["version"] == 1
+
+    response = await client.patch(f"/api/card/{card['id']}", json={"completed": True})
+    assert response.json()["version"] == 2
+
+    response = await client.patch(f"/api/card/{card['id']}", json={"content": "Task 2"})
+    assert response.json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_card_updated_broadcast_carries_only_changed_fields(client):
+    from app.main import ws_manager
+
+    session_id = "test123"
+    await create_session(session_id)
+    card = await create_card(session_id, "actionables", "Task", "Alice")
+
+    sent = []
+
+    class Recorder:
+        async def send_json(self, message):
+            sent.append(message)
+
+    ws_manager.active_connections[session_id] = [(Recorder(), "Bob")]
+    try:
+        await client.patch(f"/api/card/{card['id']}", json={"completed": True})
+    finally:
+        ws_manager.active_connections.pop(session_id, None)
+
+    assert sent == [{
+        "event": "card_updated",
+        "data": {"id": card["id"], "version": 2, "completed": True},
+    }]
+
+
+@pytest.mark.asyncio
+async def test_bulk_card_operations(client):
+    session_id = "test123"
+    await create_session(session_id)
+    task1 = await create_card(session_id, "actionables", "Task 1", "Alice")
+    task2 = await create_card(session_id, "actionables", "Task 2", "Alice")
+    note = await create_card(session_id, "well", "Note", "Bob")
+
+    response = await client.post(
+        f"/api/session/{session_id}/cards:bulk",
+        json={"operations": [
+            {"op": "toggle", "card_id": task1["id"], "completed": True},
+            {"op": "toggle", "card_id": task2["id"], "completed": True},
+            {"op": "edit", "card_id": task2["id"], "content": "Task 2 (done)"},
+            {"op": "delete", "card_id": note["id"], "author": "Bob"},
+        ]}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["success"] == True
+    assert [r["status"] for r in data["results"]] == ["ok"] * 4
+    assert {c["id"]: c["version"] for c in data["cards"]} == {task1["id"]: 2, task2["id"]: 2}
+
+    board = (await client.get(f"/api/session/{session_id}")).json()
+    cards = {c["id"]: c for c in board["cards"]}
+    assert note["id"] not in cards
+    assert cards[task1["id"]]["completed"] == True
+    assert cards[task2["id"]]["content"] == "Task 2 (done)"
+
+
+@pytest.mark.asyncio
+async def test_bulk_card_operations_are_atomic(client):
+    session_id = "test123"
+    await create_session(session_id)
+    task = await create_card(session_id, "actionables", "Task", "Alice")
+    note = await create_card(session_id, "well", "Note", "Alice")
+
+    response = await client.post(
+        f"/api/session/{session_id}/cards:bulk",
+        json={"operations": [
+            {"op": "toggle", "card_id": task["id"], "completed": True},
+            {"op": "delete", "card_id": note["id"], "author": "Mallory"},
+            {"op": "edit", "card_id": 9999, "content": "Nope"},
+        ]}
+    )
+    assert response.status_code == 409
+    statuses = [r["status"] for r in response.json()["detail"]["results"]]
+    assert statuses == ["ok", "forbidden", "not_found"]
+
+    board = (await client.get(f"/api/session/{session_id}")).json()
+    cards = {c["id"]: c for c in board["cards"]}
+    assert note["id"] in cards
+    assert cards[task["id"]]["completed"] == False
+    assert cards[task["id"]]["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_board_loads_are_deduplicated(client, monkeypatch):
+    import asyncio
+    from app import main
+    from app.main import board_loads
+
+    session_id = "test123"
+    await create_session(session_id)
+    await create_card(session_id, "well", "Great work", "Alice")
+    before = board_loads.stats()
+
+    responses = await asyncio.gather(
+        *(client.get(f"/api/session/{session_id}") for _ in range(10))
+    )
+    assert all(response.json()["cards"][0]["content"] == "Great work" for response in responses)
+
+    assert (await client.get("/api/metrics")).status_code == 404
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    assert (await client.get("/api/metrics")).status_code == 401
+    response = await client.get("/api/metrics", headers={"X-Admin-Token": "s3cret"})
+    metrics = response.json()["board_loads"]
+    assert metrics["calls"] - before["calls"] == 10
+    assert metrics["deduplicated"] > before["deduplicated"]
+
+
+@pytest.mark.asyncio
+async def test_card_mutations_are_rate_limited(client, monkeypatch):
+    from app import main
+    from app.ratelimit import RateLimiter
+
+    monkeypatch.setattr(main, "card_rate_limiter", RateLimiter(rate=0.1, burst=2))
+    session_id = "test123"
+    await create_session(session_id)
+    card_data = {"category": "well", "content": "Spam", "author": "Bot"}
+
+    statuses = [
+        (await client.post(f"/api/session/{session_id}/card", json=card_data)).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_require_token(client, monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "")
+    assert (await client.get("/api/admin/loop")).status_code == 404
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    assert (await client.get("/api/admin/loop")).status_code == 401
+    assert (await client.get("/api/admin/loop", headers={"X-Admin-Token": "wrong"})).status_code == 401
+
+    response = await client.get("/api/admin/loop", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert "histogram_ms" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_admin_profile_returns_collapsed_stacks(client, monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    response = await client.post(
+        "/api/admin/profile?seconds=0.1&interval_ms=5&format=collapsed",
+        headers={"X-Admin-Token": "s3cret"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.strip().splitlines())
@@ -0,0 +1,77 @@
+import pytest
+import gzip
+import os
+from pathlib import Path
+from httpx import AsyncClient, ASGITransport
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.backup import BackupManager, list_backups, restore
+from app.database import create_session, create_card, get_cards
+
+
+@pytest.fixture
+def backup_dir(tmp_path):
+    return tmp_path / "backups"
+
+
+@pytest.mark.asyncio
+async def test_backup_and_restore_round_trip(test_db, backup_dir):
+    await create_session("bak1")
+    await create_card("bak1", "well", "Saved", "alice")
+
+    manager = BackupManager(str(backup_dir), pages=1, step_sleep=0)
+    result = await manager.backup()
+    assert Path(result["path"]).exists()
+    assert result["steps"] >= 1
+    assert result["compressed_bytes"] < result["database_bytes"]
+    assert manager.stats()["backups"] == 1
+    assert list(backup_dir.iterdir()) == [Path(result["path"])]
+
+    await create_card("bak1", "well", "Lost", "alice")
+    restore(result["path"], test_db)
+    assert [c["content"] for c in await get_cards("bak1")] == ["Saved"]
+
+
+@pytest.mark.asyncio
+async def test_backup_rotation_keeps_newest(test_db, backup_dir):
+    manager = BackupManager(str(backup_dir), keep=2, step_sleep=0)
+    paths = [(await manager.backup())["path"] for _ in range(3)]
+    assert [str(p) for p in list_backups(backup_dir)] == paths[:0:-1]
+    assert len(manager.available()) == 2
+
+
+@pytest.mark.asyncio
+async def test_backup_requires_directory(test_db):
+    manager = BackupManager("")
+    with pytest.raises(RuntimeError):
+        await manager.backup()
+    assert manager.stats()["enabled"] is False
+
+
+@pytest.mark.asyncio
+async def test_restore_rejects_corrupt_backup(test_db, tmp_path):
+    corrupt = tmp_path / "corrupt.db.gz"
+    with gzip.open(corrupt, "wb") as f:
+        f.write(b"not a database" * 100)
+    with pytest.raises(Exception):
+        restore(str(corrupt), test_db)
+    assert not os.path.exists(test_db + ".restoring")
+
+
+@pytest.mark.asyncio
+async def test_admin_backup_endpoint(test_db, backup_dir, monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(main, "backups", BackupManager(str(backup_dir), step_sleep=0))
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"X-Admin-Token": "s3cret"}
+        response = await client.post("/api/admin/backup", headers=headers)
+        assert response.status_code == 200
+        path = response.json()["path"]
+
+        response = await client.get("/api/admin/backups", headers=headers)
+        assert response.status_code == 200
+        assert [f["path"] for f in response.json()["files"]] == [path]
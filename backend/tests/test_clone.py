@@ -0,0 +1,164 @@
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.database import (
+    create_session, create_card, toggle_actionable, clone_cards, get_cards, check_stats,
+    get_open_actionables
+)
+from app.memory_storage import MemoryStorage
+
+
+async def last_sprint(session_id):
+    await create_session(session_id)
+    await create_card(session_id, "well", "Shipped search", "alice")
+    done = await create_card(session_id, "actionables", "Fix flaky test", "alice")
+    await create_card(session_id, "actionables", "Write runbook", "bob")
+    await create_card(session_id, "actionables", "Rotate keys", "carol")
+    await toggle_actionable(done["id"], True)
+
+
+@pytest.mark.asyncio
+async def test_carry_over_open_actionables(test_db):
+    await last_sprint("old")
+    await create_session("new")
+
+    cards = await clone_cards("new", "old", "open_actionables")
+
+    assert [(c["content"], c["author"], c["completed"]) for c in cards] == [
+        ("Write runbook", "bob", 0),
+        ("Rotate keys", "carol", 0),
+    ]
+    assert all(c["session_id"] == "new" and c["category"] == "actionables" for c in cards)
+    assert [c["id"] for c in await get_cards("new")] == [c["id"] for c in cards]
+    assert len(await get_cards("old")) == 4
+    assert await check_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_clone_whole_board(test_db):
+    await last_sprint("old")
+    await create_session("copy")
+    await create_card("copy", "kudos", "Already here", "dave")
+
+    cards = await clone_cards("copy", "old")
+
+    assert [c["content"] for c in cards] == [
+        "Shipped search", "Fix flaky test", "Write runbook", "Rotate keys"
+    ]
+    assert all(not c["completed"] for c in cards if c["category"] == "actionables")
+    assert len(await get_cards("copy")) == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_clone():
+    storage = MemoryStorage()
+    await storage.create_session("old")
+    await storage.create_session("new")
+    await storage.create_card("old", "badly", "Slow reviews", "alice")
+    done = await storage.create_card("old", "actionables", "Pair on reviews", "alice")
+    await storage.create_card("old", "actionables", "Review SLA", "bob")
+    await storage.toggle_actionable(done["id"], True)
+
+    cards = await storage.clone_cards("new", "old", "open_actionables")
+    assert [(c["content"], c["completed"]) for c in cards] == [("Review SLA", False)]
+    assert len(await storage.clone_cards("new", "old")) == 3
+
+
+@pytest.mark.asyncio
+async def test_clone_endpoint_broadcasts_once(client):
+    await last_sprint("sprint1")
+    await create_session("sprint2")
+
+    sent = []
+
+    class Recorder:
+        async def send_json(self, message):
+            sent.append(message)
+
+    main.ws_manager.active_connections["sprint2"] = [(Recorder(), "bob")]
+    try:
+        response = await client.post(
+            "/api/session/sprint2/clone",
+            params={"from": "sprint1", "only": "open_actionables"}
+        )
+    finally:
+        main.ws_manager.active_connections.pop("sprint2", None)
+
+    assert response.status_code == 200
+    cards = response.json()["cards"]
+    assert [card["content"] for card in cards] == ["Write runbook", "Rotate keys"]
+    assert [message["event"] for message in sent] == ["cards_added"]
+    assert sent[0]["data"]["cards"] == cards
+
+
+@pytest.mark.asyncio
+async def test_clone_endpoint_errors(client, monkeypatch):
+    await last_sprint("src")
+    await create_session("dst")
+
+    assert (await client.post("/api/session/dst/clone", params={"from": "missing"})).status_code == 404
+    assert (await client.post("/api/session/missing/clone", params={"from": "src"})).status_code == 404
+    assert (await client.post("/api/session/src/clone", params={"from": "src"})).status_code == 400
+    assert (await client.post("/api/session/dst/clone", params={"from": "src", "only": "all"})).status_code == 422
+
+    monkeypatch.setattr(main, "MAX_CARDS_PER_SESSION", 3)
+    assert (await client.post("/api/session/dst/clone", params={"from": "src"})).status_code == 400
+    response = await client.post("/api/session/dst/clone", params={"from": "src", "only": "open_actionables"})
+    assert response.status_code == 200
+    assert len(await get_cards("dst")) == 2
+
+
+@pytest.mark.asyncio
+async def test_open_actionables_across_boards(test_db):
+    await last_sprint("team-a")
+    await create_session("team-b")
+    await create_card("team-b", "actionables", "Update on-call doc", "dave")
+    await create_card("team-b", "badly", "Pager noise", "dave")
+
+    actionables = await get_open_actionables(["team-a", "team-b", "missing"])
+
+    assert [(a["session_id"], a["content"]) for a in actionables] == [
+        ("team-a", "Write runbook"),
+        ("team-a", "Rotate keys"),
+        ("team-b", "Update on-call doc"),
+    ]
+    assert await get_open_actionables([]) == []
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_open_actionables():
+    storage = MemoryStorage()
+    await storage.create_session("old")
+    await storage.create_card("old", "badly", "Slow reviews", "alice")
+    done = await storage.create_card("old", "actionables", "Pair on reviews", "alice")
+    await storage.create_card("old", "actionables", "Review SLA", "bob")
+    await storage.toggle_actionable(done["id"], True)
+
+    actionables = await storage.get_open_actionables(["old"])
+    assert [(a["content"], a["author"]) for a in actionables] == [("Review SLA", "bob")]
+    assert await storage.get_open_actionables(["missing"]) == []
+
+
+@pytest.mark.asyncio
+async def test_open_actionables_endpoint(client, monkeypatch):
+    await last_sprint("team-a")
+    await create_session("team-b")
+    await create_card("team-b", "actionables", "Update on-call doc", "dave")
+
+    response = await client.get(
+        "/api/actionables/open", params=[("session", "team-b"), ("session", "team-a"), ("session", "missing")]
+    )
+    assert response.status_code == 200
+    assert [a["content"] for a in response.json()["actionables"]] == [
+        "Write runbook", "Rotate keys", "Update on-call doc"
+    ]
+
+    response = await client.get("/api/actionables/open")
+    assert response.status_code == 200
+    assert response.json() == {"actionables": []}
+    too_many = [("session", f"s{i}") for i in range(main.MAX_ACTIONABLE_SESSIONS + 1)]
+    assert (await client.get("/api/actionables/open", params=too_many)).status_code == 400
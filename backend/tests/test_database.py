@@ -17,6 +17,8 @@ from app.database import (
     toggle_actionable,
     delete_card,
     cleanup_old_sessions,
+    archive_idle_sessions,
+    purge_archived_sessions,
     get_db,
 )
 
@@ -293,3 +295,122 @@ async def test_category_constraint(test_db):
             await db.commit()
     finally:
         await db.close()
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_version_column_to_existing_cards(test_db):
+    db = await get_db()
+    try:
+        await db.executescript(
+            """
+            DROP TABLE actionables;
+            DROP TABLE cards;
+            CREATE TABLE cards (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                category TEXT NOT NULL,
+                content TEXT NOT NULL,
+                author TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+        )
+        await db.commit()
+    finally:
+        await db.close()
+
+    await init_db()
+    await create_session("test123")
+    card = await create_card("test123", "well", "Test", "Alice")
+
+    updated = await update_card(card["id"], "Changed")
+    assert updated["version"] == 2
+
+
+async def _backdate_activity(session_id: str, hours: int):
+    db = await get_db()
+    try:
+        await db.execute(
+            "UPDATE sessions SET last_activity = datetime('now', ?) WHERE session_id = ?",
+            (f"-{hours} hours", session_id)
+        )
+        await db.commit()
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_idle_sessions_rehydrates_on_access(test_db):
+    await create_session("idle123")
+    await create_session("busy123")
+    well = await create_card("idle123", "well", "Archived", "Alice")
+    action = await create_card("idle123", "actionables", "Follow up", "Bob")
+    await toggle_actionable(action["id"], True)
+    await update_card(well["id"], "Archived, edited")
+    before = await get_cards("idle123")
+    await _backdate_activity("idle123", 48)
+
+    assert await archive_idle_sessions(hours=24) == 1
+
+    db = await get_db()
+    try:
+        cursor = await db.execute("SELECT COUNT(*) FROM cards WHERE session_id = 'idle123'")
+        assert (await cursor.fetchone())[0] == 0
+        cursor = await db.execute("SELECT card_count FROM archived_sessions WHERE session_id = 'idle123'")
+        assert (await cursor.fetchone())[0] == 2
+    finally:
+        await db.close()
+
+    session = await get_session("idle123")
+    assert session is not None
+    assert await get_cards("idle123") == before
+
+    new_card = await create_card("idle123", "well", "After", "Alice")
+    assert new_card["id"] > action["id"]
+    assert await archive_idle_sessions(hours=24) == 0
+
+
+@pytest.mark.asyncio
+async def test_card_access_rehydrates_archived_session(test_db):
+    await create_session("open123")
+    edit = await create_card("open123", "well", "Edit me", "Alice")
+    action = await create_card("open123", "actionables", "Follow up", "Bob")
+    drop = await create_card("open123", "well", "Drop me", "Alice")
+
+    async def archive():
+        await _backdate_activity("open123", 48)
+        assert await archive_idle_sessions(hours=24) == 1
+
+    await archive()
+    assert (await update_card(edit["id"], "Edited"))["content"] == "Edited"
+    await archive()
+    assert (await toggle_actionable(action["id"], True))["completed"]
+    await archive()
+    assert await delete_card(drop["id"])
+
+    assert [c["content"] for c in await get_cards("open123")] == ["Edited", "Follow up"]
+    db = await get_db()
+    try:
+        cursor = await db.execute("SELECT COUNT(*) FROM archived_cards")
+        assert (await cursor.fetchone())[0] == 0
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_purge_archived_sessions(test_db):
+    db = await get_db()
+    try:
+        old_time = datetime.now() - timedelta(hours=25)
+        await db.execute(
+            "INSERT INTO sessions (session_id, created_at, last_activity) VALUES (?, ?, ?)",
+            ("ancient1", old_time, old_time)
+        )
+        await db.commit()
+    finally:
+        await db.close()
+
+    assert await archive_idle_sessions(hours=1) == 1
+    assert await purge_archived_sessions(hours=24) == 1
+    assert await get_session("ancient1") is None
+
@@ -0,0 +1,121 @@
+import pytest
+import csv
+import io
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import export, main
+from app.database import create_session, create_card, toggle_actionable, get_db, archive_idle_sessions
+from app.export import export_cards, resolve_format
+
+
+@pytest.fixture
+async def client(client, monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    yield client
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+async def seed():
+    await create_session("live")
+    await create_card("live", "well", "Good demo", "alice")
+    action = await create_card("live", "actionables", "Fix alerts", "bob")
+    await toggle_actionable(action["id"], True)
+    await create_session("idle")
+    await create_card("idle", "badly", "Slow builds", "carol")
+    db = await get_db()
+    try:
+        await db.execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours') WHERE session_id = 'idle'")
+        await db.commit()
+    finally:
+        await db.close()
+    assert await archive_idle_sessions(hours=24) == 1
+
+
+@pytest.mark.asyncio
+async def test_csv_export_includes_live_and_archived_cards(test_db, tmp_path):
+    await seed()
+
+    result = export_cards(str(tmp_path), fmt="csv", batch_size=1)
+
+    assert result["rows"] == 3
+    assert result["watermark"] == 3
+    assert Path(result["path"]).name == "cards-1-3.csv"
+    rows = read_csv(result["path"])
+    assert [(r["id"], r["session_id"], r["archived"]) for r in rows] == [
+        ("1", "live", "False"), ("2", "live", "False"), ("3", "idle", "True")
+    ]
+    assert rows[1]["completed"] == "True"
+    assert rows[0]["completed"] == ""
+    assert list(tmp_path.glob("*.partial")) == []
+
+
+@pytest.mark.asyncio
+async def test_watermark_exports_only_new_cards(test_db, tmp_path):
+    await seed()
+    first = export_cards(str(tmp_path), fmt="csv")
+
+    assert export_cards(str(tmp_path), since=first["watermark"], fmt="csv")["path"] is None
+    await create_card("live", "kudos", "Thanks for the reviews", "dave")
+    second = export_cards(str(tmp_path), since=first["watermark"], fmt="csv")
+    assert [r["content"] for r in read_csv(second["path"])] == ["Thanks for the reviews"]
+    assert second["watermark"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cli_keeps_watermark_in_state_file(test_db, tmp_path):
+    await seed()
+    state = tmp_path / "watermark"
+    args = ["--database", test_db, "--dir", str(tmp_path), "--format", "csv", "--state", str(state)]
+
+    assert export.main(args) == 0
+    assert state.read_text() == "3\n"
+    assert export.main(args) == 0
+    assert sorted(p.name for p in tmp_path.glob("cards-*")) == ["cards-1-3.csv"]
+
+
+def test_format_falls_back_to_csv_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(export, "pyarrow", None)
+    assert resolve_format("parquet") == "csv"
+    assert resolve_format() == "csv"
+    with pytest.raises(ValueError):
+        resolve_format("xlsx")
+
+
+@pytest.mark.asyncio
+async def test_arrow_formats_write_row_groups(test_db, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+    await seed()
+
+    result = export_cards(str(tmp_path), fmt="parquet", batch_size=2)
+    parquet = pyarrow.parquet.ParquetFile(result["path"])
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column("id").to_pylist() == [1, 2, 3]
+
+    result = export_cards(str(tmp_path / "ipc"), fmt="arrow")
+    with pyarrow.ipc.open_file(result["path"]) as reader:
+        assert reader.read_all().num_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint(client):
+    await seed()
+
+    assert (await client.get("/api/admin/export")).status_code == 401
+    headers = {"X-Admin-Token": "s3cret"}
+    response = await client.get("/api/admin/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["x-export-watermark"] == "3"
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(list(csv.DictReader(io.StringIO(response.text)))) == 3
+
+    response = await client.get("/api/admin/export", params={"since": 3, "format": "csv"}, headers=headers)
+    assert response.status_code == 204
+    assert response.headers["x-export-rows"] == "0"
@@ -0,0 +1,99 @@
+import pytest
+import asyncio
+from pathlib import Path
+from httpx import AsyncClient, ASGITransport
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.jobs import JobScheduler
+from app.memory_storage import MemoryStorage
+from app.storage import SQLiteStorage
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_runs_a_leased_job(test_db):
+    storage = SQLiteStorage()
+    calls = []
+
+    async def cleanup():
+        calls.append(1)
+        return {"deleted": 0}
+
+    workers = [JobScheduler(storage, owner=f"worker-{i}") for i in range(3)]
+    for worker in workers:
+        worker.add("cleanup", 60, cleanup)
+
+    ran = await asyncio.gather(*(worker.run_once(worker.jobs["cleanup"]) for worker in workers))
+    assert sum(ran) == 1
+    assert len(calls) == 1
+
+    leader = workers[ran.index(True)]
+    assert await leader.run_once(leader.jobs["cleanup"]) is True
+    follower = workers[ran.index(False)]
+    assert await follower.run_once(follower.jobs["cleanup"]) is False
+    assert follower.jobs["cleanup"].skipped == 2
+
+    runs = await storage.get_job_runs(name="cleanup")
+    assert [run["owner"] for run in runs] == [leader.owner, leader.owner]
+    assert runs[0]["status"] == "ok"
+    assert runs[0]["detail"] == '{"deleted": 0}'
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_fails_over(test_db):
+    storage = SQLiteStorage()
+    assert await storage.acquire_job_lease("backup", "a", ttl=-1) is True
+    assert await storage.acquire_job_lease("backup", "b", ttl=60) is True
+    assert await storage.acquire_job_lease("backup", "a", ttl=60) is False
+    leases = await storage.get_job_leases()
+    assert [(lease["name"], lease["owner"]) for lease in leases] == [("backup", "b")]
+
+
+@pytest.mark.asyncio
+async def test_failed_and_idle_runs():
+    storage = MemoryStorage()
+    scheduler = JobScheduler(storage, owner="solo")
+
+    async def broken():
+        raise RuntimeError("disk full")
+
+    async def nothing_to_do():
+        return None
+
+    scheduler.add("broken", 10, broken)
+    scheduler.add("quiet", 10, nothing_to_do)
+    scheduler.add("disabled", 0, nothing_to_do)
+    assert set(scheduler.jobs) == {"broken", "quiet"}
+
+    await scheduler.run_once(scheduler.jobs["broken"])
+    await scheduler.run_once(scheduler.jobs["quiet"])
+
+    stats = scheduler.stats()
+    assert stats["broken"]["failures"] == 1
+    assert stats["broken"]["last_run"]["detail"] == "RuntimeError: disk full"
+    assert stats["quiet"]["idle"] == 1
+    runs = await storage.get_job_runs()
+    assert [(run["name"], run["status"]) for run in runs] == [("broken", "error")]
+
+
+def test_next_delay_is_jittered():
+    scheduler = JobScheduler(MemoryStorage(), jitter=0.2)
+    delays = {scheduler.next_delay(100) for _ in range(50)}
+    assert len(delays) > 1
+    assert all(80 <= delay <= 120 for delay in delays)
+
+
+@pytest.mark.asyncio
+async def test_admin_jobs_endpoint(test_db, monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    await main.jobs.run_once(main.jobs.jobs["cleanup"])
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/admin/jobs", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["owner"] == main.jobs.owner
+    assert data["runs"][0]["name"] == "cleanup"
+    assert [lease["name"] for lease in data["leases"]] == ["cleanup"]
@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+import time
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.loop_monitor import LoopMonitor
+
+
+def blocking_helper(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_record_fills_histogram():
+    monitor = LoopMonitor(shed_threshold=0)
+
+    await monitor.record(0.0005)
+    await monitor.record(0.03)
+    await monitor.record(5)
+
+    histogram = monitor.histogram_ms()
+    assert histogram["le_1"] == 1
+    assert histogram["le_50"] == 1
+    assert histogram["inf"] == 1
+    assert monitor.stats()["max_lag_ms"] == 5000
+
+
+@pytest.mark.asyncio
+async def test_overload_mode_turns_on_and_recovers():
+    monitor = LoopMonitor(shed_threshold=0.2)
+    recovered = []
+
+    async def on_recover():
+        recovered.append(True)
+
+    monitor.recover_callbacks.append(on_recover)
+
+    await monitor.record(0.3)
+    assert monitor.should_shed("presence") == True
+
+    await monitor.record(0.15)
+    assert monitor.overloaded == True
+
+    await monitor.record(0.05)
+    assert monitor.should_shed("presence") == False
+    assert recovered == [True]
+    assert monitor.stats()["shed"] == {"presence": 1}
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_blocking_stack():
+    monitor = LoopMonitor(interval=0.02, shed_threshold=0, block_threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    blocking_helper(0.3)
+    await asyncio.sleep(0.05)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stalls = [event for event in monitor.events if event["kind"] == "blocked_loop"]
+    assert len(stalls) == 1
+    assert any("blocking_helper" in line for line in stalls[0]["stack"])
+    assert stalls[0]["blocked_ms"] >= 200
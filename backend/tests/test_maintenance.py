@@ -0,0 +1,95 @@
+import pytest
+import asyncio
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import database
+from app.database import create_session, create_card, get_db
+from app.jobs import JobScheduler
+from app.maintenance import DatabaseMaintenance
+from app.storage import SQLiteStorage
+
+
+@pytest.fixture
+async def keep_open(test_db):
+    # SQLite checkpoints and removes the WAL when the last connection closes.
+    db = await get_db()
+    yield db
+    await db.close()
+
+
+async def fill_wal(session_id: str, count: int = 50):
+    await create_session(session_id)
+    for i in range(count):
+        await create_card(session_id, "well", "x" * 500 + str(i), "alice")
+
+
+@pytest.mark.asyncio
+async def test_get_db_applies_pragmas(test_db, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_CACHE_SIZE", -4096)
+    monkeypatch.setattr(database, "SQLITE_MMAP_SIZE", 1 << 20)
+    db = await get_db()
+    try:
+        assert (await (await db.execute("PRAGMA synchronous")).fetchone())[0] == 1
+        assert (await (await db.execute("PRAGMA cache_size")).fetchone())[0] == -4096
+        assert (await (await db.execute("PRAGMA mmap_size")).fetchone())[0] == 1 << 20
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_truncate_checkpoint_empties_wal(keep_open):
+    await fill_wal("wal1")
+    maintenance = DatabaseMaintenance()
+    assert await maintenance.wal_size() > 0
+
+    result = await maintenance.checkpoint("TRUNCATE")
+    assert result["busy"] is False
+    assert result["checkpointed_frames"] == result["log_frames"]
+    assert result["wal_bytes_after"] == 0
+    assert maintenance.stats()["checkpoints"] == {"TRUNCATE": 1}
+
+    with pytest.raises(ValueError):
+        await maintenance.checkpoint("BOGUS")
+
+
+@pytest.mark.asyncio
+async def test_scheduled_tick_truncates_above_threshold_and_optimizes(keep_open):
+    await fill_wal("wal2")
+    maintenance = DatabaseMaintenance(
+        checkpoint_interval=0,
+        truncate_threshold=1,
+        optimize_interval=0.01
+    )
+    scheduler = JobScheduler(SQLiteStorage(), owner="worker-1")
+    scheduler.add("db_maintenance", maintenance.poll_interval, maintenance.tick)
+    job = scheduler.jobs["db_maintenance"]
+    await asyncio.sleep(0.02)
+
+    assert await scheduler.run_once(job) is True
+    stats = maintenance.stats()
+    assert stats["checkpoints"] == {"TRUNCATE": 1}
+    assert stats["optimize_runs"] == 1
+    assert stats["wal_bytes"] == 0
+    assert stats["errors"] == 0
+    assert job.last_run["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_scheduled_tick_failures_are_counted(keep_open, monkeypatch):
+    await fill_wal("wal3")
+    maintenance = DatabaseMaintenance(truncate_threshold=1)
+    scheduler = JobScheduler(SQLiteStorage(), owner="worker-1")
+    scheduler.add("db_maintenance", maintenance.poll_interval, maintenance.tick)
+    job = scheduler.jobs["db_maintenance"]
+
+    async def broken(mode):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(maintenance, "checkpoint", broken)
+    assert await scheduler.run_once(job) is True
+    assert maintenance.stats()["errors"] == 1
+    assert job.failures == 1
+    assert job.last_run["detail"] == "RuntimeError: database is locked"
@@ -0,0 +1,198 @@
+import pytest
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from httpx import AsyncClient, ASGITransport
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.memory_storage import MemoryStorage
+from app.storage import SQLiteStorage, create_storage
+
+
+@pytest.fixture
+def storage():
+    return MemoryStorage()
+
+
+@pytest.fixture
+async def client(monkeypatch, storage):
+    monkeypatch.setattr(main, "storage", storage)
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+def test_create_storage_selects_backend():
+    assert isinstance(create_storage("sqlite"), SQLiteStorage)
+    assert isinstance(create_storage("memory"), MemoryStorage)
+    with pytest.raises(ValueError):
+        create_storage("postgres")
+
+
+@pytest.mark.asyncio
+async def test_session_and_card_lifecycle(storage):
+    await storage.create_session("mem1")
+    with pytest.raises(ValueError):
+        await storage.create_session("mem1")
+
+    card = await storage.create_card("mem1", "actionables", "Do it", "alice")
+    assert card["completed"] is False
+    assert card["version"] == 1
+
+    updated = await storage.toggle_actionable(card["id"], True)
+    assert updated["completed"] is True
+    assert updated["version"] == 2
+
+    other = await storage.create_card("mem1", "well", "Nice", "bob")
+    assert other["completed"] is None
+    cards = await storage.get_cards("mem1")
+    assert [c["id"] for c in cards] == [card["id"], other["id"]]
+
+    sessions = await storage.get_all_sessions()
+    assert sessions[0]["card_count"] == 2
+
+    assert await storage.delete_card(other["id"]) is True
+    assert await storage.delete_card(other["id"]) is False
+    assert len(await storage.get_cards("mem1")) == 1
+
+
+@pytest.mark.asyncio
+async def test_apply_card_operations_rolls_back(storage):
+    await storage.create_session("mem2")
+    card = await storage.create_card("mem2", "well", "Before", "alice")
+    other = await storage.create_card("mem2", "well", "Keep", "bob")
+
+    outcome = await storage.apply_card_operations("mem2", [
+        {"op": "edit", "card_id": card["id"], "content": "After"},
+        {"op": "delete", "card_id": other["id"], "author": "bob"},
+        {"op": "delete", "card_id": 9999, "author": "bob"},
+    ])
+    assert outcome["applied"] is False
+    assert [r["status"] for r in outcome["results"]] == ["ok", "ok", "not_found"]
+
+    cards = await storage.get_cards("mem2")
+    assert [(c["id"], c["content"], c["version"]) for c in cards] == [
+        (card["id"], "Before", 1),
+        (other["id"], "Keep", 1),
+    ]
+
+    outcome = await storage.apply_card_operations("mem2", [
+        {"op": "edit", "card_id": card["id"], "content": "After"},
+        {"op": "edit", "card_id": card["id"], "content": "Again"},
+        {"op": "delete", "card_id": other["id"], "author": "bob"},
+    ])
+    assert outcome["applied"] is True
+    assert outcome["changed"] == {card["id"]: ["content"]}
+    assert outcome["deleted"] == [other["id"]]
+    assert outcome["cards"][0]["version"] == 2
+    assert [c["content"] for c in await storage.get_cards("mem2")] == ["Again"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_old_sessions_removes_cards(storage):
+    await storage.create_session("old")
+    await storage.create_card("old", "well", "Stale", "alice")
+    await storage.create_session("new")
+    storage.sessions["old"]["created_at"] -= timedelta(hours=48)
+
+    assert await storage.cleanup_old_sessions(hours=24) == 1
+    assert await storage.get_session("old") is None
+    assert storage.cards == {}
+    assert await storage.get_session("new") is not None
+
+
+@pytest.mark.asyncio
+async def test_archive_idle_sessions_rehydrates(storage):
+    await storage.create_session("idle")
+    card = await storage.create_card("idle", "actionables", "Later", "alice")
+    await storage.toggle_actionable(card["id"], True)
+    before = await storage.get_cards("idle")
+    storage.sessions["idle"]["last_activity"] -= timedelta(hours=48)
+
+    assert await storage.archive_idle_sessions(hours=24) == 1
+    assert "idle" not in storage.sessions
+    assert storage.cards == {}
+
+    assert (await storage.get_session("idle"))["session_id"] == "idle"
+    assert await storage.get_cards("idle") == before
+    assert storage.archived == {}
+
+    storage.sessions["idle"]["last_activity"] -= timedelta(hours=48)
+    storage.sessions["idle"]["created_at"] -= timedelta(hours=48)
+    await storage.archive_idle_sessions(hours=24)
+    assert await storage.purge_archived_sessions(hours=24) == 1
+    assert await storage.get_session("idle") is None
+
+
+@pytest.mark.asyncio
+async def test_card_access_rehydrates_archived_board(storage):
+    await storage.create_session("cold")
+    edit = await storage.create_card("cold", "well", "Edit me", "alice")
+    drop = await storage.create_card("cold", "well", "Drop me", "alice")
+
+    async def archive():
+        storage.sessions["cold"]["last_activity"] -= timedelta(hours=48)
+        assert await storage.archive_idle_sessions(hours=24) == 1
+
+    await archive()
+    assert (await storage.update_card(edit["id"], "Edited"))["content"] == "Edited"
+    await archive()
+    assert await storage.delete_card(drop["id"])
+    await archive()
+    await storage.save_votes([{"session_id": "cold", "card_id": edit["id"], "voter": "bob", "count": 1}])
+
+    assert await storage.get_votes("cold") == [{"card_id": edit["id"], "voter": "bob", "count": 1}]
+    assert [c["content"] for c in await storage.get_cards("cold")] == ["Edited"]
+    assert storage.archived == {} and storage.archived_cards == {}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip():
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.unlink(path)
+    try:
+        first = MemoryStorage(snapshot_path=path, snapshot_interval=0)
+        await first.init()
+        await first.create_session("snap")
+        card = await first.create_card("snap", "actionables", "Persist me", "alice")
+        await first.close()
+
+        second = MemoryStorage(snapshot_path=path, snapshot_interval=0)
+        await second.init()
+        session = await second.get_session("snap")
+        assert session["created_at"] == (await first.get_session("snap"))["created_at"]
+        assert await second.get_cards("snap") == await first.get_cards("snap")
+        next_card = await second.create_card("snap", "actionables", "Next", "alice")
+        assert next_card["id"] == card["id"] + 1
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+@pytest.mark.asyncio
+async def test_api_runs_on_memory_backend(client, storage):
+    response = await client.post("/api/session/create")
+    session_id = response.json()["session_id"]
+    assert session_id in storage.sessions
+
+    response = await client.post(
+        f"/api/session/{session_id}/card",
+        json={"category": "well", "content": "In memory", "author": "alice"}
+    )
+    assert response.status_code == 200
+    card_id = response.json()["id"]
+
+    response = await client.get(f"/api/session/{session_id}")
+    assert response.status_code == 200
+    assert [c["content"] for c in response.json()["cards"]] == ["In memory"]
+
+    response = await client.delete(f"/api/card/{card_id}", params={"author": "bob"})
+    assert response.status_code == 403
+    response = await client.delete(f"/api/card/{card_id}", params={"author": "alice"})
+    assert response.status_code == 200
+    assert storage.cards == {}
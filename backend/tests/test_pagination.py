@@ -0,0 +1,97 @@
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.database import create_session, create_card, get_card_pages, toggle_actionable
+from app.memory_storage import MemoryStorage
+
+
+async def big_board(storage_create_card, session_id, per_category=7):
+    for i in range(per_category):
+        for category in ("well", "badly", "actionables"):
+            await storage_create_card(session_id, category, f"{category} {i}", "alice")
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_id_order_within_a_category(test_db):
+    await create_session("big")
+    await big_board(create_card, "big")
+    done = (await get_card_pages("big", ["actionables"], 1))["actionables"][0]
+    await toggle_actionable(done["id"], True)
+
+    pages = await get_card_pages("big", ["well", "actionables", "kudos"], 3)
+    assert [c["content"] for c in pages["well"]] == ["well 0", "well 1", "well 2"]
+    assert pages["actionables"][0]["completed"] == 1
+    assert pages["kudos"] == []
+
+    after = pages["well"][-1]["id"]
+    rest = (await get_card_pages("big", ["well"], 10, after))["well"]
+    assert [c["content"] for c in rest] == [f"well {i}" for i in range(3, 7)]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_pages():
+    storage = MemoryStorage()
+    await storage.create_session("big")
+    await big_board(storage.create_card, "big")
+
+    pages = await storage.get_card_pages("big", ["badly", "kudos"], 2)
+    assert [c["content"] for c in pages["badly"]] == ["badly 0", "badly 1"]
+    assert pages["kudos"] == []
+    rest = await storage.get_card_pages("big", ["badly"], 10, pages["badly"][-1]["id"])
+    assert [c["content"] for c in rest["badly"]] == [f"badly {i}" for i in range(2, 7)]
+
+
+@pytest.mark.asyncio
+async def test_card_page_endpoint_walks_a_column(client):
+    await create_session("big")
+    await big_board(create_card, "big")
+
+    seen = []
+    after = 0
+    while after is not None:
+        response = await client.get(
+            "/api/session/big/cards", params={"category": "well", "after": after, "limit": 3}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(card["content"] for card in page["cards"])
+        after = page["next_after"]
+    assert seen == [f"well {i}" for i in range(7)]
+
+    assert (await client.get("/api/session/missing/cards", params={"category": "well"})).status_code == 404
+    assert (await client.get("/api/session/big/cards", params={"category": "nope"})).status_code == 422
+    assert (await client.get("/api/session/big/cards", params={"category": "well", "limit": 0})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_board_load_can_return_first_page_per_column(client):
+    await create_session("big")
+    await big_board(create_card, "big")
+
+    full = (await client.get("/api/session/big")).json()
+    assert len(full["cards"]) == 21
+    assert full["next_after"] is None
+
+    paged = (await client.get("/api/session/big", params={"per_column": 5})).json()
+    assert len(paged["cards"]) == 15
+    assert paged["next_after"]["kudos"] is None
+    last_well = [c for c in paged["cards"] if c["category"] == "well"][-1]
+    assert paged["next_after"]["well"] == last_well["id"]
+
+    exact = (await client.get("/api/session/big", params={"per_column": 7})).json()
+    assert set(exact["next_after"].values()) == {None}
+
+
+@pytest.mark.asyncio
+async def test_card_cap_uses_board_statistics(client, monkeypatch):
+    await create_session("capped")
+    monkeypatch.setattr(main, "MAX_CARDS_PER_SESSION", 2)
+    card = {"category": "well", "content": "More", "author": "alice"}
+
+    for _ in range(2):
+        assert (await client.post("/api/session/capped/card", json=card)).status_code == 200
+    assert (await client.post("/api/session/capped/card", json=card)).status_code == 400
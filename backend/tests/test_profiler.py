@@ -0,0 +1,51 @@
+import pytest
+import asyncio
+import time
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.profiler import SamplingProfiler
+
+
+def busy_work():
+    deadline = time.perf_counter() + 0.02
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def busy_loop():
+    while True:
+        busy_work()
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_profile_attributes_loop_samples_to_task():
+    profiler = SamplingProfiler()
+    worker = asyncio.create_task(busy_loop(), name="busy-task")
+    try:
+        result = await profiler.profile(seconds=0.3, interval=0.005)
+    finally:
+        worker.cancel()
+
+    assert result["samples"] > 10
+    assert "busy_work" in result["collapsed"]
+    assert "busy-task" in result["tasks"]
+    assert result["tasks"]["busy-task"]["cpu_ms"] > 0
+    assert "busy-task;test_profiler:busy_loop" in result["tasks_collapsed"]
+    for line in result["collapsed"].splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_profile_rejects_concurrent_runs():
+    profiler = SamplingProfiler()
+    first = asyncio.create_task(profiler.profile(seconds=0.2, interval=0.01))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(RuntimeError):
+        await profiler.profile(seconds=0.1, interval=0.01)
+    await first
@@ -0,0 +1,38 @@
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.ratelimit import TokenBucket, RateLimiter
+
+
+def test_token_bucket_allows_burst_then_limits():
+    bucket = TokenBucket(rate=1, capacity=3, now=0)
+
+    assert [bucket.take(0) for _ in range(3)] == [0, 0, 0]
+    assert bucket.take(0) == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=2, capacity=2, now=0)
+    bucket.take(0)
+    bucket.take(0)
+
+    assert bucket.take(0.25) == pytest.approx(0.25)
+    assert bucket.take(0.5) == 0
+
+
+def test_rate_limiter_tracks_clients_separately():
+    limiter = RateLimiter(rate=1, burst=1)
+
+    assert limiter.check("10.0.0.1") == 0
+    assert limiter.check("10.0.0.1") > 0
+    assert limiter.check("10.0.0.2") == 0
+    assert limiter.stats() == {"allowed": 2, "limited": 1, "clients": 2}
+
+
+def test_rate_limiter_disabled_with_zero_rate():
+    limiter = RateLimiter(rate=0, burst=1)
+
+    assert all(limiter.check("10.0.0.1") == 0 for _ in range(100))
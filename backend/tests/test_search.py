@@ -0,0 +1,213 @@
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import database
+from app.database import (
+    init_db,
+    create_session,
+    create_card,
+    update_card,
+    delete_card,
+    cleanup_old_sessions,
+    archive_idle_sessions,
+    purge_archived_sessions,
+    get_db,
+)
+from app.memory_storage import MemoryStorage
+from app.search import SEARCH_WINDOW, decode_cursor, encode_cursor, fts_query, search_terms
+
+
+async def search_ids(client, **params):
+    response = await client.get("/api/search", params=params)
+    assert response.status_code == 200
+    return [result["id"] for result in response.json()["results"]]
+
+
+def test_fts_query_quotes_terms():
+    assert search_terms('Flaky "deploys" OR-NOT') == ["flaky", "deploys", "or", "not"]
+    assert fts_query(["flaky", "deploys"]) == '{content} : ("flaky" AND "deploys")'
+    assert fts_query(["x"], 'a"b') == '{session_id} : "a""b" AND {content} : ("x")'
+    assert decode_cursor(encode_cursor(-1.5, 42, 50)) == (-1.5, 42, 50)
+    with pytest.raises(ValueError):
+        decode_cursor("garbage!")
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_snippets(client):
+    await create_session("s1")
+    await create_session("s2")
+    exact = await create_card("s1", "badly", "Flaky deploys blocked the release", "alice")
+    await create_card("s1", "well", "Pairing went great", "bob")
+    other = await create_card("s2", "badly", "Deploy pipeline is flaky and flaky again", "carol")
+
+    response = await client.get("/api/search", params={"q": "flaky deploy"})
+    results = response.json()["results"]
+    assert {r["id"] for r in results} == {exact["id"], other["id"]}
+    assert results[0]["score"] <= results[1]["score"]
+    assert "[Flaky]" in next(r["snippet"] for r in results if r["id"] == exact["id"])
+
+    assert await search_ids(client, q="flaky", session="s2") == [other["id"]]
+    assert await search_ids(client, q="deploys blocked", session="s2") == []
+    assert await search_ids(client, q="pairing") != []
+    assert await search_ids(client, q="???") == []
+
+
+@pytest.mark.asyncio
+async def test_search_keyset_pagination(client):
+    await create_session("page1")
+    ids = [
+        (await create_card("page1", "well", f"retro note {i}", "alice"))["id"]
+        for i in range(7)
+    ]
+
+    seen = []
+    after = None
+    while True:
+        params = {"q": "retro", "limit": 3}
+        if after:
+            params["after"] = after
+        response = await client.get("/api/search", params=params)
+        data = response.json()
+        seen.extend(r["id"] for r in data["results"])
+        after = data["next"]
+        if not after:
+            break
+    assert sorted(seen) == ids
+    assert len(seen) == len(set(seen))
+
+    response = await client.get("/api/search", params={"q": "retro", "after": "nope"})
+    assert response.status_code == 400
+
+
+async def walk(client, q, limit):
+    seen, pages, after = [], [], None
+    while True:
+        params = {"q": q, "limit": limit}
+        if after:
+            params["after"] = after
+        data = (await client.get("/api/search", params=params)).json()
+        pages.append(data)
+        seen.extend(r["id"] for r in data["results"])
+        after = data["next"]
+        if not after:
+            return seen, pages
+        if len(pages) == 1:
+            await create_card("busy", "well", "deploy again", "bob")
+
+
+@pytest.mark.asyncio
+async def test_search_pages_through_every_match(client):
+    await create_session("busy")
+    db = await get_db()
+    try:
+        await db.executemany(
+            "INSERT INTO cards (session_id, category, content, author) VALUES ('busy', 'well', ?, 'alice')",
+            [(f"deploy {'note ' * (i % 9)}{i}",) for i in range(700)]
+        )
+        await db.commit()
+        cursor = await db.execute("SELECT id FROM cards WHERE session_id = 'busy'")
+        ids = sorted(row["id"] for row in await cursor.fetchall())
+    finally:
+        await db.close()
+
+    seen, pages = await walk(client, "deploy", 100)
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == ids
+    newest = [r for page in pages for r in page["results"] if r["id"] > ids[-1] - SEARCH_WINDOW]
+    assert [r["score"] for r in newest] == sorted(r["score"] for r in newest)
+
+
+@pytest.mark.asyncio
+async def test_index_follows_edits_deletes_and_archive(client):
+    await create_session("sync1")
+    card = await create_card("sync1", "well", "kubernetes upgrade", "alice")
+    gone = await create_card("sync1", "well", "kubernetes outage", "alice")
+
+    await update_card(card["id"], "terraform upgrade")
+    await delete_card(gone["id"])
+    assert await search_ids(client, q="kubernetes") == []
+    assert await search_ids(client, q="terraform") == [card["id"]]
+
+    db = await get_db()
+    try:
+        old_time = datetime.now() - timedelta(hours=48)
+        await db.execute(
+            "UPDATE sessions SET created_at = ?, last_activity = datetime('now', '-48 hours')",
+            (old_time,)
+        )
+        await db.commit()
+    finally:
+        await db.close()
+
+    assert await archive_idle_sessions(hours=24) == 1
+    assert await search_ids(client, q="terraform") == [card["id"]]
+    assert await purge_archived_sessions(hours=24) == 1
+    assert await search_ids(client, q="terraform") == []
+
+
+@pytest.mark.asyncio
+async def test_cleanup_removes_search_entries(client):
+    db = await get_db()
+    try:
+        old_time = datetime.now() - timedelta(hours=25)
+        await db.execute(
+            "INSERT INTO sessions (session_id, created_at) VALUES (?, ?)",
+            ("stale1", old_time)
+        )
+        await db.commit()
+    finally:
+        await db.close()
+    await create_card("stale1", "well", "forgotten idea", "alice")
+
+    assert await cleanup_old_sessions(hours=24) == 1
+    assert await search_ids(client, q="forgotten") == []
+
+
+@pytest.mark.asyncio
+async def test_init_db_builds_index_for_existing_cards(test_db):
+    await create_session("legacy")
+    card = await create_card("legacy", "well", "legacy content", "alice")
+    db = await get_db()
+    try:
+        await db.executescript(
+            """
+            DROP TRIGGER cards_fts_insert;
+            DROP TRIGGER cards_fts_update;
+            DROP TRIGGER cards_fts_delete;
+            DROP TABLE cards_fts;
+            """
+        )
+    finally:
+        await db.close()
+
+    await init_db()
+    results = await database.search_cards(["legacy"])
+    assert [r["id"] for r in results] == [card["id"]]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_search():
+    storage = MemoryStorage()
+    await storage.create_session("m1")
+    card = await storage.create_card("m1", "badly", "Flaky deploys again", "alice")
+    await storage.create_card("m1", "well", "Nice demo", "bob")
+
+    results = await storage.search_cards(["flaky", "depl"])
+    assert [r["id"] for r in results] == [card["id"]]
+    assert results[0]["snippet"] == "[Flaky] [deploys] again"
+    after = (results[0]["score"], card["id"], results[0]["ceiling"])
+    assert await storage.search_cards(["flaky", "depl"], after=after) == []
+
+    ids = [(await storage.create_card("m1", "well", f"standup {i}", "alice"))["id"] for i in range(600)]
+    seen, after = [], None
+    while True:
+        page = await storage.search_cards(["standup"], limit=100, after=after)
+        if not page:
+            break
+        seen.extend(r["id"] for r in page)
+        after = (page[-1]["score"], page[-1]["id"], page[-1]["ceiling"])
+    assert seen != [] and sorted(seen) == sorted(set(seen)) == ids
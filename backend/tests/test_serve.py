@@ -0,0 +1,105 @@
+import pytest
+import json
+import os
+import socket
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import database, serve
+from app.serve import prepare, prewarm_file, server_config
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_config_defaults_and_overrides():
+    config = server_config({})
+    assert config["workers"] == 1
+    assert config["limit_concurrency"] is None
+    assert config["loop"] in ("uvloop", "asyncio")
+    assert config["http"] in ("httptools", "h11")
+
+    config = server_config({
+        "PORT": "9000",
+        "WEB_CONCURRENCY": "4",
+        "SERVER_BACKLOG": "8192",
+        "SERVER_KEEPALIVE_SECONDS": "75",
+        "SERVER_LIMIT_CONCURRENCY": "6000",
+        "SERVER_WS_MAX_SIZE": "4096",
+        "SERVER_WS_PING_INTERVAL_SECONDS": "0",
+    })
+    assert config["port"] == 9000
+    assert config["workers"] == 4
+    assert config["backlog"] == 8192
+    assert config["timeout_keep_alive"] == 75
+    assert config["limit_concurrency"] == 6000
+    assert config["ws_max_size"] == 4096
+    assert config["ws_ping_interval"] is None
+
+
+def test_prewarm_reads_at_most_the_limit(tmp_path):
+    path = tmp_path / "data.db"
+    path.write_bytes(b"x" * 3 * 1024 * 1024)
+    assert prewarm_file(str(path), 2 * 1024 * 1024 + 5) == 2 * 1024 * 1024 + 5
+    assert prewarm_file(str(path), 0) == 0
+    assert prewarm_file(str(tmp_path / "missing.db"), 1024) == 0
+
+
+@pytest.mark.asyncio
+async def test_prepare_migrates_before_workers_start(test_db):
+    result = await prepare(prewarm_mb=1)
+    assert result["warmed_bytes"] > 0
+    assert await database.check_stats() == {}
+
+
+def test_memory_backend_refuses_several_workers(monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    assert serve.main() == 1
+
+
+def test_entry_point_serves_and_reports_startup(tmp_path):
+    port = free_port()
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "DATABASE_PATH": str(tmp_path / "retro.db"),
+        "SERVER_PREWARM_MB": "1",
+        "ADMIN_TOKEN": "s3cret",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    try:
+        deadline = time.time() + 20
+        while True:
+            try:
+                metrics_request = urllib.request.Request(
+                    f"http://127.0.0.1:{port}/api/metrics", headers={"X-Admin-Token": "s3cret"}
+                )
+                with urllib.request.urlopen(metrics_request) as response:
+                    metrics = json.loads(response.read())
+                break
+            except OSError:
+                assert process.poll() is None, process.stderr.read().decode()
+                assert time.time() < deadline
+                time.sleep(0.1)
+        assert metrics["startup"]["ready_ms"] > 0
+    finally:
+        process.terminate()
+        _, stderr = process.communicate(timeout=20)
+    assert b"Prepared" in stderr
+    assert b"ready" in stderr
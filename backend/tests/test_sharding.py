@@ -0,0 +1,228 @@
+import pytest
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from httpx import AsyncClient
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import websockets
+
+from app.sharding import ProxyConnection, Router, owner, parse_head
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def head(*lines):
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def test_owner_is_stable_and_balanced():
+    sessions = [f"session-{i}" for i in range(4000)]
+    workers = [0, 1, 2, 3]
+    placement = {session: owner(session, workers) for session in sessions}
+
+    assert placement == {session: owner(session, list(reversed(workers))) for session in sessions}
+    counts = Counter(placement.values())
+    assert min(counts.values()) > 800
+
+    survivors = [0, 1, 3]
+    for session, worker in placement.items():
+        if worker != 2:
+            assert owner(session, survivors) == worker
+
+
+def test_parse_head_finds_routing_key():
+    request = parse_head(head("GET /api/session/abc%20def/stats?x=1 HTTP/1.1", "Host: test"))
+    assert request.session_id == "abc def"
+    assert request.path == "/api/session/abc%20def/stats"
+    assert not request.tunnel
+
+    assert parse_head(head("GET /ws/abc?username=a HTTP/1.1", "Connection: Upgrade")).tunnel
+    assert parse_head(head("POST /api/session/create HTTP/1.1")).session_id is None
+    assert parse_head(head("GET /api/search?q=x HTTP/1.1")).session_id is None
+
+    request = parse_head(head("PATCH /api/card/7 HTTP/1.1", "X-Retro-Session: abc", "Content-Length: 12"))
+    assert request.session_id == "abc"
+    assert request.length == 12
+    assert parse_head(head("garbage")) is None
+
+    assert parse_head(head("POST /api/session/abc/card HTTP/1.1", "Content-Length: 3", "content-length: 3")).length == 3
+    for bad in (["Content-Length: -1"], ["Content-Length: +5"], ["Content-Length: 0x10"], ["Content-Length: "],
+                ["Content-Length: 5", "Content-Length: 50"],
+                ["Content-Length: 5", "Transfer-Encoding: chunked"]):
+        assert parse_head(head("POST /api/session/abc/card HTTP/1.1", *bad)) is None
+
+
+async def fake_worker(worker, reader, writer):
+    try:
+        while True:
+            request = parse_head(await reader.readuntil(b"\r\n\r\n"))
+            await reader.readexactly(request.length)
+            if request.tunnel:
+                writer.write(b"HTTP/1.1 101 Switching Protocols\r\n\r\n")
+                await writer.drain()
+                while data := await reader.read(1024):
+                    writer.write(data)
+                return
+            body = json.dumps({"worker": worker, "client": request.fields.get("x-forwarded-for")}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.fixture
+async def proxy(tmp_path):
+    router = Router([str(tmp_path / f"worker-{i}.sock") for i in range(3)])
+    workers = []
+    handlers = []
+    for i, path in enumerate(router.socket_paths):
+        workers.append(await asyncio.start_unix_server(
+            lambda reader, writer, worker=i: handlers.append(
+                asyncio.create_task(fake_worker(worker, reader, writer))
+            ),
+            path
+        ))
+        router.set_alive(i, True)
+
+    async def accept(reader, writer):
+        await ProxyConnection(router, reader, writer, 5, ("127.0.0.1",)).run()
+
+    server = await asyncio.start_server(accept, "127.0.0.1", 0)
+    yield router, server.sockets[0].getsockname()[1]
+    server.close()
+    for worker in workers:
+        worker.close()
+    for handler in handlers:
+        handler.cancel()
+    await asyncio.gather(*handlers, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_proxy_routes_each_request_on_a_keepalive_connection(proxy):
+    router, port = proxy
+    async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for session in ("alpha", "beta", "gamma", "delta"):
+            for path in (f"/api/session/{session}", f"/api/session/{session}/votes"):
+                body = (await client.get(path)).json()
+                assert body["worker"] == owner(session, [0, 1, 2])
+                assert body["client"] == "127.0.0.1"
+            response = await client.patch("/api/card/1", json={}, headers={"X-Retro-Session": session})
+            assert response.json()["worker"] == owner(session, [0, 1, 2])
+
+        forged = await client.get("/api/search", headers={"X-Forwarded-For": "10.0.0.9"})
+        assert forged.json()["client"] == "10.0.0.9"
+    assert sum(router.requests) == 13
+
+
+@pytest.mark.asyncio
+async def test_rebalance_closes_tunnels_on_the_wrong_worker(proxy):
+    router, port = proxy
+    session = "rebalanced"
+    home = owner(session, [0, 1, 2])
+    router.set_alive(home, False)
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head(f"GET /ws/{session} HTTP/1.1", "Connection: Upgrade", "Upgrade: websocket"))
+    assert (await reader.readuntil(b"\r\n\r\n")).startswith(b"HTTP/1.1 101")
+    writer.write(b"ping")
+    assert await reader.readexactly(4) == b"ping"
+    assert router.stats()["tunnels"][home] == 0
+
+    router.set_alive(home, True)
+    assert await asyncio.wait_for(reader.read(), 5) == b""
+    writer.close()
+    assert router.stats()["rebalances"] == 5
+
+
+@pytest.mark.asyncio
+async def test_proxy_answers_503_without_workers(proxy):
+    router, port = proxy
+    for worker in (0, 1, 2):
+        router.set_alive(worker, False)
+    async with AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        response = await client.get("/api/session/abc")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_sharded_entry_point_keeps_boards_on_one_worker(tmp_path):
+    port = free_port()
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "DATABASE_PATH": str(tmp_path / "retro.db"),
+        "SERVER_PREWARM_MB": "1",
+        "WEB_CONCURRENCY": "2",
+        "SERVER_SHARDING": "1",
+        "ADMIN_TOKEN": "s3cret",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 20
+        while True:
+            try:
+                with urllib.request.urlopen(f"{base_url}/health"):
+                    break
+            except OSError:
+                assert process.poll() is None, process.stderr.read().decode()
+                assert time.time() < deadline
+                await asyncio.sleep(0.1)
+
+        async with AsyncClient(base_url=base_url) as client:
+            sessions = [(await client.post("/api/session/create")).json()["session_id"] for _ in range(4)]
+            for session_id in sessions:
+                async with websockets.connect(f"ws://127.0.0.1:{port}/ws/{session_id}?username=alice") as ws:
+                    card = (await client.post(
+                        f"/api/session/{session_id}/card",
+                        json={"category": "actionables", "content": "Ship it", "author": "bob"}
+                    )).json()
+                    await client.patch(
+                        f"/api/card/{card['id']}",
+                        json={"completed": True},
+                        headers={"X-Retro-Session": session_id}
+                    )
+                    seen = set()
+                    while not {"card_added", "card_updated"} <= seen:
+                        seen.add(json.loads(await asyncio.wait_for(ws.recv(), 5))["event"])
+
+            stats = (await client.get("/api/admin/shards", headers={"X-Admin-Token": "s3cret"})).json()
+            assert stats["alive"] == [0, 1]
+            assert stats["restarts"] == 0
+
+            os.kill(stats["pids"]["1"], signal.SIGKILL)
+            deadline = time.time() + 20
+            while stats["restarts"] == 0 or stats["alive"] != [0, 1]:
+                assert time.time() < deadline
+                await asyncio.sleep(0.1)
+                stats = (await client.get("/api/admin/shards", headers={"X-Admin-Token": "s3cret"})).json()
+            for session_id in sessions:
+                assert (await client.get(f"/api/session/{session_id}")).status_code == 200
+    finally:
+        process.terminate()
+        _, stderr = process.communicate(timeout=30)
+    assert b"Routing" in stderr
@@ -0,0 +1,180 @@
+import pytest
+import asyncio
+import random
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.database import create_session, create_card
+from app.similarity import CardGrouper, choose_bands
+
+
+@pytest.fixture
+async def client(client, monkeypatch):
+    monkeypatch.setattr(main, "card_groups", CardGrouper(0.5, publish=main.publish_groups))
+    yield client
+
+
+def card(card_id, content, category="badly", session_id="s1"):
+    return {"id": card_id, "session_id": session_id, "category": category, "content": content}
+
+
+async def loaded(grouper, session_id, cards):
+    async def fetch():
+        return cards
+    return await grouper.load(session_id, fetch)
+
+
+def test_band_layout_matches_threshold():
+    assert choose_bands(64, 0.5) == (16, 4)
+    assert choose_bands(64, 0.8) == (8, 8)
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_group_within_a_column():
+    grouper = CardGrouper(0.5)
+    index = await loaded(grouper, "s1", [
+        card(1, "Flaky deploys blocked the release"),
+        card(2, "deploys were flaky and blocked our release"),
+        card(3, "Standups run too long"),
+        card(4, "standup ran way too long"),
+        card(5, "Flaky deploys blocked the release", category="well"),
+        card(6, "Lunch was great"),
+    ])
+
+    assert index.published == [
+        {"category": "badly", "card_ids": [1, 2]},
+        {"category": "badly", "card_ids": [3, 4]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_edits_and_deletes():
+    grouper = CardGrouper(0.5)
+    await loaded(grouper, "s1", [card(1, "pager fatigue on call"), card(2, "on call pager fatigue")])
+    assert grouper.changed("s1") is None
+
+    grouper.add(card(2, "great demo day"))
+    assert grouper.changed("s1") == []
+
+    grouper.add(card(3, "pager fatigue during on-call"))
+    assert grouper.changed("s1") == [{"category": "badly", "card_ids": [1, 3]}]
+
+    grouper.remove("s1", 1)
+    assert grouper.changed("s1") == []
+    grouper.add(card(9, "ignored", session_id="not-loaded"))
+    assert "not-loaded" not in grouper.sessions
+
+
+@pytest.mark.asyncio
+async def test_changes_during_load_are_replayed():
+    grouper = CardGrouper(0.5)
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return [card(1, "flaky deploys blocked the release")]
+
+    loading = asyncio.create_task(grouper.load("s1", fetch))
+    await asyncio.sleep(0)
+    grouper.add(card(2, "the release was blocked by flaky deploys"))
+    release.set()
+    index = await loading
+
+    assert index.published == [{"category": "badly", "card_ids": [1, 2]}]
+
+
+@pytest.mark.asyncio
+async def test_candidate_comparisons_stay_sub_quadratic():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)) for _ in range(2000)]
+    cards = [card(i, " ".join(rng.sample(words, 8))) for i in range(2000)]
+    cards += [card(5000 + i, cards[i]["content"] + " again") for i in range(20)]
+    index = await loaded(CardGrouper(0.5), "s1", cards)
+
+    assert len(index.published) == 20
+    assert index.comparisons < 10 * len(cards)
+
+
+@pytest.mark.asyncio
+async def test_delete_splits_only_the_affected_group():
+    grouper = CardGrouper(0.5)
+    await loaded(grouper, "s1", [
+        card(1, "pager fatigue on call rotation"),
+        card(2, "pager fatigue on call rotation and weekend deploys"),
+        card(3, "call rotation and weekend deploys"),
+    ])
+    assert grouper.changed("s1") is None
+    assert grouper.sessions["s1"].published == [{"category": "badly", "card_ids": [1, 2, 3]}]
+
+    grouper.remove("s1", 2)
+    assert grouper.changed("s1") == []
+    grouper.add(card(4, "pager fatigue on call rotation"))
+    assert grouper.changed("s1") == [{"category": "badly", "card_ids": [1, 4]}]
+
+
+@pytest.mark.asyncio
+async def test_degenerate_board_is_capped():
+    rng = random.Random(7)
+    words = "deploy release standup pairing migration pager staging review flaky retro".split()
+    cards = [card(i, " ".join(rng.sample(words, 6))) for i in range(1500)]
+    grouper = CardGrouper(0.5, max_group=20)
+    index = await loaded(grouper, "s1", cards)
+
+    assert max(len(group["card_ids"]) for group in index.published) == 20
+    assert index.comparisons <= index.max_candidates * len(cards)
+    assert all(len(bucket) <= index.max_bucket for bucket in index.buckets.values())
+
+
+@pytest.mark.asyncio
+async def test_group_broadcasts_are_coalesced():
+    published = []
+
+    async def publish(session_id, groups):
+        published.append(groups)
+
+    grouper = CardGrouper(0.5, broadcast_window=0.05, publish=publish)
+    await loaded(grouper, "s1", [card(1, "flaky deploys blocked the release")])
+    for card_id in (2, 3, 4):
+        grouper.add(card(card_id, "flaky deploys blocked our release"))
+        await grouper.schedule("s1")
+    await grouper.schedule("s1")
+    assert published == []
+
+    await asyncio.sleep(0.1)
+    assert published == [[{"category": "badly", "card_ids": [1, 2, 3, 4]}]]
+    await grouper.schedule("s1")
+    await asyncio.sleep(0.1)
+    assert len(published) == 1
+
+
+@pytest.mark.asyncio
+async def test_groups_endpoint_and_broadcast(client):
+    await create_session("groups1")
+    first = await create_card("groups1", "badly", "Flaky deploys blocked the release", "alice")
+
+    response = await client.get("/api/session/groups1/groups")
+    assert response.status_code == 200
+    assert response.json() == {"groups": []}
+
+    sent = []
+
+    class Recorder:
+        async def send_json(self, message):
+            sent.append(message)
+
+    main.ws_manager.active_connections["groups1"] = [(Recorder(), "bob")]
+    try:
+        response = await client.post("/api/session/groups1/card", json={
+            "category": "badly", "content": "flaky deploys blocked our release", "author": "bob"
+        })
+    finally:
+        main.ws_manager.active_connections.pop("groups1", None)
+
+    second = response.json()
+    groups = [{"category": "badly", "card_ids": [first["id"], second["id"]]}]
+    assert sent[-1] == {"event": "card_groups", "data": {"groups": groups}}
+    assert (await client.get("/api/session/groups1/groups")).json() == {"groups": groups}
+    assert (await client.get("/api/session/missing/groups")).status_code == 404
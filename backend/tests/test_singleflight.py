@@ -0,0 +1,74 @@
+import pytest
+import asyncio
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.singleflight import SingleFlight, ActivityThrottle
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    executions = 0
+
+    async def load():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return {"cards": []}
+
+    results = await asyncio.gather(*(flight.do("test123", load) for _ in range(30)))
+
+    assert executions == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 30, "executions": 1, "deduplicated": 29, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_cached():
+    flight = SingleFlight()
+    executions = 0
+
+    async def load():
+        nonlocal executions
+        executions += 1
+        return executions
+
+    assert await flight.do("test123", load) == 1
+    assert await flight.do("test123", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("test123", fail),
+        flight.do("test123", fail),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.in_flight == {}
+
+
+def test_activity_throttle_coalesces_touches():
+    throttle = ActivityThrottle(interval=60)
+
+    assert throttle.should_touch("test123") == True
+    assert throttle.should_touch("test123") == False
+    assert throttle.should_touch("test456") == True
+    assert throttle.stats() == {"writes": 2, "coalesced": 1, "tracked": 2}
+
+
+def test_activity_throttle_zero_interval_always_touches():
+    throttle = ActivityThrottle(interval=0)
+
+    assert throttle.should_touch("test123") == True
+    assert throttle.should_touch("test123") == True
@@ -0,0 +1,148 @@
+import pytest
+import asyncio
+import json
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import main
+from app.database import create_session
+from app.websocket_manager import Lagged, SpectatorChannel, WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+async def until(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_channel_keeps_a_bounded_window():
+    channel = SpectatorChannel(size=3)
+    for i in range(5):
+        channel.publish(str(i))
+
+    assert channel.read(2) == ["2", "3", "4"]
+    assert channel.read(5) == []
+    with pytest.raises(Lagged):
+        channel.read(1)
+
+
+@pytest.mark.asyncio
+async def test_spectators_share_frames_and_stay_out_of_presence():
+    manager = WebSocketManager(audience_window=0.01)
+    editor = FakeWebSocket()
+    await manager.connect(editor, "board", "Alice")
+    viewers = [FakeWebSocket() for _ in range(3)]
+    tasks = [asyncio.create_task(manager.spectate(viewer, "board")) for viewer in viewers]
+    await until(lambda: manager.spectator_count("board") == 3)
+    await until(lambda: any(m["event"] == "spectators" for m in editor.sent))
+
+    assert editor.sent[0] == {"event": "user_list", "data": {"users": ["Alice"]}}
+    assert [m for m in editor.sent if m["event"] == "user_list"] == editor.sent[:1]
+    assert editor.sent[-1] == {"event": "spectators", "data": {"count": 3}}
+    assert manager.stats()["connections"] == 1
+    assert manager.stats()["spectators"] == 3
+
+    first = json.loads(viewers[0].sent[0])
+    assert first["data"][0] == {"event": "user_list", "data": {"users": ["Alice"]}}
+
+    await manager.broadcast("board", {"event": "card_deleted", "data": {"id": 7}})
+    await until(lambda: all(viewer.sent[-1].endswith('"id":7}}') for viewer in viewers))
+    assert viewers[0].sent[-1] is viewers[1].sent[-1] is viewers[2].sent[-1]
+
+    await manager.send_pings()
+    await asyncio.sleep(0.02)
+    assert all('"ping"' not in viewer.sent[-1] for viewer in viewers)
+
+    await viewers[0].incoming.put({"type": "websocket.disconnect"})
+    await tasks[0]
+    assert manager.spectator_count("board") == 2
+
+    await manager.close_all(spread=0)
+    await asyncio.gather(*tasks[1:])
+    assert viewers[1].closed[0] == 1012
+    assert manager.channels == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_spectator_is_dropped_instead_of_buffering():
+    manager = WebSocketManager(spectator_buffer=2, audience_window=0)
+    stream = manager.watch("board")
+    assert json.loads(await stream.__anext__())["event"] == "batch"
+
+    for i in range(3):
+        await manager.broadcast("board", {"event": "card_deleted", "data": {"id": i}})
+
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert manager.lagged == 1
+    assert manager.channels == {}
+
+
+@pytest.mark.asyncio
+async def test_spectator_limit_rejects_with_retry_hint():
+    manager = WebSocketManager(max_spectators=1, audience_window=0)
+    first = FakeWebSocket()
+    task = asyncio.create_task(manager.spectate(first, "board"))
+    await until(lambda: manager.spectator_count() == 1)
+
+    second = FakeWebSocket()
+    await manager.spectate(second, "board")
+    code, reason = second.closed
+    assert code == 1013
+    assert json.loads(reason)["retry_after"] > 0
+
+    await first.incoming.put({"type": "websocket.disconnect"})
+    await task
+
+
+@pytest.mark.asyncio
+async def test_event_stream_relays_board_events(client, monkeypatch):
+    monkeypatch.setattr(main.ws_manager, "audience_window", 0)
+    await create_session("sse1")
+    assert (await client.get("/api/session/missing/events")).status_code == 404
+
+    request = asyncio.create_task(client.get("/api/session/sse1/events"))
+    await until(lambda: main.ws_manager.spectator_count("sse1") == 1)
+    await client.post(
+        "/api/session/sse1/card",
+        json={"category": "kudos", "content": "Thanks!", "author": "bob"}
+    )
+    main.ws_manager.channels["sse1"].close()
+    response = await request
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines() if line.startswith("data: ")
+    ]
+    assert events[0]["event"] == "batch"
+    assert events[1]["event"] == "card_added"
+    assert events[1]["data"]["content"] == "Thanks!"
+    assert response.text.startswith("retry: ")
+    assert main.ws_manager.spectator_count("sse1") == 0
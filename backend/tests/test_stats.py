@@ -0,0 +1,214 @@
+import pytest
+import asyncio
+import random
+from datetime import timedelta
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import (
+    init_db, get_card, create_session, create_card, get_db, toggle_actionable, delete_card,
+    delete_all_cards, apply_card_operations, archive_idle_sessions, get_session,
+    purge_archived_sessions, get_session_stats, get_global_stats, rebuild_stats, check_stats
+)
+from app.memory_storage import MemoryStorage
+from app.stats import main as stats_main
+
+
+async def execute(sql, params=()):
+    db = await get_db()
+    try:
+        await db.execute(sql, params)
+        await db.commit()
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_incremental_stats_match_a_rebuild(test_db):
+    rng = random.Random(11)
+    authors = ["alice", "bob", "carol", "dave"]
+    categories = ["well", "badly", "continue", "kudos", "actionables"]
+    sessions = [f"s{i}" for i in range(4)]
+    cards = {}
+    for session_id in sessions:
+        await create_session(session_id)
+
+    for _ in range(200):
+        action = rng.random()
+        if action < 0.6 or not cards:
+            session_id = rng.choice(sessions)
+            card = await create_card(session_id, rng.choice(categories), "note", rng.choice(authors))
+            cards[card["id"]] = card
+        elif action < 0.8:
+            card = cards[rng.choice(list(cards))]
+            await toggle_actionable(card["id"], rng.random() < 0.5)
+        elif action < 0.9:
+            await delete_card(cards.pop(rng.choice(list(cards)))["id"])
+        else:
+            card = cards[rng.choice(list(cards))]
+            result = await apply_card_operations(card["session_id"], [
+                {"op": "toggle", "card_id": card["id"], "completed": True},
+                {"op": "delete", "card_id": card["id"], "author": card["author"]},
+            ] if card["category"] == "actionables" else [
+                {"op": "delete", "card_id": card["id"], "author": card["author"]},
+            ])
+            assert result["applied"]
+            del cards[card["id"]]
+
+    await delete_all_cards("s0")
+    await execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours') WHERE session_id = 's1'")
+    assert await archive_idle_sessions(hours=24) == 1
+    assert await check_stats() == {}
+    assert await get_session("s1")
+    await execute("DELETE FROM sessions WHERE session_id = 's2'")
+    assert await check_stats() == {}
+
+    incremental = [await get_global_stats()] + [await get_session_stats(s) for s in sessions]
+    await rebuild_stats()
+    assert [await get_global_stats()] + [await get_session_stats(s) for s in sessions] == incremental
+    assert incremental[0]["sessions"] == 3
+    assert incremental[3] is None
+
+
+@pytest.mark.asyncio
+async def test_session_stats_shape(test_db):
+    await create_session("shape")
+    await create_card("shape", "well", "Pairing", "alice")
+    await create_card("shape", "well", "Demos", "bob")
+    first = await create_card("shape", "actionables", "Fix CI", "alice")
+    await create_card("shape", "actionables", "Write docs", "alice")
+    await toggle_actionable(first["id"], True)
+    await toggle_actionable(first["id"], True)
+
+    stats = await get_session_stats("shape")
+    assert stats["cards"] == 4
+    assert stats["categories"] == {"well": 2, "badly": 0, "continue": 0, "kudos": 0, "actionables": 2}
+    assert stats["actionables"] == {"completed": 1, "open": 1}
+    assert stats["contributors"] == 2
+    assert sum(bucket["cards"] for bucket in stats["activity"]) == 4
+
+    await delete_card(first["id"])
+    stats = await get_session_stats("shape")
+    assert stats["actionables"] == {"completed": 0, "open": 1}
+
+
+@pytest.mark.asyncio
+async def test_archived_boards_count_until_purged(test_db):
+    for session_id in ("old", "new"):
+        await create_session(session_id)
+    await create_card("old", "well", "Pairing", "alice")
+    card = await create_card("old", "actionables", "Fix CI", "bob")
+    await toggle_actionable(card["id"], True)
+    await create_card("new", "kudos", "Thanks", "carol")
+    before = await get_global_stats()
+    old = await get_session_stats("old")
+
+    await execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours') WHERE session_id = 'old'")
+    assert await archive_idle_sessions(hours=24) == 1
+    assert await get_global_stats() == before
+    assert await get_session_stats("old") == old
+    assert await check_stats() == {}
+
+    assert await get_session("old")
+    assert await get_global_stats() == before
+    assert await check_stats() == {}
+
+    await execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours') WHERE session_id = 'old'")
+    assert await archive_idle_sessions(hours=24) == 1
+    await execute("UPDATE archived_sessions SET created_at = datetime('now', '-48 hours')")
+    assert await purge_archived_sessions(hours=24) == 1
+    stats = await get_global_stats()
+    assert stats["sessions"] == 1
+    assert stats["cards"] == 1
+    assert stats["contributors"] == 1
+    assert stats["actionables"] == {"completed": 0, "open": 0}
+    assert await get_session_stats("old") is None
+    assert await check_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_init_db_counts_boards_archived_before_upgrade(test_db):
+    await create_session("legacy")
+    card = await create_card("legacy", "badly", "Flaky deploys", "alice")
+    before = await get_global_stats()
+    await execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours')")
+    assert await archive_idle_sessions(hours=24) == 1
+    db = await get_db()
+    try:
+        await db.executescript(
+            """
+            DROP TABLE archived_cards;
+            CREATE TABLE archived_cards (
+                card_id INTEGER PRIMARY KEY,
+                session_id TEXT NOT NULL REFERENCES archived_sessions(session_id) ON DELETE CASCADE
+            );
+            UPDATE board_stats SET sessions = 0, contributors = 0;
+            DELETE FROM category_stats;
+            """
+        )
+    finally:
+        await db.close()
+
+    await init_db()
+    assert await get_global_stats() == before
+    assert await check_stats() == {}
+    assert (await get_card(card["id"]))["session_id"] == "legacy"
+
+
+@pytest.mark.asyncio
+async def test_check_detects_drift_and_cli_repairs_it(test_db):
+    await create_session("drift")
+    await create_card("drift", "kudos", "Thanks", "alice")
+    await execute("UPDATE category_stats SET cards = 7 WHERE session_id = 'drift'")
+
+    assert await check_stats() == {"category_stats": 2}
+    assert await asyncio.to_thread(stats_main, ["--database", test_db, "check"]) == 1
+    assert await asyncio.to_thread(stats_main, ["--database", test_db, "rebuild"]) == 0
+    assert await asyncio.to_thread(stats_main, ["--database", test_db, "check"]) == 0
+    assert (await get_session_stats("drift"))["categories"]["kudos"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_stats():
+    storage = MemoryStorage()
+    await storage.create_session("m1")
+    await storage.create_card("m1", "badly", "Slow", "alice")
+    card = await storage.create_card("m1", "actionables", "Speed up", "bob")
+    await storage.toggle_actionable(card["id"], True)
+
+    stats = await storage.get_session_stats("m1")
+    assert stats["session_id"] == "m1"
+    assert stats["actionables"] == {"completed": 1, "open": 0}
+    assert stats["contributors"] == 2
+    assert (await storage.get_global_stats())["sessions"] == 1
+    assert await storage.get_session_stats("missing") is None
+
+    storage.sessions["m1"]["last_activity"] -= timedelta(hours=48)
+    await storage.create_session("m2")
+    before = await storage.get_global_stats()
+    assert await storage.archive_idle_sessions(hours=24) == 1
+    assert await storage.get_global_stats() == before
+    assert (await storage.get_session_stats("m1"))["cards"] == 2
+
+    storage.archived["m1"]["created_at"] -= timedelta(hours=48)
+    assert await storage.purge_archived_sessions(hours=24) == 1
+    assert (await storage.get_global_stats())["sessions"] == 1
+    assert (await storage.get_global_stats())["cards"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoints(client):
+    await create_session("api1")
+    await create_card("api1", "continue", "Retro games", "alice")
+
+    response = await client.get("/api/session/api1/stats")
+    assert response.status_code == 200
+    assert response.json()["categories"]["continue"] == 1
+    assert (await client.get("/api/session/missing/stats")).status_code == 404
+
+    response = await client.get("/api/stats")
+    assert response.status_code == 200
+    assert response.json()["sessions"] == 1
+    assert response.json()["cards"] == 1
@@ -0,0 +1,92 @@
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.main import ws_manager
+from app.database import create_session
+from app.tracing import Tracer, otlp_document, tracer
+
+
+class ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(list(spans))
+
+
+class Recorder:
+    async def send_json(self, message):
+        pass
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_nested_spans_share_trace():
+    exporter = ListExporter()
+    local = Tracer(exporter)
+
+    with local.span("outer", kind="server"):
+        with local.span("inner", rows=3):
+            pass
+
+    [trace] = exporter.traces
+    inner, outer = trace
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id is None
+
+
+@pytest.mark.asyncio
+async def test_span_records_errors():
+    exporter = ListExporter()
+    local = Tracer(exporter)
+
+    with pytest.raises(ValueError):
+        with local.span("failing"):
+            raise ValueError("boom")
+
+    assert exporter.traces[0][0].to_otlp()["status"] == {"code": 2, "message": "ValueError: boom"}
+
+
+def test_disabled_tracer_yields_nothing():
+    with Tracer().span("noop") as span:
+        assert span is None
+
+
+@pytest.mark.asyncio
+async def test_add_card_trace_covers_database_and_broadcast(client, exporter):
+    session_id = "test123"
+    await create_session(session_id)
+    exporter.traces.clear()
+    ws_manager.active_connections[session_id] = [(Recorder(), "Bob")]
+
+    try:
+        response = await client.post(
+            f"/api/session/{session_id}/card",
+            json={"category": "well", "content": "Traced", "author": "Alice"}
+        )
+        assert response.status_code == 200
+    finally:
+        ws_manager.active_connections.pop(session_id, None)
+
+    [trace] = exporter.traces
+    root = trace[-1]
+    assert root.name == "POST /api/session/{session_id}/card"
+    assert root.attributes["http.status_code"] == 200
+    children = [span.name for span in trace[:-1]]
+    assert children == ["db.get_session", "db.get_session_stats", "db.create_card", "ws.broadcast"]
+    assert all(span.parent_id == root.span_id for span in trace[:-1])
+
+    document = otlp_document(trace)
+    spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    broadcast = next(span for span in spans if span["name"] == "ws.broadcast")
+    assert {"key": "recipients", "value": {"intValue": "1"}} in broadcast["attributes"]
@@ -0,0 +1,244 @@
+import pytest
+import asyncio
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import database, main
+from app.database import create_session, create_card, delete_card, get_db
+from app.memory_storage import MemoryStorage
+from app.similarity import CardGrouper
+from app.storage import SQLiteStorage
+from app.votes import VoteCounter
+
+
+@pytest.fixture
+async def client(client, monkeypatch):
+    counter = VoteCounter(main.storage, limit=3, broadcast_window=0, publish=main.publish_votes)
+    monkeypatch.setattr(main, "votes", counter)
+    yield client
+
+
+class CountingStorage(SQLiteStorage):
+    def __init__(self):
+        self.saves = 0
+
+    async def save_votes(self, votes):
+        self.saves += 1
+        return await super().save_votes(votes)
+
+
+class FailingStorage(SQLiteStorage):
+    def __init__(self):
+        self.closed = False
+
+    async def save_votes(self, votes):
+        raise RuntimeError("disk I/O error")
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_failed_final_flush_still_closes_storage(test_db, monkeypatch, caplog):
+    storage = FailingStorage()
+    counter = VoteCounter(storage, limit=3, broadcast_window=0)
+    monkeypatch.setattr(main, "storage", storage)
+    monkeypatch.setattr(main, "votes", counter)
+    monkeypatch.setattr(main, "card_groups", CardGrouper(0))
+    await create_session("s1")
+    card = await create_card("s1", "well", "Ship it", "alice")
+
+    async with main.lifespan(main.app):
+        await counter.vote("s1", card["id"], "bob", 1)
+
+    assert storage.closed
+    assert counter.flush_failures == 1
+    assert "Final vote flush failed, 1 ballots were not saved" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_vote_burst_is_one_flush_and_one_broadcast(test_db):
+    await create_session("burst")
+    cards = [(await create_card("burst", "badly", f"Problem {i}", "alice"))["id"] for i in range(5)]
+    published = []
+
+    async def publish(session_id, tallies):
+        published.append(tallies)
+
+    storage = CountingStorage()
+    counter = VoteCounter(storage, limit=3, broadcast_window=0.05, publish=publish)
+    results = await asyncio.gather(*(
+        counter.vote("burst", cards[(voter + dot) % 5], f"user{voter}", 1)
+        for voter in range(50)
+        for dot in range(3)
+    ))
+    assert all(results)
+    assert await counter.vote("burst", cards[0], "user0", 1) is None
+
+    await asyncio.sleep(0.1)
+    assert len(published) == 1
+    assert sum(published[0].values()) == 150
+
+    assert await counter.flush() == 150
+    assert storage.saves == 1
+    rows = await storage.get_votes("burst")
+    assert sum(row["count"] for row in rows) == 150
+    assert counter.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_limits_removal_and_reload(test_db):
+    await create_session("limits")
+    card = await create_card("limits", "well", "Ship it", "alice")
+    counter = VoteCounter(SQLiteStorage(), limit=2, broadcast_window=0)
+
+    assert (await counter.vote("limits", card["id"], "bob", 1))["remaining"] == 1
+    assert (await counter.vote("limits", card["id"], "bob", 1))["mine"] == 2
+    assert await counter.vote("limits", card["id"], "bob", 1) is None
+    result = await counter.vote("limits", card["id"], "bob", -1)
+    assert result == {"card_id": card["id"], "votes": 1, "mine": 1, "remaining": 1}
+    assert await counter.vote("limits", card["id"], "carol", -1) is None
+    await counter.close()
+
+    reloaded = VoteCounter(SQLiteStorage(), limit=2)
+    state = await reloaded.load("limits")
+    assert state.tallies == {card["id"]: 1}
+    assert reloaded.remaining(state, "bob") == 1
+
+
+@pytest.mark.asyncio
+async def test_deleted_cards_drop_their_votes(test_db):
+    await create_session("gone")
+    keep = await create_card("gone", "well", "Keep", "alice")
+    drop = await create_card("gone", "well", "Drop", "alice")
+    counter = VoteCounter(SQLiteStorage(), broadcast_window=0)
+    await counter.vote("gone", keep["id"], "bob", 1)
+    await counter.vote("gone", drop["id"], "bob", 1)
+    await counter.flush()
+
+    await counter.vote("gone", drop["id"], "carol", 1)
+    await delete_card(drop["id"])
+    await counter.flush()
+    counter.forget_card("gone", drop["id"])
+
+    assert await SQLiteStorage().get_votes("gone") == [
+        {"card_id": keep["id"], "voter": "bob", "count": 1}
+    ]
+    assert counter.remaining(counter.sessions["gone"], "bob") == 2
+
+
+@pytest.mark.asyncio
+async def test_votes_survive_archive(test_db):
+    await create_session("cold")
+    card = await create_card("cold", "well", "Remember me", "alice")
+    await database.save_votes([{"session_id": "cold", "card_id": card["id"], "voter": "bob", "count": 2}])
+    db = await get_db()
+    try:
+        await db.execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours')")
+        await db.commit()
+    finally:
+        await db.close()
+
+    assert await database.archive_idle_sessions(hours=24) == 1
+    assert await database.get_votes("cold") == []
+    assert await database.get_session("cold")
+    assert await database.get_votes("cold") == [{"card_id": card["id"], "voter": "bob", "count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_open_board_keeps_working_after_archive(client):
+    await create_session("open1")
+    edit = await create_card("open1", "well", "Edit me", "alice")
+    drop = await create_card("open1", "well", "Drop me", "alice")
+    voted = await create_card("open1", "well", "Vote on me", "alice")
+    assert (await client.post(
+        f"/api/session/open1/card/{voted['id']}/vote", json={"voter": "bob"}
+    )).status_code == 200
+    await main.votes.flush()
+
+    async def archive():
+        db = await get_db()
+        try:
+            await db.execute("UPDATE sessions SET last_activity = datetime('now', '-48 hours')")
+            await db.commit()
+        finally:
+            await db.close()
+        assert await database.archive_idle_sessions(hours=24) == 1
+
+    await archive()
+    response = await client.patch(f"/api/card/{edit['id']}", json={"content": "Edited"})
+    assert response.status_code == 200
+    assert response.json()["content"] == "Edited"
+    await archive()
+
+    response = await client.delete(f"/api/card/{drop['id']}", params={"author": "alice"})
+    assert response.status_code == 200
+    await archive()
+
+    response = await client.post(f"/api/session/open1/card/{voted['id']}/vote", json={"voter": "carol"})
+    assert response.status_code == 200
+    assert response.json()["votes"] == 2
+    await archive()
+    await main.votes.flush()
+
+    assert sorted(v["voter"] for v in await database.get_votes("open1")) == ["bob", "carol"]
+    assert [c["content"] for c in await database.get_cards("open1")] == ["Edited", "Vote on me"]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_votes(tmp_path):
+    storage = MemoryStorage(snapshot_path=str(tmp_path / "snap.json"))
+    await storage.create_session("m1")
+    card = await storage.create_card("m1", "well", "Nice", "alice")
+    await storage.save_votes([
+        {"session_id": "m1", "card_id": card["id"], "voter": "bob", "count": 2},
+        {"session_id": "other", "card_id": card["id"], "voter": "eve", "count": 1},
+    ])
+    assert await storage.get_votes("m1") == [{"card_id": card["id"], "voter": "bob", "count": 2}]
+
+    await storage.close()
+    restored = MemoryStorage(snapshot_path=str(tmp_path / "snap.json"))
+    await restored.init()
+    assert await restored.get_votes("m1") == [{"card_id": card["id"], "voter": "bob", "count": 2}]
+    await restored.delete_card(card["id"])
+    assert await restored.get_votes("m1") == []
+    await restored.close()
+
+
+@pytest.mark.asyncio
+async def test_vote_endpoints(client):
+    await create_session("api1")
+    card = await create_card("api1", "badly", "Slow CI", "alice")
+    url = f"/api/session/api1/card/{card['id']}/vote"
+
+    sent = []
+
+    class Recorder:
+        async def send_json(self, message):
+            sent.append(message)
+
+    main.ws_manager.active_connections["api1"] = [(Recorder(), "bob")]
+    try:
+        response = await client.post(url, json={"voter": "bob"})
+    finally:
+        main.ws_manager.active_connections.pop("api1", None)
+    assert response.status_code == 200
+    assert response.json() == {"card_id": card["id"], "votes": 1, "mine": 1, "remaining": 2}
+    assert sent == [{"event": "votes_updated", "data": {"tallies": {card["id"]: 1}}}]
+
+    await client.post(url, json={"voter": "bob"})
+    await client.post(url, json={"voter": "bob"})
+    response = await client.post(url, json={"voter": "bob"})
+    assert response.status_code == 409
+    assert (await client.post(url, json={"voter": "carol", "remove": True})).status_code == 409
+    assert (await client.post("/api/session/api1/card/999/vote", json={"voter": "bob"})).status_code == 404
+
+    response = await client.get("/api/session/api1/votes", params={"voter": "bob"})
+    assert response.json() == {
+        "limit": 3,
+        "tallies": {str(card["id"]): 3},
+        "mine": {str(card["id"]): 3},
+        "remaining": 0,
+    }
@@ -4,12 +4,14 @@ import tempfile
 from pathlib import Path
 from httpx import AsyncClient, ASGITransport
 import asyncio
+import json
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.main import app
 from app.database import init_db, create_session
+from app.websocket_manager import WebSocketManager
 
 
 @pytest.fixture
@@ -216,3 +218,188 @@ async def test_websocket_disconnect_cleanup(test_db):
 
         await asyncio.sleep(0.1)
         assert session_id not in ws_manager.active_connections
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_batches_events_within_window():
+    manager = WebSocketManager(batch_window=0.01)
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "test123", "Alice")
+    await manager.flush("test123")
+    websocket.sent.clear()
+
+    await manager.broadcast("test123", {"event": "card_deleted", "data": {"id": 1}})
+    await manager.broadcast("test123", {"event": "card_deleted", "data": {"id": 2}})
+    assert websocket.sent == []
+
+    await asyncio.sleep(0.05)
+
+    assert len(websocket.sent) == 1
+    assert websocket.sent[0]["event"] == "batch"
+    assert [m["data"]["id"] for m in websocket.sent[0]["data"]] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_single_event_is_not_wrapped():
+    manager = WebSocketManager(batch_window=0.01)
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "test123", "Alice")
+
+    await asyncio.sleep(0.05)
+
+    assert websocket.sent == [{"event": "user_list", "data": {"users": ["Alice"]}}]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_without_batching_sends_immediately():
+    manager = WebSocketManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "test123", "Alice")
+    websocket.sent.clear()
+
+    await manager.broadcast("test123", {"event": "board_cleared", "data": {}})
+
+    assert websocket.sent == [{"event": "board_cleared", "data": {}}]
+
+
+@pytest.mark.asyncio
+async def test_close_all_sends_restart_code_with_retry_hint():
+    manager = WebSocketManager()
+    sockets = [FakeWebSocket() for _ in range(20)]
+    for websocket in sockets:
+        await manager.connect(websocket, "test123", "Alice")
+
+    await manager.close_all(retry_after=2, spread=10)
+
+    assert manager.active_connections == {}
+    delays = []
+    for websocket in sockets:
+        code, reason = websocket.closed
+        assert code == 1012
+        delays.append(json.loads(reason)["retry_after"])
+    assert all(2 <= delay <= 12 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+class HangingWebSocket(FakeWebSocket):
+    async def close(self, code=1000, reason=None):
+        await asyncio.sleep(60)
+
+
+@pytest.mark.asyncio
+async def test_close_all_does_not_wait_on_hanging_socket():
+    manager = WebSocketManager(batch_window=10)
+    hanging = HangingWebSocket()
+    sockets = [FakeWebSocket() for _ in range(5)]
+    await manager.connect(hanging, "test123", "Alice")
+    for websocket in sockets:
+        await manager.connect(websocket, "test123", "Bob")
+    await manager.broadcast("test123", {"event": "card_deleted", "data": {"id": 1}})
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await manager.close_all(spread=0, timeout=0.1)
+
+    assert loop.time() - started < 1
+    assert all(websocket.closed[0] == 1012 for websocket in sockets)
+    assert manager.pending_events == {}
+    assert manager.flush_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_reap_idle_evicts_unresponsive_sockets():
+    manager = WebSocketManager(heartbeat_interval=1, heartbeat_timeout=30)
+    alive = FakeWebSocket()
+    dead = FakeWebSocket()
+    await manager.connect(alive, "test123", "Alice")
+    await manager.connect(dead, "test123", "Bob")
+    manager.last_seen[dead] -= 60
+    alive.sent.clear()
+
+    reaped = await manager.reap_idle()
+
+    assert reaped == 1
+    assert dead.closed[0] == 1001
+    assert manager.get_active_users("test123") == ["Alice"]
+    assert alive.sent == [{"event": "user_list", "data": {"users": ["Alice"]}}]
+    assert manager.stats()["reaped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_touch_keeps_socket_alive():
+    manager = WebSocketManager(heartbeat_interval=1, heartbeat_timeout=30)
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "test123", "Alice")
+    manager.last_seen[websocket] -= 60
+
+    manager.touch(websocket)
+
+    assert await manager.reap_idle() == 0
+    assert manager.get_active_users("test123") == ["Alice"]
+
+
+@pytest.mark.asyncio
+async def test_send_pings_reaches_every_connection():
+    manager = WebSocketManager(heartbeat_interval=1, heartbeat_timeout=30)
+    sockets = [FakeWebSocket(), FakeWebSocket()]
+    await manager.connect(sockets[0], "test123", "Alice")
+    await manager.connect(sockets[1], "test456", "Bob")
+
+    await manager.send_pings()
+
+    assert all(ws.sent[-1] == {"event": "ping", "data": {}} for ws in sockets)
+    assert manager.stats()["pings_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_rejects_over_session_cap():
+    manager = WebSocketManager(max_connections_per_session=1)
+    first = FakeWebSocket()
+    second = FakeWebSocket()
+
+    assert await manager.connect(first, "test123", "Alice") == True
+    assert await manager.connect(second, "test123", "Bob") == False
+
+    assert second.closed[0] == 1013
+    assert "retry_after" in json.loads(second.closed[1])
+    assert manager.get_active_users("test123") == ["Alice"]
+    assert manager.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_connect_rejects_over_global_cap():
+    manager = WebSocketManager(max_connections=1)
+
+    assert await manager.connect(FakeWebSocket(), "test123", "Alice") == True
+    assert await manager.connect(FakeWebSocket(), "test456", "Bob") == False
+
+
+@pytest.mark.asyncio
+async def test_presence_updates_are_shed_and_flushed_later():
+    overloaded = True
+    manager = WebSocketManager(should_shed=lambda kind: overloaded)
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "test123", "Alice")
+
+    assert websocket.sent == []
+    assert manager.stale_presence == {"test123"}
+
+    overloaded = False
+    await manager.flush_presence()
+
+    assert websocket.sent == [{"event": "user_list", "data": {"users": ["Alice"]}}]
+    assert manager.stale_presence == set()
@@ -4,15 +4,21 @@ import { updateCard } from "../utils/api";
 interface ActionablesListProps {
   actionables: Card[];
   onToggle: (id: number, completed: boolean) => void;
+  readOnly?: boolean;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export function ActionablesList({
   actionables,
   onToggle,
+  readOnly = false,
+  hasMore = false,
+  onLoadMore,
 }: ActionablesListProps) {
   const handleToggle = async (card: Card) => {
     try {
-      await updateCard(card.id, { completed: !card.completed });
+      await updateCard(card.id, { completed: !card.completed }, card.session_id);
       onToggle(card.id, !card.completed);
     } catch {
       // silently ignore; WS will sync state
@@ -33,6 +39,7 @@ export function ActionablesList({
               type="checkbox"
               checked={card.completed || false}
               onChange={() => handleToggle(card)}
+              disabled={readOnly}
               className="mt-1 w-5 h-5 text-blue-600 rounded focus:ring-2 focus:ring-blue-500"
             />
             <div className="flex-1">
@@ -48,6 +55,14 @@ export function ActionablesList({
           </div>
         ))}
       </div>
+      {hasMore && onLoadMore && (
+        <button
+          onClick={onLoadMore}
+          className="mt-4 text-sm text-blue-700 hover:text-blue-900 transition"
+        >
+          Load more
+        </button>
+      )}
     </div>
   );
 }
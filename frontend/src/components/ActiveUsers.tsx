@@ -1,14 +1,20 @@
 interface ActiveUsersProps {
   users: string[];
+  spectators?: number;
 }
 
-export function ActiveUsers({ users }: ActiveUsersProps) {
-  if (users.length === 0) return null;
+export function ActiveUsers({ users, spectators = 0 }: ActiveUsersProps) {
+  if (users.length === 0 && spectators === 0) return null;
 
   return (
     <div className="bg-white rounded-lg shadow p-4">
       <h3 className="text-sm font-semibold text-gray-700 mb-2">
         Active Users ({users.length})
+        {spectators > 0 && (
+          <span className="ml-2 font-normal text-gray-500">
+            + {spectators} watching
+          </span>
+        )}
       </h3>
       <div className="flex flex-wrap gap-2">
         {users.map((user, index) => (
@@ -5,15 +5,27 @@ interface CardProps {
   card: CardType;
   currentUser: string;
   onDelete: (id: number) => void;
+  similarCount?: number;
+  votes?: number;
+  myVotes?: number;
+  onVote?: (id: number, remove: boolean) => void;
 }
 
-export function Card({ card, currentUser, onDelete }: CardProps) {
+export function Card({
+  card,
+  currentUser,
+  onDelete,
+  similarCount = 0,
+  votes = 0,
+  myVotes = 0,
+  onVote,
+}: CardProps) {
   const isOwner = card.author === currentUser;
 
   const handleDelete = async () => {
     if (!isOwner) return;
     try {
-      await deleteCard(card.id, currentUser);
+      await deleteCard(card.id, currentUser, card.session_id);
       onDelete(card.id);
     } catch {
       // WS broadcast will reflect the state; silently ignore
@@ -33,6 +45,34 @@ export function Card({ card, currentUser, onDelete }: CardProps) {
       )}
       <p className="text-gray-900 mb-2 pr-6">{card.content}</p>
       <p className="text-xs text-gray-600">- {card.author}</p>
+      {onVote && (
+        <div className="flex items-center gap-2 mt-2 text-xs">
+          <button
+            onClick={() => onVote(card.id, false)}
+            className="px-2 py-0.5 rounded border border-blue-300 text-blue-700 hover:bg-blue-50"
+            aria-label="Vote for card"
+          >
+            +1
+          </button>
+          <span className="font-semibold text-gray-800">
+            {votes} {votes === 1 ? "vote" : "votes"}
+          </span>
+          {myVotes > 0 && (
+            <button
+              onClick={() => onVote(card.id, true)}
+              className="text-gray-500 hover:text-gray-700 underline"
+              aria-label="Remove my vote"
+            >
+              undo ({myVotes})
+            </button>
+          )}
+        </div>
+      )}
+      {similarCount > 0 && (
+        <span className="absolute bottom-2 right-2 text-xs font-semibold text-amber-700 bg-amber-100 rounded px-1.5 py-0.5">
+          +{similarCount} similar
+        </span>
+      )}
     </div>
   );
 }
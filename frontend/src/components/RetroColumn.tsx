@@ -1,3 +1,4 @@
+import { useEffect, useLayoutEffect, useRef, useState } from "react";
 import type { Card as CardType, CategoryType } from "../types/index.js";
 import { Card } from "./Card";
 import { AddCardButton } from "./AddCardButton";
@@ -7,10 +8,20 @@ interface RetroColumnProps {
   category: CategoryType;
   cards: CardType[];
   currentUser: string;
-  onAddCard: (content: string) => void;
+  onAddCard?: (content: string) => void;
   onDeleteCard: (id: number) => void;
+  similarCounts?: Record<number, number>;
+  tallies?: Record<number, number>;
+  myVotes?: Record<number, number>;
+  onVote?: (id: number, remove: boolean) => void;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
+const VIRTUALIZE_AFTER = 100;
+const OVERSCAN = 8;
+const LOAD_MORE_MARGIN = 600;
+
 const columnColors: Record<CategoryType, string> = {
   well: "bg-white/20 border-green-500",
   badly: "bg-white/20 border-red-500",
@@ -34,18 +45,89 @@ export function RetroColumn({
   currentUser,
   onAddCard,
   onDeleteCard,
+  similarCounts = {},
+  tallies = {},
+  myVotes = {},
+  onVote,
+  hasMore = false,
+  onLoadMore,
 }: RetroColumnProps) {
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const rowsRef = useRef<HTMLDivElement>(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewport, setViewport] = useState(800);
+  const [rowHeight, setRowHeight] = useState(120);
+
+  const virtualized = cards.length > VIRTUALIZE_AFTER;
+  const start = virtualized ? Math.max(0, Math.floor(scrollTop / rowHeight) - OVERSCAN) : 0;
+  const end = virtualized
+    ? Math.min(cards.length, Math.ceil((scrollTop + viewport) / rowHeight) + OVERSCAN)
+    : cards.length;
+  const visible = cards.slice(start, end);
+
+  useLayoutEffect(() => {
+    const el = scrollRef.current;
+    if (el && el.clientHeight && el.clientHeight !== viewport) {
+      setViewport(el.clientHeight);
+    }
+    const rows = rowsRef.current;
+    if (!virtualized || !rows || visible.length === 0) return;
+    const measured = rows.offsetHeight / visible.length;
+    if (Math.abs(measured - rowHeight) > 1) {
+      setRowHeight(measured);
+    }
+  });
+
+  const maybeLoadMore = () => {
+    const el = scrollRef.current;
+    if (!el || !hasMore || !onLoadMore) return;
+    if (el.scrollHeight - el.scrollTop - el.clientHeight < LOAD_MORE_MARGIN) {
+      onLoadMore();
+    }
+  };
+
+  useEffect(() => {
+    maybeLoadMore();
+  }, [hasMore, cards.length]);
+
+  const handleScroll = () => {
+    const el = scrollRef.current;
+    if (!el) return;
+    setScrollTop(el.scrollTop);
+    setViewport(el.clientHeight);
+    maybeLoadMore();
+  };
+
   return (
     <div
       className={`flex flex-col p-4 rounded-lg border-2 backdrop-blur-sm ${columnColors[category]}`}
     >
       <h2 className={`text-xl font-bold mb-4 ${headerColors[category]}`}>{title}</h2>
-      <div className="flex-1 space-y-3 mb-4 overflow-y-auto">
-        {cards.map((card) => (
-          <Card key={card.id} card={card} currentUser={currentUser} onDelete={onDeleteCard} />
-        ))}
+      <div
+        ref={scrollRef}
+        onScroll={handleScroll}
+        className="flex-1 mb-4 max-h-[70vh] overflow-y-auto"
+      >
+        <div style={{ height: start * rowHeight }} />
+        <div ref={rowsRef}>
+          {visible.map((card) => (
+            <div key={card.id} className="pb-3">
+              <Card
+                card={card}
+                currentUser={currentUser}
+                onDelete={onDeleteCard}
+                similarCount={similarCounts[card.id] ?? 0}
+                votes={tallies[card.id] ?? 0}
+                myVotes={myVotes[card.id] ?? 0}
+                onVote={onVote}
+              />
+            </div>
+          ))}
+        </div>
+        <div style={{ height: (cards.length - end) * rowHeight }} />
+        {hasMore && <div className="text-center text-sm text-white/70 py-2">Loading more...</div>}
       </div>
-      <AddCardButton category={category} onAdd={onAddCard} />
+      {onAddCard && <AddCardButton category={category} onAdd={onAddCard} />}
     </div>
   );
 }
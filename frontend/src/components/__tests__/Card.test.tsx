@@ -15,6 +15,7 @@ describe('Card Component', () => {
     content: 'Great teamwork!',
     author: 'Alice',
     created_at: '2024-01-01T00:00:00Z',
+    version: 1,
   }
 
   const mockOnDelete = vi.fn()
@@ -43,4 +44,16 @@ describe('Card Component', () => {
       expect(mockOnDelete).toHaveBeenCalledWith(1)
     })
   })
+
+  it('shows the tally and sends votes', () => {
+    const onVote = vi.fn()
+    render(<Card card={mockCard} onDelete={mockOnDelete} votes={3} myVotes={1} onVote={onVote} />)
+
+    expect(screen.getByText('3 votes')).toBeInTheDocument()
+    fireEvent.click(screen.getByLabelText('Vote for card'))
+    fireEvent.click(screen.getByLabelText('Remove my vote'))
+
+    expect(onVote).toHaveBeenNthCalledWith(1, 1, false)
+    expect(onVote).toHaveBeenNthCalledWith(2, 1, true)
+  })
 })
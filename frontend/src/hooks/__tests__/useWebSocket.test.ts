@@ -0,0 +1,36 @@
+import { describe, it, expect, vi, afterEach } from 'vitest'
+import { backoffDelay, reconnectDelay } from '../useWebSocket'
+
+describe('reconnect backoff', () => {
+  afterEach(() => {
+    vi.restoreAllMocks()
+  })
+
+  it('caps exponential backoff with full jitter', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0.999)
+    expect(backoffDelay(0)).toBeLessThan(500)
+    expect(backoffDelay(3)).toBeLessThan(4000)
+    expect(backoffDelay(20)).toBeLessThan(30000)
+  })
+
+  it('honours the server retry_after hint', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0)
+    expect(reconnectDelay({ code: 1012, reason: '{"retry_after": 4.5}' }, 0)).toBe(4500)
+  })
+
+  it('spreads restarts without a hint across the restart window', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0.5)
+    expect(reconnectDelay({ code: 1012, reason: '' }, 0)).toBe(5000)
+  })
+
+  it('keeps backing off when restarts repeat without a hint', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0.5)
+    expect(reconnectDelay({ code: 1012, reason: '' }, 1)).toBe(10000)
+    expect(reconnectDelay({ code: 1012, reason: 'going away' }, 5)).toBe(15000)
+  })
+
+  it('falls back to jittered backoff for other close codes', () => {
+    vi.spyOn(Math, 'random').mockReturnValue(0.5)
+    expect(reconnectDelay({ code: 1006, reason: '' }, 2)).toBe(1000)
+  })
+})
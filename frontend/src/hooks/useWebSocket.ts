@@ -5,44 +5,109 @@ const WS_BASE = import.meta.env.VITE_WS_URL || (typeof window !== 'undefined'
   ? `${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}`
   : "ws://localhost:8000");
 
+const BASE_DELAY_MS = 500;
+const MAX_DELAY_MS = 30000;
+const RESTART_WINDOW_MS = 10000;
+const SERVICE_RESTART = 1012;
+const TRY_AGAIN_LATER = 1013;
+
+export function backoffDelay(attempt: number, base = BASE_DELAY_MS): number {
+  return Math.random() * Math.min(MAX_DELAY_MS, base * 2 ** attempt);
+}
+
+function retryAfter(reason: string): number | null {
+  try {
+    const { retry_after } = JSON.parse(reason);
+    return typeof retry_after === "number" ? retry_after * 1000 : null;
+  } catch {
+    return null;
+  }
+}
+
+export function reconnectDelay(event: { code: number; reason: string }, attempt: number): number {
+  if (event.code === SERVICE_RESTART || event.code === TRY_AGAIN_LATER) {
+    const hint = retryAfter(event.reason);
+    if (hint !== null) {
+      return hint + backoffDelay(attempt);
+    }
+    if (event.code === SERVICE_RESTART) {
+      return backoffDelay(attempt, RESTART_WINDOW_MS);
+    }
+  }
+  return backoffDelay(attempt);
+}
+
 export function useWebSocket(
   sessionId: string,
   username: string,
-  onMessage: (message: WebSocketMessage) => void
+  onMessage: (message: WebSocketMessage) => void,
+  spectate = false,
+  onReconnect?: () => void
 ) {
   const ws = useRef<WebSocket | null>(null);
   const reconnectTimeout = useRef<number | undefined>(undefined);
+  const attempts = useRef(0);
+  const opened = useRef(false);
+  const stopped = useRef(false);
   const onMessageRef = useRef(onMessage);
+  const onReconnectRef = useRef(onReconnect);
 
   useEffect(() => {
     onMessageRef.current = onMessage;
-  }, [onMessage]);
+    onReconnectRef.current = onReconnect;
+  }, [onMessage, onReconnect]);
 
   const connect = useCallback(() => {
-    if (!username) return;
+    if (!username && !spectate) return;
     if (ws.current?.readyState === WebSocket.OPEN) return;
 
-    const wsUrl = `${WS_BASE}/ws/${sessionId}?username=${encodeURIComponent(username)}`;
+    const wsUrl = spectate
+      ? `${WS_BASE}/ws/${sessionId}/watch`
+      : `${WS_BASE}/ws/${sessionId}?username=${encodeURIComponent(username)}`;
     ws.current = new WebSocket(wsUrl);
 
+    ws.current.onopen = () => {
+      attempts.current = 0;
+      if (opened.current) {
+        onReconnectRef.current?.();
+      }
+      opened.current = true;
+    };
+
     ws.current.onmessage = (event) => {
       const message = JSON.parse(event.data) as WebSocketMessage;
+      if (message.event === "ping") {
+        ws.current?.send(JSON.stringify({ event: "pong" }));
+        return;
+      }
+      if (message.event === "batch") {
+        for (const inner of message.data as WebSocketMessage[]) {
+          onMessageRef.current(inner);
+        }
+        return;
+      }
       onMessageRef.current(message);
     };
 
     ws.current.onerror = () => {};
 
-    ws.current.onclose = () => {
+    ws.current.onclose = (event) => {
+      if (stopped.current) return;
+      const delay = reconnectDelay(event, attempts.current);
+      attempts.current += 1;
       reconnectTimeout.current = window.setTimeout(() => {
         connect();
-      }, 3000);
+      }, delay);
     };
-  }, [sessionId, username]);
+  }, [sessionId, username, spectate]);
 
   useEffect(() => {
+    stopped.current = false;
     connect();
 
     return () => {
+      stopped.current = true;
+      opened.current = false;
       if (reconnectTimeout.current) {
         clearTimeout(reconnectTimeout.current);
       }
@@ -1,7 +1,24 @@
-import { useEffect, useState, useCallback } from "react";
-import { useParams } from "react-router-dom";
-import type { Card, WebSocketMessage } from "../types/index.js";
-import { getSession, addCard, clearBoard, updateSessionName } from "../utils/api";
+import { useEffect, useMemo, useState, useCallback, useRef } from "react";
+import { useParams, useSearchParams } from "react-router-dom";
+import type {
+  Card,
+  CardDelta,
+  CardGroup,
+  CategoryType,
+  SessionResponse,
+  WebSocketMessage,
+} from "../types/index.js";
+import {
+  getSession,
+  getCardPage,
+  getCardGroups,
+  getVotes,
+  voteCard,
+  addCard,
+  carryOverActionables,
+  clearBoard,
+  updateSessionName,
+} from "../utils/api";
 import { useWebSocket } from "../hooks/useWebSocket";
 import { NamePrompt } from "../components/NamePrompt";
 import { RetroColumn } from "../components/RetroColumn";
@@ -9,23 +26,71 @@ import { ActionablesList } from "../components/ActionablesList";
 import { ActiveUsers } from "../components/ActiveUsers";
 import { exportToCSV } from "../utils/exportCSV";
 
+const PAGE_SIZE = 50;
+
+type NextAfter = Partial<Record<CategoryType, number | null>>;
+
+function mergeCards(current: Card[], page: Card[]): Card[] {
+  const known = new Set(current.map((c) => c.id));
+  return [...current, ...page.filter((c) => !known.has(c.id))];
+}
+
 export function RetroBoard() {
   const { sessionId } = useParams<{ sessionId: string }>();
+  const [searchParams] = useSearchParams();
+  const spectating = searchParams.has("watch");
   const [cards, setCards] = useState<Card[]>([]);
   const [userName, setUserName] = useState<string>("");
   const [isEditingName, setIsEditingName] = useState<boolean>(false);
   const [boardName, setBoardName] = useState<string>("");
   const [isEditingBoardName, setIsEditingBoardName] = useState<boolean>(false);
   const [activeUsers, setActiveUsers] = useState<string[]>([]);
+  const [spectators, setSpectators] = useState(0);
+  const [groups, setGroups] = useState<CardGroup[]>([]);
+  const [tallies, setTallies] = useState<Record<number, number>>({});
+  const [myVotes, setMyVotes] = useState<Record<number, number>>({});
+  const [votesLeft, setVotesLeft] = useState<number | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string>("");
+  const [nextAfter, setNextAfter] = useState<NextAfter>({});
+  const cardsRef = useRef<Card[]>([]);
+  const pagesLoading = useRef<Set<CategoryType>>(new Set());
+
+  useEffect(() => {
+    cardsRef.current = cards;
+  }, [cards]);
+
+  const applyBoard = useCallback((data: SessionResponse) => {
+    setCards(data.cards);
+    setNextAfter(data.next_after ?? {});
+  }, []);
+
+  const resync = useCallback(() => {
+    if (!sessionId) return;
+    getSession(sessionId, PAGE_SIZE)
+      .then(applyBoard)
+      .catch(() => {});
+  }, [sessionId, applyBoard]);
+
+  const loadMore = useCallback((category: CategoryType) => {
+    const after = nextAfter[category];
+    if (!sessionId || after == null || pagesLoading.current.has(category)) return;
+    pagesLoading.current.add(category);
+    getCardPage(sessionId, category, after, PAGE_SIZE)
+      .then((page) => {
+        setCards((prev) => mergeCards(prev, page.cards));
+        setNextAfter((prev) => ({ ...prev, [category]: page.next_after }));
+      })
+      .catch(() => {})
+      .finally(() => pagesLoading.current.delete(category));
+  }, [sessionId, nextAfter]);
 
   useEffect(() => {
     if (!sessionId) return;
 
-    getSession(sessionId)
+    getSession(sessionId, PAGE_SIZE)
       .then((data) => {
-        setCards(data.cards);
+        applyBoard(data);
         if (data.session.name) {
           setBoardName(data.session.name);
         }
@@ -35,15 +100,54 @@ export function RetroBoard() {
         setError("Failed to load session");
         setLoading(false);
       });
-  }, [sessionId]);
+
+    getCardGroups(sessionId)
+      .then((data) => setGroups(data.groups))
+      .catch(() => {});
+  }, [sessionId, applyBoard]);
+
+  const loadVotes = useCallback(() => {
+    if (!sessionId || !userName) return;
+    getVotes(sessionId, userName)
+      .then((data) => {
+        setTallies(data.tallies);
+        setMyVotes(data.mine);
+        setVotesLeft(data.remaining);
+      })
+      .catch(() => {});
+  }, [sessionId, userName]);
+
+  useEffect(() => {
+    loadVotes();
+  }, [loadVotes]);
+
+  const similarCounts = useMemo(() => {
+    const counts: Record<number, number> = {};
+    for (const group of groups) {
+      for (const id of group.card_ids) {
+        counts[id] = group.card_ids.length - 1;
+      }
+    }
+    return counts;
+  }, [groups]);
 
   const handleWebSocketMessage = useCallback((message: WebSocketMessage) => {
     if (message.event === "card_added") {
       const card = message.data as Card;
       setCards((prev) => [...prev, card]);
+    } else if (message.event === "cards_added") {
+      const { cards: added } = message.data as { cards: Card[] };
+      setCards((prev) => [...prev, ...added]);
     } else if (message.event === "card_updated") {
-      const card = message.data as Card;
-      setCards((prev) => prev.map((c) => (c.id === card.id ? card : c)));
+      const delta = message.data as CardDelta;
+      const current = cardsRef.current.find((c) => c.id === delta.id);
+      if (current && delta.version > current.version + 1) {
+        resync();
+        return;
+      }
+      setCards((prev) =>
+        prev.map((c) => (c.id === delta.id && delta.version > c.version ? { ...c, ...delta } : c))
+      );
     } else if (message.event === "card_deleted") {
       const { id } = message.data as { id: number };
       setCards((prev) => prev.filter((c) => c.id !== id));
@@ -52,10 +156,21 @@ export function RetroBoard() {
       setActiveUsers(users);
     } else if (message.event === "board_cleared") {
       setCards([]);
+      setNextAfter({});
+      loadVotes();
+    } else if (message.event === "votes_updated") {
+      const { tallies } = message.data as { tallies: Record<number, number> };
+      setTallies((prev) => ({ ...prev, ...tallies }));
+    } else if (message.event === "card_groups") {
+      const { groups } = message.data as { groups: CardGroup[] };
+      setGroups(groups);
+    } else if (message.event === "spectators") {
+      const { count } = message.data as { count: number };
+      setSpectators(count);
     }
-  }, []);
+  }, [resync, loadVotes]);
 
-  useWebSocket(sessionId || "", userName, handleWebSocketMessage);
+  useWebSocket(sessionId || "", userName, handleWebSocketMessage, spectating, resync);
 
   const handleAddCard = async (category: string, content: string) => {
     if (!sessionId || !userName) return;
@@ -66,6 +181,18 @@ export function RetroBoard() {
     }
   };
 
+  const handleVote = async (id: number, remove: boolean) => {
+    if (!sessionId || !userName) return;
+    try {
+      const result = await voteCard(sessionId, id, userName, remove);
+      setTallies((prev) => ({ ...prev, [id]: result.votes }));
+      setMyVotes((prev) => ({ ...prev, [id]: result.mine }));
+      setVotesLeft(result.remaining);
+    } catch {
+      // Out of votes or card gone; the board state is unchanged
+    }
+  };
+
   const handleDeleteCard = (id: number) => {
     setCards((prev) => prev.filter((c) => c.id !== id));
   };
@@ -79,9 +206,19 @@ export function RetroBoard() {
     alert("URL copied to clipboard!");
   };
 
-  const handleExportCSV = () => {
+  const handleCopyWatchUrl = () => {
+    navigator.clipboard.writeText(`${window.location.origin}/retro/${sessionId}?watch`);
+    alert("Read-only link copied to clipboard!");
+  };
+
+  const handleExportCSV = async () => {
     if (!sessionId) return;
-    exportToCSV(sessionId, cards);
+    try {
+      const data = await getSession(sessionId);
+      exportToCSV(sessionId, data.cards);
+    } catch {
+      alert("Failed to export board. Please try again.");
+    }
   };
 
   const handleClearBoard = async () => {
@@ -100,6 +237,20 @@ export function RetroBoard() {
     }
   };
 
+  const handleCarryOver = async () => {
+    if (!sessionId) return;
+
+    const previous = window.prompt("Board ID or URL of the previous retro:");
+    const fromSessionId = previous?.trim().split("/").filter(Boolean).pop();
+    if (!fromSessionId) return;
+
+    try {
+      await carryOverActionables(sessionId, fromSessionId);
+    } catch {
+      alert("Failed to carry over actionables. Check the board ID and try again.");
+    }
+  };
+
   const handleEditName = () => {
     setIsEditingName(true);
   };
@@ -112,6 +263,7 @@ export function RetroBoard() {
   };
 
   const handleEditBoardName = () => {
+    if (spectating) return;
     setIsEditingBoardName(true);
   };
 
@@ -129,6 +281,23 @@ export function RetroBoard() {
     }
   };
 
+  const columns = useMemo(() => {
+    const byCategory: Record<CategoryType, Card[]> = {
+      well: [],
+      badly: [],
+      continue: [],
+      kudos: [],
+      actionables: [],
+    };
+    for (const card of cards) {
+      byCategory[card.category]?.push(card);
+    }
+    for (const list of Object.values(byCategory)) {
+      list.sort((a, b) => a.id - b.id);
+    }
+    return byCategory;
+  }, [cards]);
+
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -145,15 +314,15 @@ export function RetroBoard() {
     );
   }
 
-  const wellCards = cards.filter((c) => c.category === "well");
-  const badlyCards = cards.filter((c) => c.category === "badly");
-  const continueCards = cards.filter((c) => c.category === "continue");
-  const kudosCards = cards.filter((c) => c.category === "kudos");
-  const actionables = cards.filter((c) => c.category === "actionables");
+  const wellCards = columns.well;
+  const badlyCards = columns.badly;
+  const continueCards = columns.continue;
+  const kudosCards = columns.kudos;
+  const actionables = columns.actionables;
 
   return (
     <>
-      <NamePrompt onNameSet={setUserName} />
+      {!spectating && <NamePrompt onNameSet={setUserName} />}
       <div className="min-h-screen bg-gradient-to-br from-blue-900 via-blue-800 to-green-900 p-6">
         <div className="max-w-7xl mx-auto">
           <div className="mb-6 bg-blue-950/60 backdrop-blur rounded-lg p-4 border-2 border-white">
@@ -178,18 +347,30 @@ export function RetroBoard() {
                     className="text-3xl font-bold text-white cursor-pointer hover:text-white/80 transition"
                   >
                     {boardName || `Retro Board - ${sessionId}`}
-                    <span className="text-sm ml-2 text-white/70">(click to edit)</span>
+                    {!spectating && (
+                      <span className="text-sm ml-2 text-white/70">(click to edit)</span>
+                    )}
                   </h1>
                 )}
                 <p className="text-sm text-white/80 mt-1">Session: {sessionId}</p>
               </div>
               <div className="flex gap-2">
-                <button
-                  onClick={handleClearBoard}
-                  className="bg-red-700 text-white px-4 py-2 rounded-md hover:bg-red-800 transition border-2 border-white"
-                >
-                  Clear Board
-                </button>
+                {!spectating && (
+                  <>
+                    <button
+                      onClick={handleClearBoard}
+                      className="bg-red-700 text-white px-4 py-2 rounded-md hover:bg-red-800 transition border-2 border-white"
+                    >
+                      Clear Board
+                    </button>
+                    <button
+                      onClick={handleCarryOver}
+                      className="bg-yellow-600 text-white px-4 py-2 rounded-md hover:bg-yellow-700 transition border-2 border-white"
+                    >
+                      Carry Over Actionables
+                    </button>
+                  </>
+                )}
                 <button
                   onClick={handleExportCSV}
                   className="bg-green-700 text-white px-4 py-2 rounded-md hover:bg-green-800 transition border-2 border-white"
@@ -202,37 +383,54 @@ export function RetroBoard() {
                 >
                   Copy URL
                 </button>
+                {!spectating && (
+                  <button
+                    onClick={handleCopyWatchUrl}
+                    className="bg-blue-700 text-white px-4 py-2 rounded-md hover:bg-blue-800 transition border-2 border-white"
+                  >
+                    Copy Watch Link
+                  </button>
+                )}
               </div>
             </div>
-            <div className="flex items-center gap-2 text-sm text-white">
-              <span>Logged in as:</span>
-              {isEditingName ? (
-                <input
-                  type="text"
-                  defaultValue={userName}
-                  autoFocus
-                  onBlur={(e) => handleSaveName(e.target.value)}
-                  onKeyDown={(e) => {
-                    if (e.key === "Enter") {
-                      handleSaveName(e.currentTarget.value);
-                    }
-                  }}
-                  className="border-b border-white focus:outline-none bg-transparent font-semibold text-white"
-                />
-              ) : (
-                <button
-                  onClick={handleEditName}
-                  className="font-semibold hover:text-white/80 transition text-white"
-                >
-                  {userName}
-                  <span className="ml-1 text-xs text-white/70">(edit)</span>
-                </button>
-              )}
-            </div>
+            {spectating ? (
+              <div className="text-sm text-white/80">Watching live (read-only)</div>
+            ) : (
+              <div className="flex items-center gap-2 text-sm text-white">
+                <span>Logged in as:</span>
+                {isEditingName ? (
+                  <input
+                    type="text"
+                    defaultValue={userName}
+                    autoFocus
+                    onBlur={(e) => handleSaveName(e.target.value)}
+                    onKeyDown={(e) => {
+                      if (e.key === "Enter") {
+                        handleSaveName(e.currentTarget.value);
+                      }
+                    }}
+                    className="border-b border-white focus:outline-none bg-transparent font-semibold text-white"
+                  />
+                ) : (
+                  <button
+                    onClick={handleEditName}
+                    className="font-semibold hover:text-white/80 transition text-white"
+                  >
+                    {userName}
+                    <span className="ml-1 text-xs text-white/70">(edit)</span>
+                  </button>
+                )}
+                {votesLeft !== null && (
+                  <span className="ml-4 text-white/80">
+                    {votesLeft} {votesLeft === 1 ? "vote" : "votes"} left
+                  </span>
+                )}
+              </div>
+            )}
           </div>
 
           <div className="mb-6">
-            <ActiveUsers users={activeUsers} />
+            <ActiveUsers users={activeUsers} spectators={spectators} />
           </div>
 
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4 mb-6">
@@ -241,38 +439,65 @@ export function RetroBoard() {
               category="well"
               cards={wellCards}
               currentUser={userName}
-              onAddCard={(content) => handleAddCard("well", content)}
+              onAddCard={spectating ? undefined : (content) => handleAddCard("well", content)}
               onDeleteCard={handleDeleteCard}
+              similarCounts={similarCounts}
+              tallies={tallies}
+              myVotes={myVotes}
+              onVote={spectating ? undefined : handleVote}
+              hasMore={nextAfter.well != null}
+              onLoadMore={() => loadMore("well")}
             />
             <RetroColumn
               title="What Went Badly"
               category="badly"
               cards={badlyCards}
               currentUser={userName}
-              onAddCard={(content) => handleAddCard("badly", content)}
+              onAddCard={spectating ? undefined : (content) => handleAddCard("badly", content)}
               onDeleteCard={handleDeleteCard}
+              similarCounts={similarCounts}
+              tallies={tallies}
+              myVotes={myVotes}
+              onVote={spectating ? undefined : handleVote}
+              hasMore={nextAfter.badly != null}
+              onLoadMore={() => loadMore("badly")}
             />
             <RetroColumn
               title="Continue Doing"
               category="continue"
               cards={continueCards}
               currentUser={userName}
-              onAddCard={(content) => handleAddCard("continue", content)}
+              onAddCard={spectating ? undefined : (content) => handleAddCard("continue", content)}
               onDeleteCard={handleDeleteCard}
+              similarCounts={similarCounts}
+              tallies={tallies}
+              myVotes={myVotes}
+              onVote={spectating ? undefined : handleVote}
+              hasMore={nextAfter.continue != null}
+              onLoadMore={() => loadMore("continue")}
             />
             <RetroColumn
               title="Kudos"
               category="kudos"
               cards={kudosCards}
               currentUser={userName}
-              onAddCard={(content) => handleAddCard("kudos", content)}
+              onAddCard={spectating ? undefined : (content) => handleAddCard("kudos", content)}
               onDeleteCard={handleDeleteCard}
+              similarCounts={similarCounts}
+              tallies={tallies}
+              myVotes={myVotes}
+              onVote={spectating ? undefined : handleVote}
+              hasMore={nextAfter.kudos != null}
+              onLoadMore={() => loadMore("kudos")}
             />
           </div>
 
           <ActionablesList
             actionables={actionables}
             onToggle={handleToggleActionable}
+            readOnly={spectating}
+            hasMore={nextAfter.actionables != null}
+            onLoadMore={() => loadMore("actionables")}
           />
         </div>
       </div>
@@ -8,6 +8,28 @@ export interface Card {
   author: string;
   created_at: string;
   completed?: boolean;
+  version: number;
+}
+
+export interface CardDelta {
+  id: number;
+  version: number;
+  content?: string;
+  completed?: boolean;
+}
+
+export interface BulkCardOperation {
+  op: "toggle" | "edit" | "delete";
+  card_id: number;
+  completed?: boolean;
+  content?: string;
+  author?: string;
+}
+
+export interface BulkCardResult {
+  op: BulkCardOperation["op"];
+  card_id: number;
+  status: "ok" | "not_found" | "forbidden" | "invalid";
 }
 
 export interface Session {
@@ -21,9 +43,55 @@ export interface Session {
 export interface SessionResponse {
   session: Session;
   cards: Card[];
+  next_after?: Partial<Record<CategoryType, number | null>> | null;
+}
+
+export interface CardPage {
+  cards: Card[];
+  next_after: number | null;
+}
+
+export interface VoteResult {
+  card_id: number;
+  votes: number;
+  mine: number;
+  remaining: number;
+}
+
+export interface SessionVotes {
+  limit: number;
+  tallies: Record<number, number>;
+  mine: Record<number, number>;
+  remaining: number;
+}
+
+export interface CardGroup {
+  category: CategoryType;
+  card_ids: number[];
 }
 
 export interface WebSocketMessage {
-  event: "card_added" | "card_updated" | "card_deleted" | "user_list" | "board_cleared";
-  data: Card | { id: number } | { users: string[] } | {};
+  event:
+    | "card_added"
+    | "cards_added"
+    | "card_updated"
+    | "card_deleted"
+    | "user_list"
+    | "board_cleared"
+    | "card_groups"
+    | "votes_updated"
+    | "spectators"
+    | "batch"
+    | "ping";
+  data:
+    | Card
+    | { cards: Card[] }
+    | CardDelta
+    | { id: number }
+    | { users: string[] }
+    | { groups: CardGroup[] }
+    | { tallies: Record<number, number> }
+    | { count: number }
+    | WebSocketMessage[]
+    | {};
 }
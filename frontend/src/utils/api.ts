@@ -1,4 +1,14 @@
-import type { Card, SessionResponse, CategoryType } from "../types/index.js";
+import type {
+  Card,
+  SessionResponse,
+  CardPage,
+  CategoryType,
+  BulkCardOperation,
+  BulkCardResult,
+  CardGroup,
+  SessionVotes,
+  VoteResult,
+} from "../types/index.js";
 
 // Use environment variable or default to current origin (works in Docker and dev)
 const API_BASE = import.meta.env.VITE_API_URL || (typeof window !== 'undefined' ? window.location.origin : "http://localhost:8000");
@@ -11,12 +21,54 @@ export async function createSession(): Promise<{ session_id: string }> {
   return response.json();
 }
 
-export async function getSession(sessionId: string): Promise<SessionResponse> {
-  const response = await fetch(`${API_BASE}/api/session/${sessionId}`);
+export async function getSession(sessionId: string, perColumn?: number): Promise<SessionResponse> {
+  const query = perColumn ? `?per_column=${perColumn}` : "";
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}${query}`);
   if (!response.ok) throw new Error("Failed to fetch session");
   return response.json();
 }
 
+export async function getCardPage(
+  sessionId: string,
+  category: CategoryType,
+  after: number,
+  limit: number
+): Promise<CardPage> {
+  const params = new URLSearchParams({ category, after: String(after), limit: String(limit) });
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}/cards?${params}`);
+  if (!response.ok) throw new Error("Failed to fetch cards");
+  return response.json();
+}
+
+export async function getCardGroups(sessionId: string): Promise<{ groups: CardGroup[] }> {
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}/groups`);
+  if (!response.ok) throw new Error("Failed to fetch card groups");
+  return response.json();
+}
+
+export async function getVotes(sessionId: string, voter: string): Promise<SessionVotes> {
+  const response = await fetch(
+    `${API_BASE}/api/session/${sessionId}/votes?voter=${encodeURIComponent(voter)}`
+  );
+  if (!response.ok) throw new Error("Failed to fetch votes");
+  return response.json();
+}
+
+export async function voteCard(
+  sessionId: string,
+  cardId: number,
+  voter: string,
+  remove = false
+): Promise<VoteResult> {
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}/card/${cardId}/vote`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ voter, remove }),
+  });
+  if (!response.ok) throw new Error("Failed to vote");
+  return response.json();
+}
+
 export async function addCard(
   sessionId: string,
   category: CategoryType,
@@ -32,27 +84,61 @@ export async function addCard(
   return response.json();
 }
 
+export async function carryOverActionables(
+  sessionId: string,
+  fromSessionId: string
+): Promise<{ cards: Card[] }> {
+  const params = new URLSearchParams({ from: fromSessionId, only: "open_actionables" });
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}/clone?${params}`, {
+    method: "POST",
+  });
+  if (!response.ok) throw new Error("Failed to carry over actionables");
+  return response.json();
+}
+
+function sessionHeaders(sessionId?: string): Record<string, string> {
+  return sessionId ? { "X-Retro-Session": sessionId } : {};
+}
+
 export async function updateCard(
   cardId: number,
-  data: { content?: string; completed?: boolean }
+  data: { content?: string; completed?: boolean },
+  sessionId?: string
 ): Promise<Card> {
   const response = await fetch(`${API_BASE}/api/card/${cardId}`, {
     method: "PATCH",
-    headers: { "Content-Type": "application/json" },
+    headers: { "Content-Type": "application/json", ...sessionHeaders(sessionId) },
     body: JSON.stringify(data),
   });
   if (!response.ok) throw new Error("Failed to update card");
   return response.json();
 }
 
-export async function deleteCard(cardId: number, author: string): Promise<void> {
+export async function deleteCard(
+  cardId: number,
+  author: string,
+  sessionId?: string
+): Promise<void> {
   const response = await fetch(
     `${API_BASE}/api/card/${cardId}?author=${encodeURIComponent(author)}`,
-    { method: "DELETE" }
+    { method: "DELETE", headers: sessionHeaders(sessionId) }
   );
   if (!response.ok) throw new Error("Failed to delete card");
 }
 
+export async function bulkUpdateCards(
+  sessionId: string,
+  operations: BulkCardOperation[]
+): Promise<{ success: boolean; results: BulkCardResult[]; cards: Card[] }> {
+  const response = await fetch(`${API_BASE}/api/session/${sessionId}/cards:bulk`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ operations }),
+  });
+  if (!response.ok) throw new Error("Failed to apply card operations");
+  return response.json();
+}
+
 export async function clearBoard(sessionId: string): Promise<void> {
   const response = await fetch(`${API_BASE}/api/session/${sessionId}/cards`, {
     method: "DELETE",